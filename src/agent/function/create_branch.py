@@ -1,8 +1,10 @@
+import os
 import subprocess
 
 from langchain_core.tools import StructuredTool
 
 from src.agent.schema.create_branch_input import CreateBranchInput
+from src.application.client.git_service import get_git_service
 from src.application.function.base import BaseFunction
 
 
@@ -20,30 +22,15 @@ class CreateBranchFunction(BaseFunction):
             Dict[str, str]: Execution result
         """
         try:
+            git = get_git_service(os.getcwd())
+
             # Get current branch
-            current_branch = subprocess.check_output(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                stderr=subprocess.STDOUT,
-                text=True,
-            ).strip()
+            current_branch = git.current_branch()
 
             # Check if the branch already exists
-            all_branches_output = subprocess.check_output(
-                ["git", "branch"],
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
-            branch_list = [
-                line.strip().lstrip("* ").strip()
-                for line in all_branches_output.splitlines()
-            ]
-
-            if branch_name in branch_list:
+            if branch_name in git.branches():
                 # If it already exists, checkout to it
-                subprocess.check_output(
-                    ["git", "checkout", branch_name],
-                    stderr=subprocess.STDOUT,
-                )
+                git.checkout(branch_name)
                 return {
                     "result": "success",
                     "message": f"Switched to existing branch '{branch_name}'",
@@ -52,10 +39,7 @@ class CreateBranchFunction(BaseFunction):
                 }
 
             # Create new branch
-            subprocess.check_output(
-                ["git", "checkout", "-b", branch_name],
-                stderr=subprocess.STDOUT,
-            )
+            git.checkout(branch_name, create=True)
 
             return {
                 "result": "success",
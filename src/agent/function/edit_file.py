@@ -0,0 +1,93 @@
+import os
+from typing import Dict, List, Optional, Type, Union
+
+from langchain_core.tools import StructuredTool
+
+from src.agent.schema.edit_file_input import EditFileInput, SearchReplaceBlock
+from src.application.function.base import BaseFunction
+from src.infrastructure.utils.read_cache import read_cache
+from src.infrastructure.utils.text_patch import (
+    PatchError,
+    apply_search_replace,
+    apply_unified_diff,
+)
+from src.infrastructure.utils.write_set import (
+    WriteTooLargeError,
+    write_result,
+    write_text,
+)
+
+
+class EditFileFunction(BaseFunction):
+    """Function to edit part of a file"""
+
+    @staticmethod
+    def execute(
+        filepath: str,
+        edits: Optional[List[Union[Dict[str, str], SearchReplaceBlock]]] = None,
+        diff: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """
+        Apply search/replace blocks or a unified diff to a file
+
+        All edits are applied in memory first; the file is written only when
+        every edit applies.
+
+        Args:
+            filepath: Path of the file
+            edits: Search/replace blocks applied in order
+            diff: Unified diff of the file, used when edits is not given
+
+        Returns:
+            Dictionary with result "success" (and fuzzy_matches listing the edits
+            applied to merely similar text), or an error describing which edit
+            failed and why
+        """
+        if not os.path.exists(filepath):
+            return {"filepath": filepath, "error": "File not found."}
+        if not edits and not diff:
+            return {"filepath": filepath, "error": "Specify edits or diff."}
+
+        text = read_cache.read_text(filepath)
+        try:
+            if edits:
+                blocks = [
+                    (edit.search, edit.replace)
+                    if isinstance(edit, SearchReplaceBlock)
+                    else (edit["search"], edit["replace"])
+                    for edit in edits
+                ]
+                patch = apply_search_replace(text, blocks)
+            else:
+                patch = apply_unified_diff(text, diff)
+        except PatchError as e:
+            return {"filepath": filepath, "error": f"{e} The file was not changed."}
+
+        try:
+            result = write_result(write_text(filepath, patch.text))
+        except WriteTooLargeError as e:
+            return {"filepath": filepath, "error": str(e)}
+        if patch.fuzzy_matches:
+            result["fuzzy_matches"] = [match.summary() for match in patch.fuzzy_matches]
+            result["warning"] = (
+                "Some edits did not match the file exactly and replaced the most "
+                "similar text. Read those lines to check the change."
+            )
+        return result
+
+    @classmethod
+    def to_tool(cls: Type["EditFileFunction"]) -> StructuredTool:
+        return StructuredTool.from_function(
+            name=cls.function_name(),
+            description="""Edits part of an existing file without resending the whole file.
+
+Prefer this over OverwriteFile for changes to existing files.
+- edits: list of {'search': <existing text, copied exactly>, 'replace': <new text>}.
+  Include enough surrounding lines for the search text to be unique.
+- diff: a unified diff with '@@' hunks, as an alternative to edits.
+If an edit does not apply, nothing is written and the error shows the closest matching text.
+Edits applied to text that was only similar to the search text are listed in fuzzy_matches.
+            """,
+            func=cls.execute,
+            args_schema=EditFileInput,
+        )
@@ -1,10 +1,16 @@
+import os
 import subprocess
 from typing import Dict, Type
 
 from langchain_core.tools import StructuredTool
 
 from src.agent.schema.exec_pytest_test_input import ExecPytestTestInput
+from src.application.client.pytest_worker import get_pytest_worker
 from src.application.function.base import BaseFunction
+from src.infrastructure.config.agent_setting import agent_settings
+from src.infrastructure.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class ExecPytestTestFunction(BaseFunction):
@@ -12,9 +18,18 @@ class ExecPytestTestFunction(BaseFunction):
 
     @staticmethod
     def execute(file_or_dir_path: str) -> Dict[str, str]:
-        script = f"pytest '{file_or_dir_path}'"
+        # With PYTEST_WORKER, runs in a warm pre-forked worker; any worker
+        # failure falls back to a separate pytest process
+        if agent_settings.PYTEST_WORKER:
+            try:
+                return get_pytest_worker(os.getcwd()).run([file_or_dir_path])
+            except Exception as e:
+                logger.warning(f"pytest worker failed, running pytest directly: {e}")
+
         try:
-            result = subprocess.run(script, shell=True, capture_output=True, text=True, check=True)
+            result = subprocess.run(
+                ["pytest", file_or_dir_path], capture_output=True, text=True, check=True
+            )
             return {
                 "stdout": result.stdout,
                 "stderr": result.stderr,
@@ -26,6 +41,12 @@ class ExecPytestTestFunction(BaseFunction):
                 "stderr": e.stderr or "",
                 "exit_status": str(e.returncode),
             }
+        except FileNotFoundError:
+            return {
+                "stdout": "",
+                "stderr": "pytest: command not found",
+                "exit_status": "127",
+            }
 
     @classmethod
     def to_tool(cls: Type["ExecPytestTestFunction"]) -> StructuredTool:
@@ -0,0 +1,100 @@
+import os
+from pathlib import Path
+from typing import Dict, Type, Union
+
+from langchain_core.tools import StructuredTool
+
+from src.agent.function.get_files_list import GetFilesListFunction
+from src.agent.schema.find_definition_input import FindDefinitionInput
+from src.application.function.base import BaseFunction
+from src.infrastructure.utils.symbol_index import (
+    SymbolIndex,
+    get_symbol_index,
+    read_lines,
+)
+
+
+class FindDefinitionFunction(BaseFunction):
+    """Function to find where a Python symbol is defined"""
+
+    @staticmethod
+    def execute(
+        symbol: str, root_directory: str = ".", max_results: int = 50
+    ) -> Dict[str, Union[str, int]]:
+        """
+        Find the definitions of a class, function, method, variable or import
+
+        Args:
+            symbol: Name or dotted qualified name
+            root_directory: Root directory of the project
+            max_results: Maximum number of definitions to return
+
+        Returns:
+            Dictionary containing the definitions as
+            "path:line-end_line: kind qualname | source line" lines
+        """
+        root_path = Path(root_directory).resolve()
+        if not root_path.exists():
+            return {
+                "definitions": "",
+                "error": f"Specified directory does not exist: {root_directory}",
+            }
+
+        definitions = FindDefinitionFunction.load_index(
+            str(root_path)
+        ).find_definitions(symbol)
+        result = {}
+        if len(definitions) > max_results:
+            result["warning"] = (
+                f"Found {len(definitions)} definitions, "
+                f"showing the first {max_results}."
+            )
+            definitions = definitions[:max_results]
+
+        lines = []
+        for path in sorted({d.path for d in definitions}):
+            file_definitions = [d for d in definitions if d.path == path]
+            source = read_lines(
+                os.path.join(root_path, path), [d.line for d in file_definitions]
+            )
+            lines.extend(
+                f"{d.path}:{d.line}-{d.end_line}: {d.kind} {d.qualname} | "
+                f"{source.get(d.line, '')}"
+                for d in file_definitions
+            )
+        return {"definitions": "\n".join(lines), "count": len(definitions), **result}
+
+    @staticmethod
+    def load_index(root_path: str) -> SymbolIndex:
+        """
+        Get the symbol index of a project, synced with its current Python files
+
+        Args:
+            root_path: Absolute root directory
+
+        Returns:
+            Up to date SymbolIndex
+        """
+        index = get_symbol_index(root_path)
+        paths, _ = GetFilesListFunction.iter_files(
+            root_path, file_extensions=["py", "pyi"]
+        )
+        index.sync(paths)
+        return index
+
+    @classmethod
+    def to_tool(cls: Type["FindDefinitionFunction"]) -> StructuredTool:
+        return StructuredTool.from_function(
+            name=cls.function_name(),
+            description="""Find where a Python class, function, method or variable is defined.
+
+Returns "path:line-end_line: kind qualname | source line" for each definition,
+so the definition can be read with ReadFile without listing or reading other files.
+
+Usage examples:
+- By name: symbol='execute'
+- By qualified name: symbol='ReadFileFunction.execute'
+            """,
+            func=cls.execute,
+            args_schema=FindDefinitionInput,
+        )
@@ -0,0 +1,82 @@
+import os
+from pathlib import Path
+from typing import Dict, Type, Union
+
+from langchain_core.tools import StructuredTool
+
+from src.agent.function.find_definition import FindDefinitionFunction
+from src.agent.schema.find_references_input import FindReferencesInput
+from src.application.function.base import BaseFunction
+from src.infrastructure.utils.symbol_index import read_lines
+
+
+class FindReferencesFunction(BaseFunction):
+    """Function to find where a Python symbol is used"""
+
+    @staticmethod
+    def execute(
+        symbol: str, root_directory: str = ".", max_results: int = 100
+    ) -> Dict[str, Union[str, int]]:
+        """
+        Find the call sites, imports and other uses of a name
+
+        Args:
+            symbol: Name; for a dotted name only the last part is matched
+            root_directory: Root directory of the project
+            max_results: Maximum number of references to return
+
+        Returns:
+            Dictionary containing the references as
+            "path:line: kind | source line" lines
+        """
+        root_path = Path(root_directory).resolve()
+        if not root_path.exists():
+            return {
+                "references": "",
+                "error": f"Specified directory does not exist: {root_directory}",
+            }
+
+        index = FindDefinitionFunction.load_index(str(root_path))
+        # One entry per line: a line calling obj.name() also loads obj
+        references = []
+        seen = set()
+        for reference in index.find_references(symbol):
+            if (reference.path, reference.line) not in seen:
+                seen.add((reference.path, reference.line))
+                references.append(reference)
+
+        result = {}
+        if len(references) > max_results:
+            result["warning"] = (
+                f"Found {len(references)} references, showing the first {max_results}."
+            )
+            references = references[:max_results]
+
+        lines = []
+        for path in sorted({r.path for r in references}):
+            file_references = [r for r in references if r.path == path]
+            source = read_lines(
+                os.path.join(root_path, path), [r.line for r in file_references]
+            )
+            lines.extend(
+                f"{r.path}:{r.line}: {r.kind} | {source.get(r.line, '')}"
+                for r in file_references
+            )
+        return {"references": "\n".join(lines), "count": len(references), **result}
+
+    @classmethod
+    def to_tool(cls: Type["FindReferencesFunction"]) -> StructuredTool:
+        return StructuredTool.from_function(
+            name=cls.function_name(),
+            description="""Find where a Python name is used (calls, imports, attribute access).
+
+Returns "path:line: kind | source line" for each use. Use it to see who calls a
+function before changing its signature.
+
+Usage examples:
+- Callers of a method: symbol='execute'
+- Uses of a class: symbol='ReadFileFunction'
+            """,
+            func=cls.execute,
+            args_schema=FindReferencesInput,
+        )
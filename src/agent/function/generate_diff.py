@@ -1,8 +1,10 @@
+import os
 import subprocess
 
 from langchain_core.tools import StructuredTool
 
 from src.agent.schema.generate_diff_input import GenerateDiffInput
+from src.application.client.diff_engine import get_diff_engine, paginate_diff
 from src.application.function.base import BaseFunction
 
 
@@ -14,18 +16,34 @@ class GenerateDiffFunction(BaseFunction):
         base_branch: str | None = None,
         target_branch: str | None = None,
         file_path: str | None = None,
+        context_lines: int | None = None,
+        ignore_whitespace: bool = False,
+        detect_renames: bool = True,
+        exclude_generated: bool = False,
+        token_budget: int | None = None,
+        page: int = 1,
     ) -> dict[str, str]:
         """Generate local Git diff.
 
-        Check differences in the following order:
-        1. Working directory changes (git diff HEAD)
-        2. Staging area changes (git diff --cached)
-        3. Untracked files (git ls-files --others --exclude-standard)
+        Working directory changes, staging area changes and untracked files are
+        returned together, from one `git status` pass and one `git diff HEAD`.
 
         Args:
             base_branch (str, optional): Not used (kept for compatibility)
             target_branch (Optional[str], optional): Not used (kept for compatibility)
             file_path (Optional[str], optional): Specific file path. Defaults to None (all files)
+            context_lines (Optional[int], optional): Lines of context around changes.
+                Defaults to None (git's 3)
+            ignore_whitespace (bool, optional): Ignore whitespace-only changes.
+                Defaults to False.
+            detect_renames (bool, optional): Show moved files as renames.
+                Defaults to True.
+            exclude_generated (bool, optional): Leave out lockfiles and generated
+                files. Defaults to False.
+            token_budget (Optional[int], optional): Maximum tokens per page.
+                Defaults to None (no paging)
+            page (int, optional): Page to return when token_budget is set.
+                Defaults to 1.
 
         Returns:
             Dict[str, str]: Execution result
@@ -35,88 +53,20 @@ class GenerateDiffFunction(BaseFunction):
             if base_branch is None:
                 base_branch = "main"
 
-            # Get current branch
-            if target_branch is None:
-                target_branch = subprocess.check_output(
-                    ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                ).strip()
-
-            # Build diff command - get local changes
-            cmd = ["git", "diff"]
-
-            # Get diff between HEAD and working directory (local changes)
-            cmd.append("HEAD")
-
-            # Get diff for specific file if specified
-            if file_path:
-                cmd.append("--")
-                cmd.append(file_path)
-
-            # Execute working directory diff
-            diff_output = subprocess.check_output(
-                cmd,
-                stderr=subprocess.STDOUT,
-                text=True,
+            combined = get_diff_engine(os.getcwd()).diff(
+                file_path,
+                context_lines=context_lines,
+                ignore_whitespace=ignore_whitespace,
+                detect_renames=detect_renames,
+                exclude_generated=exclude_generated,
             )
 
-            # If no changes in working directory, also check staging area changes
-            if not diff_output:
-                # Get diff between staging area (index) and HEAD
-                cmd_staged = ["git", "diff", "--cached"]
-                if file_path:
-                    cmd_staged.extend(["--", file_path])
-
-                staged_output = subprocess.check_output(
-                    cmd_staged,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                )
-                diff_output = staged_output
-
-            # Also check untracked files
-            if not diff_output:
-                # Get list of untracked files
-                untracked_cmd = ["git", "ls-files", "--others", "--exclude-standard"]
-                if file_path:
-                    untracked_cmd.append(file_path)
-
-                untracked_files = subprocess.check_output(
-                    untracked_cmd,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                ).strip()
-
-                if untracked_files:
-                    # Display untracked file contents in diff format
-                    untracked_diff = ""
-                    for file in untracked_files.split("\n"):
-                        if file.strip():
-                            try:
-                                # Read file content and display in diff format
-                                with open(file, "r", encoding="utf-8") as f:
-                                    content = f.read()
-                                untracked_diff += f"diff --git a/{file} b/{file}\n"
-                                untracked_diff += "new file mode 100644\n"
-                                untracked_diff += (
-                                    f"index 0000000..{hash(content) % 1000000:07x}\n"
-                                )
-                                untracked_diff += "--- /dev/null\n"
-                                untracked_diff += f"+++ b/{file}\n"
-                                for i, line in enumerate(content.split("\n"), 1):
-                                    untracked_diff += f"+{line}\n"
-                                untracked_diff += "\n"
-                            except (UnicodeDecodeError, FileNotFoundError):
-                                # Skip binary files or unreadable files
-                                untracked_diff += f"diff --git a/{file} b/{file}\n"
-                                untracked_diff += "new file mode 100644\n"
-                                untracked_diff += f"Binary file {file} added\n\n"
-
-                    diff_output = untracked_diff
+            # Get current branch
+            if target_branch is None:
+                target_branch = combined.branch
 
             # If no results
-            if not diff_output:
+            if not combined.diff:
                 return {
                     "result": "success",
                     "message": "No local diff found",
@@ -125,18 +75,46 @@ class GenerateDiffFunction(BaseFunction):
                     "target_branch": target_branch,
                 }
             # Determine diff type and set message
-            if "new file mode" in diff_output:
+            if combined.untracked_files:
                 message = "Local diff retrieved (including untracked files)"
             else:
                 message = "Local diff retrieved"
 
-            return {
+            result = {
                 "result": "success",
                 "message": message,
-                "diff": diff_output,
+                "diff": combined.diff,
                 "base_branch": base_branch,
                 "target_branch": target_branch,
             }
+            if combined.excluded_files:
+                result["excluded_files"] = ", ".join(combined.excluded_files)
+
+            if token_budget:
+                pages = paginate_diff(combined.diff, token_budget)
+                if page > len(pages):
+                    return {
+                        "result": "error",
+                        "message": (
+                            f"Page {page} does not exist; "
+                            f"the diff has {len(pages)} pages"
+                        ),
+                        "error": "page out of range",
+                    }
+                result["diff"] = pages[page - 1].text
+                result["page"] = page
+                result["total_pages"] = len(pages)
+                if len(pages) > 1:
+                    result["message"] = (
+                        f"{message} (page {page} of {len(pages)}; "
+                        "request other pages with page=N and the same token_budget)"
+                    )
+                    result["pages"] = "\n".join(
+                        f"{number}: {', '.join(p.paths)}"
+                        for number, p in enumerate(pages, start=1)
+                    )
+
+            return result
 
         except subprocess.CalledProcessError as e:
             return {
@@ -150,7 +128,11 @@ class GenerateDiffFunction(BaseFunction):
         """Create tool."""
         return StructuredTool.from_function(
             name=cls.function_name(),
-            description="Retrieve local diff from Git repository. Can retrieve changes including working directory, staging area, and untracked files.",
+            description="""Retrieve local diff from Git repository. Can retrieve changes including working directory, staging area, and untracked files.
+
+- context_lines=1 and ignore_whitespace=True give a smaller diff.
+- exclude_generated=True leaves out lockfiles and generated files.
+- With token_budget the diff is split into pages of whole files; 'pages' lists the files on each page, fetch them with page=N.""",
             func=cls.execute,
             args_schema=GenerateDiffInput,
         )
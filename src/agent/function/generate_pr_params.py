@@ -1,8 +1,11 @@
+import os
+
 from langchain.schema import HumanMessage
 from langchain_core.prompts import PromptTemplate
 from langchain_core.tools import StructuredTool
 
 from src.agent.schema.generate_pr_params_input import GeneratePRParamsInput
+from src.application.client.diff_engine import get_diff_engine
 from src.application.client.llm.azure_openai_client import AzureOpenAIClient
 from src.application.function.base import BaseFunction
 
@@ -21,12 +24,19 @@ class GeneratePullRequestParamsFunction(BaseFunction):
         Args:
             instruction (str): Instructions to the programmer
             programmer_output (str): Output from the programmer
-            diff (str, optional): Code diff. Defaults to empty string.
+            diff (str, optional): Code diff. Defaults to empty string
+                (the cached local diff is used).
 
         Returns:
             Dict[str, str]: PR title and description
         """
         try:
+            if not diff:
+                # Reuse the parsed local diff of the current working tree
+                snapshot = get_diff_engine(os.getcwd()).snapshot()
+                if not snapshot.is_empty:
+                    diff = f"{snapshot.summary()}\n{snapshot.stat()}\n\n{snapshot.diff}"
+
             # Initialize LLM client
             llm_client = AzureOpenAIClient()
             chat_llm = llm_client.initialize_chat()
@@ -1,12 +1,21 @@
-import glob
+import asyncio
+import bisect
 import os
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Set, Type
+from typing import Dict, Iterator, List, Optional, Tuple, Type, Union
 
 from langchain_core.tools import StructuredTool
 
 from src.agent.schema.get_files_list_input import GetFilesListInput
+from src.application.client.git_service import list_git_files
 from src.application.function.base import BaseFunction
+from src.infrastructure.config.agent_setting import agent_settings
+from src.infrastructure.utils.file_index import FileIndex, get_file_index
+from src.infrastructure.utils.file_metadata import get_file_metadata
+from src.infrastructure.utils.file_walker import walk_files
+from src.infrastructure.utils.glob_matcher import compile_matcher
+from src.infrastructure.utils.tree_render import render_tree
 
 # Import language settings from prompt configuration file (optional)
 try:
@@ -84,19 +93,38 @@ class GetFilesListFunction(BaseFunction):
         exclude_patterns: List[str] = None,
         root_directory: str = ".",
         max_files: int = 1000,
+        backend: str = "auto",
+        cursor: Optional[str] = None,
+        output_format: str = "list",
+        token_budget: Optional[int] = None,
+        include_metadata: bool = False,
     ) -> Dict[str, List[str]]:
         """
         Get file list based on specified conditions
 
+        Files are returned in sorted order, one page of at most max_files at a time.
+
         Args:
             file_extensions: List of file extensions to retrieve
             include_patterns: List of file patterns to include
             exclude_patterns: List of file patterns to exclude
             root_directory: Root directory to start search from
             max_files: Maximum number of files to retrieve
+            backend: How candidates are collected. "index" (and "auto", the default)
+                uses the shared file index, "walk" walks the tree once without caching,
+                "git" lists files from the git index (honouring .gitignore) and walks
+                the tree when root_directory is not in a git repository.
+            cursor: next_cursor returned by the previous call, to get the next page
+            output_format: "list" returns files_list with full paths, "tree" returns
+                files_tree, an indented directory tree that states each directory once
+            token_budget: Approximate token limit of files_tree. Large directories are
+                collapsed into "name/ (N files)" until the tree fits.
+            include_metadata: Also return files_metadata with the size, estimated
+                lines and tokens, and binary/generated flags of each file
 
         Returns:
-            Dictionary containing file list
+            Dictionary containing file list (or tree), and next_cursor when more
+            files remain
         """
         # Apply default settings
         if file_extensions is None and include_patterns is None:
@@ -110,13 +138,13 @@ class GetFilesListFunction(BaseFunction):
                 + GetFilesListFunction.DEFAULT_EXTENSIONS_BY_LANGUAGE["yaml"]
             )
 
-        if exclude_patterns is None:
-            exclude_patterns = GetFilesListFunction.DEFAULT_EXCLUDE_PATTERNS
-        else:
-            # Add default patterns to user-specified exclude patterns
-            exclude_patterns = list(
-                set(exclude_patterns + GetFilesListFunction.DEFAULT_EXCLUDE_PATTERNS)
-            )
+        # An empty page would return the same cursor forever
+        if max_files < 1:
+            return {
+                "result": "error",
+                "message": "max_files must be at least 1",
+                "error": f"invalid max_files: {max_files}",
+            }
 
         # Normalize root directory
         root_path = Path(root_directory).resolve()
@@ -126,48 +154,207 @@ class GetFilesListFunction(BaseFunction):
                 "error": f"Specified directory does not exist: {root_directory}",
             }
 
-        files_set: Set[str] = set()
-
-        # Change current directory
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(root_path)
-
-            # If include_patterns is specified
-            if include_patterns:
-                for pattern in include_patterns:
-                    files_set.update(glob.glob(pattern, recursive=True))
-
-            # If file_extensions is specified
-            if file_extensions:
-                for ext in file_extensions:
-                    # Remove leading dot from extension
-                    ext = ext.lstrip(".")
-                    pattern = f"**/*.{ext}"
-                    files_set.update(glob.glob(pattern, recursive=True))
-
-            # Apply exclude patterns
-            if exclude_patterns:
-                excluded_files = set()
-                for pattern in exclude_patterns:
-                    excluded_files.update(glob.glob(pattern, recursive=True))
-                files_set -= excluded_files
-
-            # Filter files only (exclude directories)
-            files_list = [f for f in files_set if os.path.isfile(f)]
-
-            # Limit number of files
-            if len(files_list) > max_files:
-                files_list = files_list[:max_files]
-                return {
-                    "files_list": sorted(files_list),
-                    "warning": f"Number of files exceeded the limit ({max_files}), showing only some files.",
-                }
-
-            return {"files_list": sorted(files_list)}
-
-        finally:
-            os.chdir(original_cwd)
+        files_iter, _ = GetFilesListFunction.iter_files(
+            str(root_path),
+            file_extensions,
+            include_patterns,
+            exclude_patterns,
+            backend,
+            cursor,
+        )
+
+        # Files arrive in sorted order: stop as soon as one file beyond the page
+        # is found
+        files_list = list(islice(files_iter, max_files + 1))
+
+        # Limit number of files
+        result = {}
+        if len(files_list) > max_files:
+            files_list = files_list[:max_files]
+            next_cursor = files_list[-1] if files_list else cursor
+            result = {
+                "next_cursor": next_cursor,
+                "warning": (
+                    f"Number of files exceeded the limit ({max_files}), "
+                    "showing only some files. "
+                    f"Pass cursor='{next_cursor}' to get the next page."
+                ),
+            }
+
+        if include_metadata:
+            result["files_metadata"] = GetFilesListFunction._collect_metadata(
+                str(root_path), files_list
+            )
+
+        if output_format == "tree":
+            return {
+                "files_tree": render_tree(files_list, token_budget),
+                "files_count": len(files_list),
+                **result,
+            }
+        return {"files_list": files_list, **result}
+
+    @staticmethod
+    async def aexecute(
+        file_extensions: List[str] = None,
+        include_patterns: List[str] = None,
+        exclude_patterns: List[str] = None,
+        root_directory: str = ".",
+        max_files: int = 1000,
+        backend: str = "auto",
+        cursor: Optional[str] = None,
+        output_format: str = "list",
+        token_budget: Optional[int] = None,
+        include_metadata: bool = False,
+    ) -> Dict[str, List[str]]:
+        """
+        Async variant of execute that runs the listing in a worker thread
+
+        Listing never changes the working directory, so concurrent calls from
+        threads or asyncio tasks do not interfere with each other.
+        """
+        return await asyncio.to_thread(
+            GetFilesListFunction.execute,
+            file_extensions=file_extensions,
+            include_patterns=include_patterns,
+            exclude_patterns=exclude_patterns,
+            root_directory=root_directory,
+            max_files=max_files,
+            backend=backend,
+            cursor=cursor,
+            output_format=output_format,
+            token_budget=token_budget,
+            include_metadata=include_metadata,
+        )
+
+    @staticmethod
+    def iter_files(
+        root_path: str,
+        file_extensions: List[str] = None,
+        include_patterns: List[str] = None,
+        exclude_patterns: List[str] = None,
+        backend: str = "auto",
+        start_after: Optional[str] = None,
+    ) -> Tuple[Iterator[str], Optional[FileIndex]]:
+        """
+        Iterate the files selected by the given patterns in sorted order
+
+        Shared by the tools that work on the project's files, so that they all
+        apply the same candidates and exclude rules.
+
+        Args:
+            root_path: Absolute root directory
+            file_extensions: List of file extensions to retrieve
+            include_patterns: List of file patterns to include
+            exclude_patterns: List of file patterns to exclude
+            backend: "auto", "git", "index" or "walk" (see execute)
+            start_after: Only yield paths sorting after this path
+
+        Returns:
+            Tuple of (iterator of paths relative to root_path, file index used or None)
+        """
+        index = None
+        files_iter = None
+        if backend == "git":
+            files_iter = GetFilesListFunction._iter_from_git(
+                root_path,
+                file_extensions,
+                include_patterns,
+                exclude_patterns,
+                start_after,
+            )
+        if files_iter is None:
+            # Filesystem backends, also used by "git" outside a git repository
+            if exclude_patterns is None:
+                exclude_patterns = GetFilesListFunction.DEFAULT_EXCLUDE_PATTERNS
+            else:
+                # Add default patterns to user-specified exclude patterns
+                exclude_patterns = list(
+                    set(
+                        exclude_patterns + GetFilesListFunction.DEFAULT_EXCLUDE_PATTERNS
+                    )
+                )
+
+            if backend in ("walk", "git"):
+                files_iter = walk_files(
+                    root_path,
+                    file_extensions,
+                    include_patterns,
+                    exclude_patterns,
+                    start_after=start_after,
+                )
+            else:
+                # Filter the shared index, which only rescans directories that changed
+                index = get_file_index(
+                    root_path,
+                    GetFilesListFunction.DEFAULT_EXCLUDE_PATTERNS,
+                    persist=agent_settings.FILE_INDEX_PERSIST,
+                )
+                matcher = compile_matcher(
+                    file_extensions, include_patterns, exclude_patterns
+                )
+                files_iter = (
+                    path
+                    for path in index.sorted_paths(start_after=start_after)
+                    if matcher.matches(path)
+                )
+
+        return files_iter, index
+
+    @staticmethod
+    def _iter_from_git(
+        root_path: str,
+        file_extensions: List[str],
+        include_patterns: List[str],
+        exclude_patterns: List[str],
+        start_after: Optional[str] = None,
+    ) -> Optional[Iterator[str]]:
+        """
+        Iterate files from the git index in sorted order, honouring .gitignore
+
+        Only user-specified exclude patterns are applied; the repository's
+        .gitignore takes the place of DEFAULT_EXCLUDE_PATTERNS.
+
+        Returns:
+            Iterator of file paths, or None when root_path is not in a git repository
+        """
+        candidates = list_git_files(root_path)
+        if candidates is None:
+            return None
+
+        candidates.sort()
+        start = (
+            bisect.bisect_right(candidates, start_after)
+            if start_after is not None
+            else 0
+        )
+        matcher = compile_matcher(file_extensions, include_patterns, exclude_patterns)
+        return (
+            path
+            for path in islice(candidates, start, None)
+            # Tracked files deleted from the work tree are still in the index
+            if matcher.matches(path) and os.path.isfile(os.path.join(root_path, path))
+        )
+
+    @staticmethod
+    def _collect_metadata(
+        root_path: str, files_list: List[str]
+    ) -> Dict[str, Dict[str, Union[int, bool]]]:
+        """
+        Describe the files of a page
+
+        Each file is stat'ed here rather than taken from the file index: the
+        index only rescans directories whose mtime changed, so it misses
+        in-place edits, and a stale (size, mtime) would return stale cached
+        header metadata.
+
+        Returns:
+            Dictionary mapping each file path to its metadata
+        """
+        return {
+            path: get_file_metadata(os.path.join(root_path, path))
+            for path in files_list
+        }
 
     @classmethod
     def get_extensions_for_language(cls, language: str) -> List[str]:
@@ -249,10 +436,15 @@ Usage examples:
 - Specific patterns: include_patterns=['src/**/*.js']
 - Exclude patterns: exclude_patterns=['**/test/**']
 - From specific directory: root_directory='src/'
+- Only files git tracks or does not ignore (honours .gitignore): backend='git'
+- Next page of a truncated listing: cursor=<next_cursor of the previous result>
+- Compact overview of a large project: output_format='tree', token_budget=2000
+- Sizes before reading: include_metadata=True (avoid reading binary/generated files, read large files in parts)
 
 Supported languages: python, javascript, typescript, java, go, rust, c, cpp, csharp, php, ruby, swift, kotlin, scala, terraform, yaml, json, xml, html, css, sql, shell, powershell, docker, markdown, text
             """,
             func=cls.execute,
+            coroutine=cls.aexecute,
             args_schema=GetFilesListInput,
         )
 
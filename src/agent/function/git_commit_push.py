@@ -1,8 +1,10 @@
+import os
 import subprocess
 
 from langchain_core.tools import StructuredTool
 
 from src.agent.schema.git_commit_push_input import GitCommitPushInput
+from src.application.client.git_service import get_git_service
 from src.application.function.base import BaseFunction
 
 
@@ -30,43 +32,24 @@ class GitCommitPushFunction(BaseFunction):
             Dict[str, str]: Execution result
         """
         try:
+            git = get_git_service(os.getcwd())
+
             # Get current branch (used when branch_name is empty)
             if not branch_name:
-                branch_name = subprocess.check_output(
-                    ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                ).strip()
+                branch_name = git.current_branch()
 
             # Add changes to staging
-            add_result = subprocess.check_output(
-                ["git", "add", path_to_add],
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
+            add_result = git.add(path_to_add)
 
             # Set default message if commit message is empty
             if not commit_message:
                 commit_message = f"Update files in {path_to_add}"
 
             # Commit changes
-            commit_result = subprocess.check_output(
-                ["git", "commit", "-m", commit_message],
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
+            commit_result = git.commit(commit_message)
 
             # Push to remote repository
-            push_command = ["git", "push"]
-            if force_push:
-                push_command.append("--force")
-            push_command.extend([remote_name, branch_name])
-
-            push_result = subprocess.check_output(
-                push_command,
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
+            push_result = git.push(remote_name, branch_name, force=force_push)
 
             return {
                 "result": "success",
@@ -5,27 +5,39 @@ from langchain_core.tools import StructuredTool
 
 from src.agent.schema.make_new_file_input import MakeNewFileInput
 from src.application.function.base import BaseFunction
+from src.infrastructure.utils.write_set import (
+    WriteTooLargeError,
+    append_text,
+    write_result,
+    write_text,
+)
 
 
 class MakeNewFileFunction(BaseFunction):
     """Function to create a new file"""
 
     @staticmethod
-    def execute(filepath: str, file_contents: str) -> Dict[str, str]:
+    def execute(
+        filepath: str, file_contents: str, mode: str = "write"
+    ) -> Dict[str, str]:
         directory = os.path.dirname(filepath)
         if not os.path.exists(directory):
             os.makedirs(directory, exist_ok=True)
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(file_contents)
-
-        return {"result": "success"}
+        try:
+            if mode == "append":
+                return write_result(append_text(filepath, file_contents))
+            return write_result(write_text(filepath, file_contents))
+        except WriteTooLargeError as e:
+            return {"filepath": filepath, "error": str(e)}
 
     @classmethod
     def to_tool(cls: Type["MakeNewFileFunction"]) -> StructuredTool:
         return StructuredTool.from_function(
             name=cls.function_name(),
-            description="Creates a new file and writes the specified content to it.",
+            description="Creates a new file and writes the specified content to it. "
+            "For large files, write the first part and add the rest "
+            "with mode='append'.",
             func=cls.execute,
             args_schema=MakeNewFileInput,
         )
@@ -4,23 +4,32 @@ from langchain_core.tools import StructuredTool
 
 from src.agent.schema.over_write_input import OverwriteFileInput
 from src.application.function.base import BaseFunction
+from src.infrastructure.utils.write_set import (
+    WriteTooLargeError,
+    append_text,
+    write_result,
+    write_text,
+)
 
 
 class OverwriteFileFunction(BaseFunction):
     """Function to overwrite a file"""
 
     @staticmethod
-    def execute(filepath: str, new_text: str) -> Dict[str, str]:
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(new_text)
-
-        return {"result": "success"}
+    def execute(filepath: str, new_text: str, mode: str = "write") -> Dict[str, str]:
+        try:
+            if mode == "append":
+                return write_result(append_text(filepath, new_text))
+            return write_result(write_text(filepath, new_text))
+        except WriteTooLargeError as e:
+            return {"filepath": filepath, "error": str(e)}
 
     @classmethod
     def to_tool(cls: Type["OverwriteFileFunction"]) -> StructuredTool:
         return StructuredTool.from_function(
             name=cls.function_name(),
-            description="Overwrites the specified file with new content.",
+            description="Overwrites the specified file with new content. "
+            "With mode='append' the content is added to the end of the file instead.",
             func=cls.execute,
             args_schema=OverwriteFileInput,
         )
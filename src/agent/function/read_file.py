@@ -1,25 +1,66 @@
 import os
-from typing import Dict, Type
+from typing import Dict, Optional, Type, Union
 
 from langchain_core.tools import StructuredTool
 
 from src.agent.schema.read_file_input import ReadFileInput
 from src.application.function.base import BaseFunction
+from src.infrastructure.utils.file_index import refresh_file_entry
+from src.infrastructure.utils.file_outline import outline_file
+from src.infrastructure.utils.line_index import read_line_range
+from src.infrastructure.utils.read_cache import read_cache
 
 
 class ReadFileFunction(BaseFunction):
     """Function to read a file"""
 
     @staticmethod
-    def execute(filepath: str) -> Dict[str, str]:
-        """Read the contents of a file"""
+    def execute(
+        filepath: str,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
+        outline: bool = False,
+    ) -> Dict[str, Union[str, int]]:
+        """
+        Read the contents of a file
+
+        Args:
+            filepath: Path of the file
+            start_line: First line to read (1-based, inclusive)
+            end_line: Last line to read (inclusive)
+            outline: Return only signatures and docstring summaries with line numbers
+
+        Returns:
+            Dictionary containing the file contents (or outline). Range reads also
+            return the lines read and the total number of lines.
+        """
         if os.path.exists(filepath):
-            with open(filepath, "r", encoding="utf-8") as f:
-                contents = f.read()
-            return {
-                "filepath": filepath,
-                "file_contents": contents,
-            }
+            if outline:
+                contents = read_cache.read_text(filepath)
+                result = {
+                    "filepath": filepath,
+                    "outline": "\n".join(outline_file(filepath, contents)),
+                    "total_lines": len(contents.splitlines()),
+                }
+            elif start_line is not None or end_line is not None:
+                # Served from a memory map through the cached line offsets
+                line_range = read_line_range(filepath, start_line, end_line)
+                result = {
+                    "filepath": filepath,
+                    "file_contents": line_range.text,
+                    "start_line": line_range.start_line,
+                    "end_line": line_range.end_line,
+                    "total_lines": line_range.total_lines,
+                }
+            else:
+                contents = read_cache.read_text(filepath)
+                result = {
+                    "filepath": filepath,
+                    "file_contents": contents,
+                }
+            # Keep size and mtime in the shared file index up to date
+            refresh_file_entry(filepath)
+            return result
         else:
             return {
                 "filepath": filepath,
@@ -30,7 +71,9 @@ class ReadFileFunction(BaseFunction):
     def to_tool(cls: Type["ReadFileFunction"]) -> StructuredTool:
         return StructuredTool.from_function(
             name=cls.function_name(),
-            description="Reads the specified file and returns its contents.",
+            description="Reads the specified file and returns its contents. "
+            "For large files, first get an outline (outline=True) and then read only "
+            "the needed lines (start_line, end_line).",
             func=cls.execute,
             args_schema=ReadFileInput,
         )
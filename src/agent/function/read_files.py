@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Type, Union
+
+from langchain_core.tools import StructuredTool
+
+from src.agent.function.read_file import ReadFileFunction
+from src.agent.schema.read_files_input import FileReadRequest, ReadFilesInput
+from src.application.function.base import BaseFunction
+from src.infrastructure.utils.tree_render import CHARS_PER_TOKEN, estimate_tokens
+
+
+class ReadFilesFunction(BaseFunction):
+    """Function to read several files in one call"""
+
+    MAX_WORKERS = 8
+
+    @staticmethod
+    def execute(
+        files: List[Union[str, Dict, FileReadRequest]], max_tokens: int = 20000
+    ) -> Dict[str, Union[List[Dict], int]]:
+        """
+        Read several files concurrently and return them together
+
+        Contents share one token budget: small files are returned whole, and
+        the largest files are truncated to an equal share of what is left,
+        with a marker telling where to continue.
+
+        Args:
+            files: File paths, or requests with filepath, start_line and end_line
+            max_tokens: Approximate token budget for all contents together
+
+        Returns:
+            Dictionary containing one result per requested file, in request order,
+            and the estimated number of tokens returned
+        """
+        requests = [ReadFilesFunction._to_request(file) for file in files]
+        if not requests:
+            return {"files": [], "total_tokens": 0}
+
+        workers = min(ReadFilesFunction.MAX_WORKERS, len(requests))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(ReadFilesFunction._read_one, requests))
+
+        sizes = [len(result.get("file_contents", "")) for result in results]
+        cap = ReadFilesFunction._fair_share(sizes, max_tokens * CHARS_PER_TOKEN)
+        total_tokens = 0
+        for request, result in zip(requests, results):
+            contents = result.get("file_contents")
+            if contents is None:
+                continue
+            if len(contents) > cap:
+                result["file_contents"] = ReadFilesFunction._truncate(
+                    contents, cap, request.start_line or 1
+                )
+                result["truncated"] = True
+            total_tokens += estimate_tokens(result["file_contents"])
+        return {"files": results, "total_tokens": total_tokens}
+
+    @staticmethod
+    def _read_one(request: FileReadRequest) -> Dict[str, Union[str, int]]:
+        """Read one file, turning its failure into an error entry for that file only"""
+        try:
+            return ReadFileFunction.execute(
+                request.filepath, request.start_line, request.end_line
+            )
+        except IsADirectoryError:
+            error = "Path is a directory."
+        except UnicodeDecodeError:
+            error = "File is not UTF-8 text (binary?)."
+        except (OSError, ValueError) as e:
+            error = str(e)
+        return {"filepath": request.filepath, "error": error}
+
+    @staticmethod
+    def _to_request(file: Union[str, Dict, FileReadRequest]) -> FileReadRequest:
+        if isinstance(file, FileReadRequest):
+            return file
+        if isinstance(file, str):
+            return FileReadRequest(filepath=file)
+        return FileReadRequest(**file)
+
+    @staticmethod
+    def _fair_share(sizes: List[int], budget: int) -> int:
+        """
+        Return the largest per-file size cap such that all capped sizes fit the budget
+
+        Files smaller than the cap are returned whole; their unused share goes
+        to the larger files.
+        """
+        remaining = budget
+        ordered = sorted(sizes)
+        for i, size in enumerate(ordered):
+            share = remaining // (len(ordered) - i)
+            if size > share:
+                return share
+            remaining -= size
+        return max(ordered, default=0)
+
+    @staticmethod
+    def _truncate(contents: str, cap: int, first_line: int) -> str:
+        """Cut contents at a line boundary within cap characters and add a marker"""
+        cut = contents.rfind("\n", 0, cap) + 1
+        if cut == 0:
+            # The first line alone is longer than the cap
+            cut = cap
+        rest = contents[cut:]
+        more_lines = rest.count("\n") + (0 if rest.endswith("\n") else 1)
+        next_line = first_line + contents.count("\n", 0, cut)
+        return (
+            f"{contents[:cut]}... [truncated: {more_lines} more lines, "
+            f"read them with start_line={next_line}]"
+        )
+
+    @classmethod
+    def to_tool(cls: Type["ReadFilesFunction"]) -> StructuredTool:
+        return StructuredTool.from_function(
+            name=cls.function_name(),
+            description="""Read several files (or line ranges) in one call.
+
+Prefer this over calling ReadFile repeatedly when more than one file is needed.
+All contents share max_tokens; large files are truncated with a marker telling
+which start_line to read next.
+
+Usage examples:
+- files=[{'filepath': 'src/a.py'}, {'filepath': 'src/b.py', 'start_line': 100, 'end_line': 200}]
+            """,
+            func=cls.execute,
+            args_schema=ReadFilesInput,
+        )
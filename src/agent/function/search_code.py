@@ -0,0 +1,208 @@
+import asyncio
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Type, Union
+
+from langchain_core.tools import StructuredTool
+
+from src.agent.function.get_files_list import GetFilesListFunction
+from src.agent.schema.search_code_input import SearchCodeInput
+from src.application.function.base import BaseFunction
+from src.infrastructure.config.agent_setting import agent_settings
+from src.infrastructure.utils.code_search import (
+    SearchMatch,
+    compile_search_pattern,
+    search_files,
+)
+from src.infrastructure.utils.trigram_index import get_trigram_index, required_literals
+
+
+class SearchCodeFunction(BaseFunction):
+    """Function to search file contents across the project"""
+
+    # Files larger than this are skipped (bundles, data dumps)
+    MAX_FILE_SIZE = 4 * 1024 * 1024
+
+    @staticmethod
+    def execute(
+        pattern: str,
+        is_regex: bool = False,
+        case_sensitive: bool = True,
+        file_extensions: List[str] = None,
+        include_patterns: List[str] = None,
+        exclude_patterns: List[str] = None,
+        root_directory: str = ".",
+        context_lines: int = 2,
+        max_matches: int = 100,
+        backend: str = "auto",
+    ) -> Dict[str, Union[str, int]]:
+        """
+        Search file contents for a literal text or regular expression
+
+        Files are selected with the same rules as GetFilesListFunction.
+
+        Args:
+            pattern: Text or regular expression to search for
+            is_regex: Whether pattern is a regular expression
+            case_sensitive: Whether the search is case sensitive
+            file_extensions: List of file extensions to search
+            include_patterns: List of file patterns to search
+            exclude_patterns: List of file patterns to exclude
+            root_directory: Root directory to search from
+            context_lines: Number of lines to show before and after each match
+            max_matches: Maximum number of matching lines to return
+            backend: How candidates are collected (see GetFilesListFunction.execute)
+
+        Returns:
+            Dictionary containing the matches as "path:line: snippet" lines
+            (context lines as "path-line- snippet"), and the match count
+        """
+        root_path = Path(root_directory).resolve()
+        if not root_path.exists():
+            return {
+                "matches": "",
+                "error": f"Specified directory does not exist: {root_directory}",
+            }
+
+        try:
+            regex = compile_search_pattern(pattern, is_regex, case_sensitive)
+        except re.error as e:
+            return {"matches": "", "error": f"Invalid regular expression: {e}"}
+
+        if file_extensions is None and include_patterns is None:
+            # Search every file; binaries are skipped while scanning
+            include_patterns = ["**/*"]
+
+        paths, _ = GetFilesListFunction.iter_files(
+            str(root_path), file_extensions, include_patterns, exclude_patterns, backend
+        )
+        if agent_settings.SEARCH_TRIGRAM_INDEX:
+            paths = SearchCodeFunction._narrow_with_index(
+                str(root_path), paths, pattern, is_regex, backend
+            )
+        matches = search_files(
+            str(root_path),
+            paths,
+            regex,
+            context_lines=context_lines,
+            max_matches=max_matches,
+            max_file_size=SearchCodeFunction.MAX_FILE_SIZE,
+        )
+
+        result = {}
+        if len(matches) > max_matches:
+            matches = matches[:max_matches]
+            result["warning"] = (
+                f"Number of matches exceeded the limit ({max_matches}), "
+                "showing only some matches. "
+                "Narrow the pattern or the searched files."
+            )
+        return {
+            "matches": SearchCodeFunction._format_matches(matches),
+            "match_count": len(matches),
+            **result,
+        }
+
+    @staticmethod
+    async def aexecute(
+        pattern: str,
+        is_regex: bool = False,
+        case_sensitive: bool = True,
+        file_extensions: List[str] = None,
+        include_patterns: List[str] = None,
+        exclude_patterns: List[str] = None,
+        root_directory: str = ".",
+        context_lines: int = 2,
+        max_matches: int = 100,
+        backend: str = "auto",
+    ) -> Dict[str, Union[str, int]]:
+        """Async variant of execute that runs the search in a worker thread"""
+        return await asyncio.to_thread(
+            SearchCodeFunction.execute,
+            pattern=pattern,
+            is_regex=is_regex,
+            case_sensitive=case_sensitive,
+            file_extensions=file_extensions,
+            include_patterns=include_patterns,
+            exclude_patterns=exclude_patterns,
+            root_directory=root_directory,
+            context_lines=context_lines,
+            max_matches=max_matches,
+            backend=backend,
+        )
+
+    @staticmethod
+    def _narrow_with_index(
+        root_path: str, paths: Iterable[str], pattern: str, is_regex: bool, backend: str
+    ) -> Iterable[str]:
+        """
+        Keep only the files whose trigrams contain the pattern's required literals
+
+        The index always covers every searchable file, whatever the current
+        query's filters, so that differently filtered queries share it.
+        """
+        index = get_trigram_index(root_path)
+        all_paths, _ = GetFilesListFunction.iter_files(
+            root_path, include_patterns=["**/*"], backend=backend
+        )
+        index.sync(all_paths)
+        candidates = index.candidates(required_literals(pattern, is_regex))
+        if candidates is None:
+            return paths
+        return (path for path in paths if path in candidates)
+
+    @staticmethod
+    def _format_matches(matches: List[SearchMatch]) -> str:
+        """
+        Format matches like grep: "path:line: text" for matches, "path-line- text"
+        for context lines and "--" between groups that are not adjacent
+        """
+        # Collect the lines to print per file; a match overrides the same line
+        # as context
+        files: Dict[str, Dict[int, str]] = {}
+        for match in matches:
+            file_lines = files.setdefault(match.path, {})
+            first_line = match.line_number - len(match.before)
+            for offset, text in enumerate(match.before):
+                line_number = first_line + offset
+                file_lines.setdefault(
+                    line_number, f"{match.path}-{line_number}- {text}"
+                )
+            for offset, text in enumerate(match.after, start=1):
+                line_number = match.line_number + offset
+                file_lines.setdefault(
+                    line_number, f"{match.path}-{line_number}- {text}"
+                )
+            file_lines[match.line_number] = (
+                f"{match.path}:{match.line_number}: {match.line}"
+            )
+
+        output: List[str] = []
+        for file_lines in files.values():
+            previous = None
+            for line_number in sorted(file_lines):
+                if output and (previous is None or line_number > previous + 1):
+                    output.append("--")
+                output.append(file_lines[line_number])
+                previous = line_number
+        return "\n".join(output)
+
+    @classmethod
+    def to_tool(cls: Type["SearchCodeFunction"]) -> StructuredTool:
+        return StructuredTool.from_function(
+            name=cls.function_name(),
+            description="""Search file contents across the project (like grep).
+
+Returns matching lines as "path:line: text" with surrounding context lines.
+Prefer this over reading files one by one to find where something is defined or used.
+
+Usage examples:
+- Find a text: pattern='def execute'
+- Regular expression: pattern='class \\w+Function', is_regex=True
+- Python files only: pattern='TODO', file_extensions=['py']
+- Specific directory: pattern='import', root_directory='src/'
+            """,
+            func=cls.execute,
+            coroutine=cls.aexecute,
+            args_schema=SearchCodeInput,
+        )
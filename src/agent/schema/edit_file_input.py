@@ -0,0 +1,33 @@
+from typing import List, Optional
+
+from pydantic import Field
+
+from src.application.schema.base import BaseInput, BaseSchema
+
+
+class SearchReplaceBlock(BaseSchema):
+    """Exact text to find and the text to put in its place"""
+
+    search: str = Field(
+        ...,
+        description="Existing text to replace, copied exactly "
+        "(include enough lines to be unique)",
+    )
+
+    replace: str = Field(..., description="New text")
+
+
+class EditFileInput(BaseInput):
+    """Input for editing part of a file"""
+
+    filepath: str = Field(..., description="Path to the target file to edit")
+
+    edits: Optional[List[SearchReplaceBlock]] = Field(
+        default=None, description="Search/replace blocks applied in order"
+    )
+
+    diff: Optional[str] = Field(
+        default=None,
+        description="Unified diff of the file (hunks starting with '@@'), "
+        "used instead of edits",
+    )
@@ -0,0 +1,24 @@
+from typing import Optional
+
+from pydantic import Field
+
+from src.application.schema.base import BaseInput
+
+
+class FindDefinitionInput(BaseInput):
+    """Input for finding where a symbol is defined"""
+
+    symbol: str = Field(
+        ...,
+        description="Name to look up (e.g. 'execute') "
+        "or qualified name (e.g. 'ReadFileFunction.execute')",
+    )
+
+    root_directory: Optional[str] = Field(
+        default=".",
+        description="Root directory of the project (default: current directory)",
+    )
+
+    max_results: Optional[int] = Field(
+        default=50, description="Maximum number of definitions to return (default: 50)"
+    )
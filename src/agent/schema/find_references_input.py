@@ -0,0 +1,20 @@
+from typing import Optional
+
+from pydantic import Field
+
+from src.application.schema.base import BaseInput
+
+
+class FindReferencesInput(BaseInput):
+    """Input for finding where a symbol is used"""
+
+    symbol: str = Field(..., description="Name to look up (e.g. 'execute')")
+
+    root_directory: Optional[str] = Field(
+        default=".",
+        description="Root directory of the project (default: current directory)",
+    )
+
+    max_results: Optional[int] = Field(
+        default=100, description="Maximum number of references to return (default: 100)"
+    )
@@ -15,3 +15,27 @@ class GenerateDiffInput(BaseInput):
     file_path: str | None = Field(
         default=None, description="Specific file path (if not specified, all files)"
     )
+    context_lines: int | None = Field(
+        default=None,
+        ge=0,
+        description="Lines of context around each change "
+        "(default 3; 1 gives a tighter diff)",
+    )
+    ignore_whitespace: bool = Field(
+        default=False, description="Ignore whitespace-only changes"
+    )
+    detect_renames: bool = Field(
+        default=True, description="Show moved files as renames instead of delete + add"
+    )
+    exclude_generated: bool = Field(
+        default=False, description="Leave out lockfiles and generated files"
+    )
+    token_budget: int | None = Field(
+        default=None,
+        gt=0,
+        description="Maximum tokens per page; "
+        "the diff is split into pages of whole files",
+    )
+    page: int = Field(
+        default=1, ge=1, description="Page to return when token_budget is set"
+    )
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import Field
 
@@ -29,5 +29,39 @@ class GetFilesListInput(BaseInput):
     )
 
     max_files: Optional[int] = Field(
-        default=1000, description="Maximum number of files to retrieve (default: 1000)"
+        default=1000,
+        ge=1,
+        description="Maximum number of files to retrieve (default: 1000)",
+    )
+
+    backend: Optional[Literal["auto", "git", "index", "walk"]] = Field(
+        default="auto",
+        description="How to collect files: 'index' or 'auto' (cached filesystem "
+        "index, default), 'walk' (fresh filesystem walk) or 'git' (git index, "
+        "honours .gitignore; walks the filesystem outside a git repository)",
+    )
+
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Continuation cursor: pass the next_cursor of a truncated result "
+        "to get the next page",
+    )
+
+    output_format: Optional[Literal["list", "tree"]] = Field(
+        default="list",
+        description="'list' returns full paths in files_list (default), "
+        "'tree' returns files_tree, an indented directory tree "
+        "that uses far fewer tokens",
+    )
+
+    token_budget: Optional[int] = Field(
+        default=None,
+        description="Approximate token limit of files_tree; "
+        "large directories are collapsed into file counts to fit",
+    )
+
+    include_metadata: Optional[bool] = Field(
+        default=False,
+        description="Also return files_metadata: size in bytes, "
+        "estimated lines and tokens, and binary/generated flags for each file",
     )
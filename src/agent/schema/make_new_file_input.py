@@ -1,4 +1,7 @@
+from typing import Literal
+
 from pydantic import Field
+
 from src.application.schema.base import BaseInput
 
 
@@ -7,3 +10,8 @@ class MakeNewFileInput(BaseInput):
 
     filepath: str = Field(..., description="Path of the file to create")
     file_contents: str = Field(..., description="Contents to write to the file")
+    mode: Literal["write", "append"] = Field(
+        "write",
+        description="'write' replaces the file; 'append' adds the contents to its end, "
+        "to write a large file in several chunks",
+    )
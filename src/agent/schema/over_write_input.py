@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 
 from src.application.schema.base import BaseInput
@@ -6,3 +8,8 @@ from src.application.schema.base import BaseInput
 class OverwriteFileInput(BaseInput):
     filepath: str = Field(..., description="Path to the target file to overwrite")
     new_text: str = Field(..., description="New content to write")
+    mode: Literal["write", "append"] = Field(
+        "write",
+        description="'write' replaces the file; 'append' adds the text to its end, "
+        "to write a large file in several chunks",
+    )
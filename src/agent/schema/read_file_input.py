@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import Field
 
 from src.application.schema.base import BaseInput
@@ -7,3 +9,20 @@ class ReadFileInput(BaseInput):
     """Input for reading a file"""
 
     filepath: str = Field(..., description="Path to the target file to read")
+
+    start_line: Optional[int] = Field(
+        default=None,
+        description="First line to read (1-based, inclusive). "
+        "Reads from the start if omitted",
+    )
+
+    end_line: Optional[int] = Field(
+        default=None,
+        description="Last line to read (inclusive). Reads to the end if omitted",
+    )
+
+    outline: Optional[bool] = Field(
+        default=False,
+        description="Return only class/function signatures "
+        "and docstring summaries with line numbers",
+    )
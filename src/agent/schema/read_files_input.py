@@ -0,0 +1,33 @@
+from typing import List, Optional
+
+from pydantic import Field
+
+from src.application.schema.base import BaseInput, BaseSchema
+
+
+class FileReadRequest(BaseSchema):
+    """File (or range of lines) to read"""
+
+    filepath: str = Field(..., description="Path to the file to read")
+
+    start_line: Optional[int] = Field(
+        default=None, description="First line to read (1-based, inclusive)"
+    )
+
+    end_line: Optional[int] = Field(
+        default=None, description="Last line to read (inclusive)"
+    )
+
+
+class ReadFilesInput(BaseInput):
+    """Input for reading several files at once"""
+
+    files: List[FileReadRequest] = Field(
+        ..., description="Files to read, each with an optional line range"
+    )
+
+    max_tokens: Optional[int] = Field(
+        default=20000,
+        description="Approximate token budget for all contents together; "
+        "large files are truncated first (default: 20000)",
+    )
@@ -14,3 +14,8 @@ class ReviewerInput(BaseInput):
     programmer_comment: Optional[str] = Field(
         None, description="Supplementary explanation from programmer (optional)"
     )
+    previous_review_summary: Optional[str] = Field(
+        None,
+        description="Summary of the previous review; "
+        "when set, diff only contains the changes made since that review",
+    )
@@ -0,0 +1,56 @@
+from typing import List, Literal, Optional
+
+from pydantic import Field
+
+from src.application.schema.base import BaseInput
+
+
+class SearchCodeInput(BaseInput):
+    """Input for searching file contents"""
+
+    pattern: str = Field(..., description="Text or regular expression to search for")
+
+    is_regex: Optional[bool] = Field(
+        default=False,
+        description="Treat pattern as a regular expression (default: literal text)",
+    )
+
+    case_sensitive: Optional[bool] = Field(
+        default=True, description="Whether the search is case sensitive (default: true)"
+    )
+
+    file_extensions: Optional[List[str]] = Field(
+        default=None,
+        description="List of file extensions to search (e.g. ['py', 'js']). "
+        "If not specified, search all files",
+    )
+
+    include_patterns: Optional[List[str]] = Field(
+        default=None,
+        description="List of file patterns to search (e.g. ['src/**/*.py'])",
+    )
+
+    exclude_patterns: Optional[List[str]] = Field(
+        default=None,
+        description="List of file patterns to exclude (e.g. ['**/tests/**'])",
+    )
+
+    root_directory: Optional[str] = Field(
+        default=".",
+        description="Root directory to search from (default: current directory)",
+    )
+
+    context_lines: Optional[int] = Field(
+        default=2,
+        description="Number of lines to show before and after each match (default: 2)",
+    )
+
+    max_matches: Optional[int] = Field(
+        default=100,
+        description="Maximum number of matching lines to return (default: 100)",
+    )
+
+    backend: Optional[Literal["auto", "git", "index", "walk"]] = Field(
+        default="auto",
+        description="How to collect files, same as GetFilesList (default: 'auto')",
+    )
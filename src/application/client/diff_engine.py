@@ -0,0 +1,747 @@
+"""
+Combined working-tree diff
+
+One `git status --porcelain=v2` pass lists staged, modified and untracked
+files together with the current branch. The diff is then produced by a single
+`git diff HEAD` (which covers staged and unstaged changes) plus a diff of the
+untracked files, and memoised until the status output or the size/mtime of a
+changed file differs, so repeated calls on an unchanged tree only run
+`git status`.
+
+Untracked files are streamed into the diff with per-file and total size caps,
+so a stray multi-megabyte artifact only costs the capped number of bytes.
+
+Diffs can be shaped (context lines, whitespace, renames, generated files left
+out) and split into per-file pages under a token budget (paginate_diff).
+
+snapshot parses the diff into a DiffSnapshot, memoised the same way, so every
+stage of a development cycle shares one parsed diff per working-tree state.
+
+snapshot_tree records the working tree as a git tree object through a
+temporary index, and diff_trees compares two such snapshots, which gives the
+changes made between two reviews. Untracked files go through the same size
+and binary limits as in the diff, so artifacts are never hashed into the
+object store.
+"""
+
+import hashlib
+import io
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import Dict, List, NamedTuple, Optional, TextIO, Tuple
+
+from src.application.client.git_service import get_git_service
+from src.application.schema.diff_snapshot import DiffHunk, DiffSnapshot, FileDiff
+from src.infrastructure.utils.file_metadata import (
+    get_file_metadata,
+    is_generated_content,
+    is_generated_name,
+)
+from src.infrastructure.utils.tree_render import CHARS_PER_TOKEN, estimate_tokens
+
+INITIAL_COMMIT = "(initial)"
+# Bytes sniffed for NUL to detect binary files
+BINARY_SNIFF_SIZE = 8192
+# Largest part of a single untracked file included in the diff
+UNTRACKED_FILE_MAX_BYTES = 256 * 1024
+# Largest total of untracked file contents included in the diff
+UNTRACKED_TOTAL_MAX_BYTES = 1024 * 1024
+# Names listed for untracked files left out once the total cap is reached
+OMITTED_FILES_SHOWN = 20
+# Tree snapshots whose left-out untracked files are remembered
+TREE_OMISSIONS_KEPT = 16
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class StatusEntry(NamedTuple):
+    """A changed path reported by git status"""
+
+    path: str
+    staged: bool
+    modified: bool
+    untracked: bool
+
+
+class CombinedDiff(NamedTuple):
+    """Tracked, staged and untracked changes of the working tree"""
+
+    branch: str
+    diff: str
+    fingerprint: str
+    staged_files: List[str]
+    modified_files: List[str]
+    untracked_files: List[str]
+    excluded_files: List[str]
+
+
+def write_untracked_diff(
+    out: TextIO,
+    root_path: str,
+    files: List[str],
+    max_file_bytes: int = UNTRACKED_FILE_MAX_BYTES,
+    max_total_bytes: int = UNTRACKED_TOTAL_MAX_BYTES,
+) -> None:
+    """
+    Write untracked files as added files in unified diff format
+
+    Each file is read only up to the remaining cap; cut files end with a
+    "[truncated: ...]" marker and files past the total cap are only named.
+    Files whose first bytes contain NUL are reported as binary without reading
+    the rest.
+
+    Args:
+        out: Stream to write to (e.g. io.StringIO)
+        root_path: Directory the paths are relative to
+        files: Untracked file paths
+        max_file_bytes: Maximum bytes shown per file
+        max_total_bytes: Maximum bytes shown for all files together
+    """
+    remaining = max_total_bytes
+    for number, file in enumerate(files):
+        if remaining <= 0:
+            omitted = files[number:]
+            names = ", ".join(omitted[:OMITTED_FILES_SHOWN])
+            if len(omitted) > OMITTED_FILES_SHOWN:
+                names += ", ..."
+            out.write(
+                f"[truncated: {len(omitted)} more untracked files not shown: {names}]\n"
+            )
+            return
+
+        try:
+            with open(os.path.join(root_path, file), "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                data = f.read(min(BINARY_SNIFF_SIZE, max_file_bytes, remaining))
+                binary = b"\0" in data
+                if not binary:
+                    data += f.read(min(max_file_bytes, remaining) - len(data))
+        except OSError:
+            # Removed or unreadable since git status
+            continue
+
+        out.write(f"diff --git a/{file} b/{file}\n")
+        out.write("new file mode 100644\n")
+        if binary:
+            out.write(f"Binary file {file} added\n\n")
+            continue
+
+        remaining -= len(data)
+        if len(data) < size:
+            # Cut at a line boundary so no partial character or line is shown
+            cut = data.rfind(b"\n") + 1
+            data = data[:cut] if cut else data
+        out.write(
+            f"index 0000000..{hashlib.blake2b(data, digest_size=4).hexdigest()[:7]}\n"
+        )
+        out.write("--- /dev/null\n")
+        out.write(f"+++ b/{file}\n")
+        lines = data.decode("utf-8", errors="replace").splitlines()
+        if lines:
+            out.write(f"@@ -0,0 +1,{len(lines)} @@\n")
+            out.write("+")
+            out.write("\n+".join(lines))
+            out.write("\n")
+        if len(data) < size:
+            out.write(
+                f"[truncated: {size - len(data)} more bytes of {file} not shown]\n"
+            )
+        out.write("\n")
+
+
+class DiffPage(NamedTuple):
+    """A page of a diff split under a token budget"""
+
+    text: str
+    paths: List[str]
+
+
+def is_generated_file(root_path: str, path: str) -> bool:
+    """
+    Check whether a changed file is a lockfile or generated
+
+    Args:
+        root_path: Directory the path is relative to
+        path: File path
+
+    Returns:
+        True for generated names, and for existing files with a generated marker
+        or minified contents
+    """
+    if is_generated_name(path):
+        return True
+    abs_path = os.path.join(root_path, path)
+    return os.path.isfile(abs_path) and bool(get_file_metadata(abs_path)["generated"])
+
+
+def split_diff_by_file(diff: str) -> List[Tuple[str, str]]:
+    """
+    Split a multi-file diff into per-file sections
+
+    Args:
+        diff: Diff text
+
+    Returns:
+        (path, section text) pairs in diff order
+    """
+    starts = [
+        match.start() for match in re.finditer(r"^diff --git ", diff, re.MULTILINE)
+    ]
+    if not starts:
+        return [("", diff)] if diff else []
+    # Text before the first header belongs to the first section
+    starts[0] = 0
+    sections = []
+    for start, end in zip(starts, starts[1:] + [len(diff)]):
+        section = diff[start:end]
+        files = parse_unified_diff(section)
+        sections.append((files[0].path if files else "", section))
+    return sections
+
+
+def _truncate_section(path: str, section: str, token_budget: int) -> str:
+    """Cut a file section to the token budget at a line boundary"""
+    marker = (
+        "[truncated: {count} more lines of {path}; request it alone with "
+        "file_path='{path}' and a larger token_budget]\n"
+    )
+    limit = max(0, token_budget * CHARS_PER_TOKEN - len(marker) - len(path) * 2 - 10)
+    lines = section.splitlines(keepends=True)
+    kept, size = 0, 0
+    while kept < len(lines) and size + len(lines[kept]) <= limit:
+        size += len(lines[kept])
+        kept += 1
+    return "".join(lines[:kept]) + marker.format(count=len(lines) - kept, path=path)
+
+
+def paginate_diff(diff: str, token_budget: int) -> List[DiffPage]:
+    """
+    Split a diff into pages of whole files under a token budget
+
+    Files are never split across pages; a single file over the budget is
+    truncated with a marker telling how to request it alone.
+
+    Args:
+        diff: Diff text
+        token_budget: Maximum estimated tokens per page
+
+    Returns:
+        Pages in diff order (one empty page for an empty diff)
+    """
+    pages: List[DiffPage] = []
+    texts: List[str] = []
+    paths: List[str] = []
+    used = 0
+    for path, section in split_diff_by_file(diff):
+        tokens = estimate_tokens(section)
+        if tokens > token_budget:
+            section = _truncate_section(path, section, token_budget)
+            tokens = estimate_tokens(section)
+        if texts and used + tokens > token_budget:
+            pages.append(DiffPage("".join(texts), paths))
+            texts, paths, used = [], [], 0
+        texts.append(section)
+        paths.append(path)
+        used += tokens
+    if texts or not pages:
+        pages.append(DiffPage("".join(texts), paths))
+    return pages
+
+
+def _diff_options(
+    context_lines: Optional[int], ignore_whitespace: bool, detect_renames: bool
+) -> List[str]:
+    """git diff options for the shaping options of DiffEngine.diff"""
+    options = []
+    if context_lines is not None:
+        options.append(f"-U{context_lines}")
+    if ignore_whitespace:
+        options.append("--ignore-all-space")
+    options.append("-M" if detect_renames else "--no-renames")
+    return options
+
+
+def _pathspec(file_path: Optional[str], excluded_files: List[str]) -> List[str]:
+    """Pathspec arguments limiting a diff to file_path, without excluded_files"""
+    paths = ["--", file_path] if file_path else ["--"]
+    paths += [f":(top,exclude,literal){path}" for path in excluded_files]
+    return [] if paths == ["--"] else paths
+
+
+def _strip_prefix(path: str) -> str:
+    return path[2:] if path[:2] in ("a/", "b/") else path
+
+
+def parse_unified_diff(diff: str) -> List[FileDiff]:
+    """
+    Parse a multi-file unified diff as produced by git diff
+
+    Args:
+        diff: Diff text
+
+    Returns:
+        One FileDiff per "diff --git" section
+    """
+    files: List[FileDiff] = []
+    current: Optional[FileDiff] = None
+    hunk: Optional[DiffHunk] = None
+    old_remaining = new_remaining = 0
+    for line in diff.splitlines():
+        if hunk is not None and (old_remaining > 0 or new_remaining > 0):
+            # Hunk body; "---"/"+++" here are removed/added lines, not headers
+            if line.startswith("+"):
+                hunk.added += 1
+                new_remaining -= 1
+            elif line.startswith("-"):
+                hunk.removed += 1
+                old_remaining -= 1
+            elif not line.startswith("\\"):
+                old_remaining -= 1
+                new_remaining -= 1
+            continue
+
+        if line.startswith("diff --git "):
+            # "diff --git a/<path> b/<path>"; the +++ line or rename header refines it
+            path = line[len("diff --git ") :].rsplit(" b/", 1)[-1]
+            current = FileDiff(path=path)
+            files.append(current)
+            hunk = None
+        elif current is None:
+            continue
+        elif line.startswith("new file mode"):
+            current.status = "added"
+        elif line.startswith("deleted file mode"):
+            current.status = "deleted"
+        elif line.startswith("rename from "):
+            current.status = "renamed"
+            current.old_path = line[len("rename from ") :]
+        elif line.startswith("rename to "):
+            current.path = line[len("rename to ") :]
+        elif line.startswith("Binary file"):
+            current.binary = True
+        elif line.startswith("+++ ") and line[4:] != "/dev/null":
+            current.path = _strip_prefix(line[4:])
+        elif (
+            line.startswith("--- ")
+            and current.status == "deleted"
+            and line[4:] != "/dev/null"
+        ):
+            current.path = _strip_prefix(line[4:])
+        else:
+            match = _HUNK_HEADER.match(line)
+            if match:
+                old_start, old_lines, new_start, new_lines = match.groups()
+                hunk = DiffHunk(
+                    header=line,
+                    old_start=int(old_start),
+                    old_lines=int(old_lines) if old_lines is not None else 1,
+                    new_start=int(new_start),
+                    new_lines=int(new_lines) if new_lines is not None else 1,
+                )
+                current.hunks.append(hunk)
+                old_remaining, new_remaining = hunk.old_lines, hunk.new_lines
+
+    for file in files:
+        file.added = sum(hunk.added for hunk in file.hunks)
+        file.removed = sum(hunk.removed for hunk in file.hunks)
+    return files
+
+
+def parse_status(output: bytes) -> Tuple[str, str, List[StatusEntry]]:
+    """
+    Parse `git status --porcelain=v2 -z --branch`
+
+    Args:
+        output: Raw command output
+
+    Returns:
+        (HEAD commit or "(initial)", branch name, changed paths)
+    """
+    head, branch = "", ""
+    entries: List[StatusEntry] = []
+    records = output.split(b"\0")
+    index = 0
+    while index < len(records):
+        record = os.fsdecode(records[index])
+        index += 1
+        if not record:
+            continue
+        if record.startswith("# branch.oid "):
+            head = record[len("# branch.oid ") :]
+        elif record.startswith("# branch.head "):
+            branch = record[len("# branch.head ") :]
+        elif record[0] in "12u":
+            # "1 XY sub mH mI mW hH hI path", "2 ... Xscore path" + original path,
+            # "u ... path"
+            fields = {"1": 9, "2": 10, "u": 11}[record[0]]
+            parts = record.split(" ", fields - 1)
+            status = parts[1]
+            entries.append(
+                StatusEntry(parts[-1], status[0] != ".", status[1] != ".", False)
+            )
+            if record[0] == "2":
+                # Skip the original path of a rename
+                index += 1
+        elif record.startswith("? "):
+            entries.append(StatusEntry(record[2:], False, False, True))
+    return head, branch, entries
+
+
+class DiffEngine:
+    """Diff of a repository's working tree against HEAD, including untracked files"""
+
+    def __init__(
+        self,
+        repo_path: str,
+        max_file_bytes: int = UNTRACKED_FILE_MAX_BYTES,
+        max_total_bytes: int = UNTRACKED_TOTAL_MAX_BYTES,
+    ):
+        """
+        Args:
+            repo_path: Path inside the repository
+            max_file_bytes: Maximum bytes shown per untracked file
+            max_total_bytes: Maximum bytes shown for all untracked files
+        """
+        self.repo_path = os.path.abspath(repo_path)
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self.git = get_git_service(self.repo_path)
+        # (file_path, options) -> latest result, checked against the current fingerprint
+        self._cache: Dict[tuple, CombinedDiff] = {}
+        self._snapshots: Dict[Optional[str], DiffSnapshot] = {}
+        # Tree snapshot -> untracked files it left out
+        self._tree_omissions: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def toplevel(self) -> str:
+        """Root directory of the repository"""
+        return self.git.working_tree_dir
+
+    def diff(
+        self,
+        file_path: Optional[str] = None,
+        context_lines: Optional[int] = None,
+        ignore_whitespace: bool = False,
+        detect_renames: bool = True,
+        exclude_generated: bool = False,
+    ) -> CombinedDiff:
+        """
+        Get all local changes
+
+        Args:
+            file_path: Restrict the diff to this path
+            context_lines: Lines of context around changes (git's default is 3)
+            ignore_whitespace: Ignore changes in whitespace (files changing only
+                whitespace disappear)
+            detect_renames: Show moved files as renames instead of a deletion and
+                an addition
+            exclude_generated: Leave out lockfiles and generated files
+
+        Returns:
+            CombinedDiff
+
+        Raises:
+            subprocess.CalledProcessError: When a git command fails
+        """
+        pathspec = ["--", file_path] if file_path else []
+        output = self.git.status(
+            "--porcelain=v2", "-z", "--branch", "--untracked-files=all", *pathspec
+        )
+        head, branch, entries = parse_status(output)
+        fingerprint = self._fingerprint(output, entries)
+        key = (
+            file_path,
+            context_lines,
+            ignore_whitespace,
+            detect_renames,
+            exclude_generated,
+        )
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached.fingerprint == fingerprint:
+                return cached
+
+        excluded_files: List[str] = []
+        if exclude_generated:
+            excluded_files = [
+                entry.path
+                for entry in entries
+                if self._is_generated(entry.path, "HEAD")
+            ]
+            entries = [entry for entry in entries if entry.path not in excluded_files]
+
+        tracked = ""
+        if any(not entry.untracked for entry in entries):
+            options = ["--cached"] if head == INITIAL_COMMIT else ["HEAD"]
+            options += _diff_options(context_lines, ignore_whitespace, detect_renames)
+            paths = _pathspec(file_path, excluded_files)
+            tracked = self.git.diff(*options, *paths).decode("utf-8", errors="replace")
+
+        untracked_files = [entry.path for entry in entries if entry.untracked]
+        result = CombinedDiff(
+            branch=branch,
+            diff=tracked + self._untracked_diff(untracked_files),
+            fingerprint=fingerprint,
+            staged_files=[entry.path for entry in entries if entry.staged],
+            modified_files=[entry.path for entry in entries if entry.modified],
+            untracked_files=untracked_files,
+            excluded_files=excluded_files,
+        )
+        with self._lock:
+            self._cache[key] = result
+        return result
+
+    def snapshot(self, file_path: Optional[str] = None) -> DiffSnapshot:
+        """
+        Get all local changes, parsed
+
+        The snapshot is parsed once per working-tree state and shared by all callers.
+
+        Args:
+            file_path: Restrict the diff to this path
+
+        Returns:
+            DiffSnapshot
+
+        Raises:
+            subprocess.CalledProcessError: When a git command fails
+        """
+        combined = self.diff(file_path)
+        with self._lock:
+            cached = self._snapshots.get(file_path)
+            if cached is not None and cached.fingerprint == combined.fingerprint:
+                return cached
+
+        files = parse_unified_diff(combined.diff)
+        snapshot = DiffSnapshot(
+            fingerprint=combined.fingerprint,
+            branch=combined.branch,
+            diff=combined.diff,
+            files=files,
+            added=sum(file.added for file in files),
+            removed=sum(file.removed for file in files),
+        )
+        with self._lock:
+            self._snapshots[file_path] = snapshot
+        return snapshot
+
+    def snapshot_tree(self) -> str:
+        """
+        Write the working tree as a git tree object
+
+        Tracked changes are all recorded. Untracked files are recorded only
+        while they are text, at most max_file_bytes each and max_total_bytes
+        together, the limits the diff shows them with; the others are
+        remembered per tree and named by diff_trees.
+
+        A copy of the real index is used, so its stat data spares re-hashing
+        unchanged files and the real index is left untouched.
+
+        Returns:
+            Tree object id
+
+        Raises:
+            subprocess.CalledProcessError: When a git command fails
+        """
+        output = self.git.status("--porcelain=v2", "-z", "--untracked-files=all")
+        untracked = [entry.path for entry in parse_status(output)[2] if entry.untracked]
+        recorded, omitted = self._select_untracked(untracked)
+
+        git_index = self.git.index_path
+        fd, temp_index = tempfile.mkstemp(prefix="agent_index_")
+        os.close(fd)
+        fd, pathspec_file = tempfile.mkstemp(prefix="agent_pathspec_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for path in recorded:
+                    f.write(
+                        f":(top,literal){path}\0".encode(
+                            "utf-8", errors="surrogateescape"
+                        )
+                    )
+            if os.path.exists(git_index):
+                shutil.copyfile(git_index, temp_index)
+            else:
+                # git creates a missing index, but rejects an empty file
+                os.unlink(temp_index)
+            env = {**os.environ, "GIT_INDEX_FILE": temp_index}
+            self.git.add("-u", ":/", env=env)
+            if recorded:
+                self.git.add(
+                    f"--pathspec-from-file={pathspec_file}",
+                    "--pathspec-file-nul",
+                    env=env,
+                )
+            tree = self.git.run("write-tree", env=env).decode().strip()
+        finally:
+            for path in (temp_index, pathspec_file):
+                if os.path.exists(path):
+                    os.unlink(path)
+
+        with self._lock:
+            if len(self._tree_omissions) >= TREE_OMISSIONS_KEPT:
+                self._tree_omissions.pop(next(iter(self._tree_omissions)))
+            self._tree_omissions[tree] = omitted
+        return tree
+
+    def diff_trees(
+        self,
+        old_tree: str,
+        new_tree: str,
+        context_lines: Optional[int] = None,
+        ignore_whitespace: bool = False,
+        detect_renames: bool = True,
+        exclude_generated: bool = False,
+    ) -> str:
+        """
+        Get the diff between two tree snapshots
+
+        Takes the shaping options of diff. Untracked files the new snapshot
+        left out are named at the end.
+
+        Args:
+            old_tree: Tree object id of the earlier snapshot
+            new_tree: Tree object id of the later snapshot
+            context_lines: Lines of context around changes (git's default is 3)
+            ignore_whitespace: Ignore changes in whitespace
+            detect_renames: Show moved files as renames instead of a deletion and
+                an addition
+            exclude_generated: Leave out lockfiles and generated files
+
+        Returns:
+            Unified diff ("" when the trees are equal)
+
+        Raises:
+            subprocess.CalledProcessError: When a git command fails
+        """
+        with self._lock:
+            omitted = self._tree_omissions.get(new_tree, [])
+        note = ""
+        if omitted:
+            names = ", ".join(omitted[:OMITTED_FILES_SHOWN])
+            if len(omitted) > OMITTED_FILES_SHOWN:
+                names += ", ..."
+            note = (
+                f"[not shown: {len(omitted)} untracked files that are binary "
+                f"or over the size limits: {names}]\n"
+            )
+        if old_tree == new_tree:
+            return note
+
+        options = _diff_options(context_lines, ignore_whitespace, detect_renames)
+        excluded_files: List[str] = []
+        if exclude_generated:
+            changed = self.git.diff(
+                "--name-only", "-z", "--no-renames", old_tree, new_tree
+            )
+            excluded_files = [
+                path
+                for path in changed.decode("utf-8", errors="surrogateescape").split(
+                    "\0"
+                )
+                if path and self._is_generated(path, old_tree)
+            ]
+        diff = self.git.diff(
+            *options, old_tree, new_tree, *_pathspec(None, excluded_files)
+        )
+        return diff.decode("utf-8", errors="replace") + note
+
+    def clear(self) -> None:
+        """Drop the memoised diffs"""
+        with self._lock:
+            self._cache.clear()
+            self._snapshots.clear()
+
+    def _fingerprint(self, status_output: bytes, entries: List[StatusEntry]) -> str:
+        """Hash of the status output plus size and mtime of every changed file"""
+        digest = hashlib.blake2b(status_output, digest_size=16)
+        for entry in entries:
+            try:
+                file_stat = os.stat(os.path.join(self.toplevel, entry.path))
+                digest.update(
+                    f"\0{entry.path}\0{file_stat.st_size}"
+                    f"\0{file_stat.st_mtime_ns}".encode()
+                )
+            except OSError:
+                digest.update(f"\0{entry.path}\0-".encode())
+        return digest.hexdigest()
+
+    def _is_generated(self, path: str, rev: str) -> bool:
+        """
+        Check whether a changed file is generated, reading deleted files at rev
+
+        A file deleted from the working tree is checked through its committed
+        version, read from the service's persistent cat-file process.
+        """
+        if is_generated_file(self.toplevel, path):
+            return True
+        if os.path.lexists(os.path.join(self.toplevel, path)):
+            return False
+        data = self.git.read_blob(rev, path)
+        return data is not None and is_generated_content(data)
+
+    def _select_untracked(self, files: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Split untracked files into those a tree snapshot records and those it leaves out
+
+        Returns:
+            Tuple of (recorded, omitted) paths
+        """
+        recorded, omitted = [], []
+        remaining = self.max_total_bytes
+        for file in files:
+            try:
+                with open(os.path.join(self.toplevel, file), "rb") as f:
+                    size = os.fstat(f.fileno()).st_size
+                    binary = size <= self.max_file_bytes and b"\0" in f.read(
+                        BINARY_SNIFF_SIZE
+                    )
+            except OSError:
+                # Removed since git status
+                continue
+            if binary or size > self.max_file_bytes or size > remaining:
+                omitted.append(file)
+            else:
+                recorded.append(file)
+                remaining -= size
+        return recorded, omitted
+
+    def _untracked_diff(self, untracked_files: List[str]) -> str:
+        """Show untracked files as added files"""
+        out = io.StringIO()
+        write_untracked_diff(
+            out,
+            self.toplevel,
+            untracked_files,
+            self.max_file_bytes,
+            self.max_total_bytes,
+        )
+        return out.getvalue()
+
+
+# Diff engines per repository, shared by the agents of this process
+_engines: Dict[str, DiffEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_diff_engine(repo_path: str) -> DiffEngine:
+    """
+    Get the shared diff engine of a repository
+
+    Args:
+        repo_path: Path inside the repository
+
+    Returns:
+        DiffEngine
+    """
+    repo_path = os.path.abspath(repo_path)
+    with _engines_lock:
+        engine = _engines.get(repo_path)
+        if engine is None:
+            engine = DiffEngine(repo_path)
+            _engines[repo_path] = engine
+        return engine
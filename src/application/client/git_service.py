@@ -0,0 +1,378 @@
+"""
+Shared git access
+
+One GitService per working tree holds a GitPython Repo. Refs and branches are
+read in-process, and single objects (the committed version of a deleted file,
+whether a review snapshot still exists) are read through GitPython's
+long-lived `git cat-file --batch` / `--batch-check` processes, and
+commit_paths commits through GitPython's index without starting git. The
+remaining commands (status, diff, add, commit, checkout, push, ls-files) run
+from the working directory the service was created for. Every operation is timed so
+the coordinator can report where git time goes.
+
+Failed commands raise subprocess.CalledProcessError with the command output as
+text, like the subprocess calls this service replaces.
+"""
+
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from git import (
+    Git,
+    GitCommandError,
+    GitCommandNotFound,
+    InvalidGitRepositoryError,
+    NoSuchPathError,
+    Repo,
+)
+
+
+class GitService:
+    """Git operations on one working tree"""
+
+    def __init__(self, repo_path: str):
+        """
+        Args:
+            repo_path: Path inside the working tree
+        """
+        self.repo_path = os.path.abspath(repo_path)
+        self._repo: Optional[Repo] = None
+        # Commands run from repo_path so relative paths mean the same as in a shell
+        # there
+        self.git = Git(self.repo_path)
+        # operation -> [calls, total seconds]
+        self._latency: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        # The cat-file processes serve one request at a time
+        self._cat_file_lock = threading.Lock()
+
+    @property
+    def repo(self) -> Repo:
+        """GitPython Repo of the working tree"""
+        if self._repo is None:
+            try:
+                self._repo = Repo(self.repo_path, search_parent_directories=True)
+            except (InvalidGitRepositoryError, NoSuchPathError) as e:
+                raise subprocess.CalledProcessError(
+                    128, ["git", "rev-parse"], output=f"not a git repository: {e}"
+                ) from None
+        return self._repo
+
+    @property
+    def working_tree_dir(self) -> str:
+        """Root directory of the working tree"""
+        return str(self.repo.working_tree_dir)
+
+    @property
+    def index_path(self) -> str:
+        """Path of the index file"""
+        return os.path.join(self.repo.git_dir, "index")
+
+    def current_branch(self) -> str:
+        """
+        Get the checked-out branch without running git
+
+        Returns:
+            Branch name, or "HEAD" when detached
+        """
+        with self._timed("branch"):
+            try:
+                return self.repo.active_branch.name
+            except TypeError:
+                return "HEAD"
+
+    def branches(self) -> List[str]:
+        """
+        Get the local branches without running git
+
+        Returns:
+            Branch names
+        """
+        with self._timed("branch"):
+            return [head.name for head in self.repo.heads]
+
+    def checkout(self, branch_name: str, create: bool = False) -> str:
+        """
+        Switch to a branch
+
+        Args:
+            branch_name: Branch name
+            create: Create the branch from the current HEAD
+
+        Returns:
+            Command output
+        """
+        args = ["checkout", "-b", branch_name] if create else ["checkout", branch_name]
+        return self.run(*args, op="checkout", include_stderr=True).decode(
+            "utf-8", errors="replace"
+        )
+
+    def object_info(self, rev: str) -> Optional[Tuple[str, str, int]]:
+        """
+        Look up an object through the persistent `git cat-file --batch-check`
+
+        Args:
+            rev: Revision, e.g. "HEAD" or "HEAD:path/to/file"
+
+        Returns:
+            (object id, type, size), or None if it does not exist
+        """
+        with self._timed("cat-file"), self._cat_file_lock:
+            try:
+                object_id, object_type, size = self.git.get_object_header(rev)
+            except ValueError:
+                return None
+            return object_id.decode("ascii"), object_type.decode("ascii"), size
+
+    def read_blob(self, rev: str, path: str) -> Optional[bytes]:
+        """
+        Read a file at a revision through the persistent `git cat-file --batch`
+
+        Args:
+            rev: Revision, e.g. "HEAD"
+            path: Path relative to the working tree root
+                (prefix with "./" for repo_path)
+
+        Returns:
+            File contents, or None if the file does not exist at rev
+        """
+        with self._timed("cat-file"), self._cat_file_lock:
+            try:
+                _, object_type, _, data = self.git.get_object_data(f"{rev}:{path}")
+            except ValueError:
+                return None
+            return data if object_type == b"blob" else None
+
+    def status(self, *args: str) -> bytes:
+        """Run git status with the given arguments"""
+        return self.run("status", *args, op="status")
+
+    def diff(self, *args: str) -> bytes:
+        """Run git diff with the given arguments"""
+        return self.run("diff", *args, op="diff")
+
+    def list_files(self) -> List[str]:
+        """
+        List tracked and untracked (but not ignored) files under repo_path
+
+        Returns:
+            Paths relative to repo_path separated by "/"
+
+        Raises:
+            subprocess.CalledProcessError: Outside a git work tree
+        """
+        output = self.run(
+            "ls-files",
+            "--cached",
+            "--others",
+            "--exclude-standard",
+            "-z",
+            op="ls-files",
+        ).decode("utf-8", errors="surrogateescape")
+        # Tracked files may be listed twice while they have unmerged stages
+        return list(dict.fromkeys(path for path in output.split("\0") if path))
+
+    def add(self, *paths: str, env: Optional[Dict[str, str]] = None) -> str:
+        """
+        Stage paths ("-A" for everything)
+
+        Args:
+            paths: Paths or options to pass to git add
+            env: Extra environment, e.g. GIT_INDEX_FILE
+
+        Returns:
+            Command output
+        """
+        return self.run("add", *paths, env=env, op="add").decode(
+            "utf-8", errors="replace"
+        )
+
+    def commit(self, message: str) -> str:
+        """
+        Commit the staged changes
+
+        Args:
+            message: Commit message
+
+        Returns:
+            Command output
+        """
+        return self.run(
+            "commit", "-m", message, op="commit", include_stderr=True
+        ).decode("utf-8", errors="replace")
+
+    def commit_paths(self, paths: Sequence[str], message: str) -> str:
+        """
+        Stage paths and commit them in-process through GitPython's index
+
+        No git process is started, so commit hooks do not run.
+
+        Args:
+            paths: Paths relative to repo_path; deleted files are removed
+                from the index
+            message: Commit message
+
+        Returns:
+            SHA of the new commit
+        """
+        with self._timed("index-commit"):
+            index = self.repo.index
+            root = self.working_tree_dir
+            existing, deleted = [], set()
+            for path in paths:
+                abs_path = os.path.join(self.repo_path, path)
+                rel_path = os.path.relpath(abs_path, root).replace(os.sep, "/")
+                if os.path.lexists(abs_path):
+                    existing.append(rel_path)
+                else:
+                    deleted.add(rel_path)
+            if existing:
+                index.add(existing)
+            if deleted:
+                # IndexFile.remove would run `git rm --cached`
+                for key in [key for key in index.entries if key[0] in deleted]:
+                    del index.entries[key]
+                index.write()
+            return index.commit(message).hexsha
+
+    def push(self, remote_name: str, branch_name: str, force: bool = False) -> str:
+        """
+        Push a branch
+
+        Args:
+            remote_name: Remote name
+            branch_name: Branch name
+            force: Force push
+
+        Returns:
+            Command output
+        """
+        args = ["push", "--force"] if force else ["push"]
+        return self.run(
+            *args, remote_name, branch_name, op="push", include_stderr=True
+        ).decode("utf-8", errors="replace")
+
+    def run(
+        self,
+        *args: str,
+        env: Optional[Dict[str, str]] = None,
+        op: Optional[str] = None,
+        include_stderr: bool = False,
+    ) -> bytes:
+        """
+        Run a git command from the service's working directory
+
+        Args:
+            args: Command arguments without "git"
+            env: Extra environment variables
+            op: Name for the latency counters (defaults to the subcommand)
+            include_stderr: Append standard error, where commands like push report
+                progress
+
+        Returns:
+            Standard output
+
+        Raises:
+            subprocess.CalledProcessError: When the command fails
+        """
+        with self._timed(op or args[0]):
+            try:
+                _, stdout, stderr = self.git.execute(
+                    ["git", *args],
+                    with_extended_output=True,
+                    stdout_as_string=False,
+                    strip_newline_in_stdout=False,
+                    env=env,
+                )
+            except GitCommandNotFound as e:
+                raise FileNotFoundError(str(e)) from None
+            except GitCommandError as e:
+                raise subprocess.CalledProcessError(
+                    e.status if isinstance(e.status, int) else 1,
+                    ["git", *args],
+                    output=str(e),
+                ) from None
+        if include_stderr and stderr:
+            stdout += (stderr + "\n").encode("utf-8")
+        return stdout
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the latency counters
+
+        Returns:
+            operation -> {"calls", "total_ms", "avg_ms"}
+        """
+        with self._lock:
+            return {
+                op: {
+                    "calls": int(calls),
+                    "total_ms": round(total * 1000, 1),
+                    "avg_ms": round(total * 1000 / calls, 1) if calls else 0.0,
+                }
+                for op, (calls, total) in self._latency.items()
+            }
+
+    def reset_stats(self) -> None:
+        """Reset the latency counters"""
+        with self._lock:
+            self._latency.clear()
+
+    @contextmanager
+    def _timed(self, op: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                counter = self._latency.setdefault(op, [0, 0.0])
+                counter[0] += 1
+                counter[1] += elapsed
+
+
+# Git services per working tree, shared by the agents of this process
+_services: Dict[str, GitService] = {}
+_services_lock = threading.Lock()
+
+
+def get_git_service(repo_path: str) -> GitService:
+    """
+    Get the shared git service of a working tree
+
+    Args:
+        repo_path: Path inside the working tree
+
+    Returns:
+        GitService
+    """
+    repo_path = os.path.abspath(repo_path)
+    with _services_lock:
+        service = _services.get(repo_path)
+        if service is None:
+            service = GitService(repo_path)
+            _services[repo_path] = service
+        return service
+
+
+def list_git_files(root_path: str) -> Optional[List[str]]:
+    """
+    List files under a directory from the git index
+
+    The repository's own .gitignore decides what is skipped.
+
+    Args:
+        root_path: Directory inside a git work tree
+
+    Returns:
+        Paths relative to root_path separated by "/", or None when root_path is
+        not inside a git work tree or git is not available
+    """
+    try:
+        return get_git_service(root_path).list_files()
+    except (OSError, subprocess.CalledProcessError):
+        return None
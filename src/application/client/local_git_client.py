@@ -1,6 +1,6 @@
-from git import Repo
 from github import GithubException
 
+from src.application.client.git_service import get_git_service
 from src.application.client.github_client import GitHubClient
 from src.infrastructure.utils.logger import get_logger
 
@@ -28,17 +28,17 @@ class LocalGitClient:
         self.repo_full_name = repo_full_name
         self.github_token = github_token
         self.github_username = github_username
-        self.repo = Repo(repo_path)
+        self.git_service = get_git_service(repo_path)
+        self.repo = self.git_service.repo
         self.github_client = GitHubClient(github_token)
 
     def commit_changes(self, file_paths: list[str], commit_message: str) -> dict:
         """Commit changes."""
         try:
-            self.repo.git.add(file_paths)
-            commit = self.repo.index.commit(commit_message)
-            logger.info(f"Changes committed: {commit.hexsha}")
+            sha = self.git_service.commit_paths(file_paths, commit_message)
+            logger.info(f"Changes committed: {sha}")
             return {
-                "commit": {"sha": commit.hexsha, "message": commit_message},
+                "commit": {"sha": sha, "message": commit_message},
                 "files": file_paths,
             }
         except Exception:
@@ -49,7 +49,7 @@ class LocalGitClient:
         """Push changes to remote repository (HTTPS authentication using PAT)."""
         try:
             if branch_name is None:
-                branch_name = self.repo.active_branch.name
+                branch_name = self.git_service.current_branch()
 
             if "origin" not in [remote.name for remote in self.repo.remotes]:
                 raise ValueError("Remote 'origin' is not configured")
@@ -61,7 +61,9 @@ class LocalGitClient:
             origin.set_url(remote_url)
 
             # Execute push
-            self.repo.git.push("--set-upstream", "origin", branch_name)
+            self.git_service.run(
+                "push", "--set-upstream", "origin", branch_name, op="push"
+            )
             logger.info(f"Changes pushed to remote: {branch_name}")
             return True
         except Exception:
@@ -78,7 +80,7 @@ class LocalGitClient:
         """Create a pull request."""
         try:
             if head_branch is None:
-                head_branch = self.repo.active_branch.name
+                head_branch = self.git_service.current_branch()
 
             if head_branch == base_branch:
                 raise ValueError(
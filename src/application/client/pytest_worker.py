@@ -0,0 +1,246 @@
+"""
+Warm pytest worker
+
+Running `pytest <path>` as a new process pays interpreter startup, plugin
+loading and the import of the project's dependencies on every call.
+PytestWorker keeps one pre-forked zygote per project (see pytest_zygote.py)
+that has imported pytest and the test suite's third-party packages, and asks
+it to fork a fresh child per run. Children reload the project's own modules,
+so edits made between runs are always tested.
+"""
+
+import atexit
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+ZYGOTE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "pytest_zygote.py"
+)
+
+# Files whose change means installed dependencies may have changed and the
+# zygote is stale
+DEPENDENCY_FILES = (
+    "pyproject.toml",
+    "setup.py",
+    "setup.cfg",
+    "requirements.txt",
+    "requirements-dev.txt",
+    "poetry.lock",
+    "uv.lock",
+    "Pipfile.lock",
+)
+
+
+class PytestWorkerError(RuntimeError):
+    """The warm worker is unavailable; run pytest as a separate process instead"""
+
+
+def pytest_python() -> str:
+    """
+    Get the interpreter the `pytest` command on PATH runs with
+
+    Returns:
+        Path of the interpreter, or the current one if it cannot be determined
+    """
+    script = shutil.which("pytest")
+    if script:
+        try:
+            with open(script, "rb") as f:
+                first_line = f.readline(512).decode("utf-8", errors="replace").strip()
+        except OSError:
+            first_line = ""
+        if first_line.startswith("#!"):
+            command = first_line[2:].split()
+            # "#!/usr/bin/env python3" names the interpreter in the second word
+            if command and os.path.basename(command[0]) == "env" and len(command) > 1:
+                command = [shutil.which(command[1]) or command[1]]
+            if (
+                command
+                and os.path.basename(command[0]).startswith("python")
+                and os.access(command[0], os.X_OK)
+            ):
+                return command[0]
+    return sys.executable
+
+
+class PytestWorker:
+    """Pre-forked pytest runner for one project"""
+
+    def __init__(self, root_path: str, python: Optional[str] = None):
+        """
+        Args:
+            root_path: Project root, the working directory of the test runs
+            python: Interpreter to run the tests with
+                (default: the one of `pytest` on PATH)
+        """
+        self.root_path = os.path.abspath(root_path)
+        self.python = python or pytest_python()
+        self._process: Optional[subprocess.Popen] = None
+        self._dependencies: Optional[Tuple[Tuple[str, float], ...]] = None
+        self._output_dir: Optional[tempfile.TemporaryDirectory] = None
+        # Set when the zygote cannot start, so later runs go straight to the fallback
+        self._unavailable = False
+        self._lock = threading.Lock()
+
+    def run(self, args: List[str]) -> Dict[str, str]:
+        """
+        Run pytest in a fresh child of the zygote
+
+        Args:
+            args: pytest arguments, e.g. a file or directory path
+
+        Returns:
+            {"stdout", "stderr", "exit_status"}
+
+        Raises:
+            PytestWorkerError: When the worker is unavailable
+        """
+        with self._lock:
+            process = self._ensure_started()
+            stdout_path = os.path.join(self._output_dir.name, "stdout")
+            stderr_path = os.path.join(self._output_dir.name, "stderr")
+            request = {"args": list(args), "stdout": stdout_path, "stderr": stderr_path}
+            try:
+                process.stdin.write(json.dumps(request) + "\n")
+                process.stdin.flush()
+                response = process.stdout.readline()
+            except (OSError, ValueError):
+                response = ""
+            if not response:
+                # The zygote died; the next run starts a new one
+                self._stop()
+                raise PytestWorkerError("pytest worker exited unexpectedly")
+            try:
+                exit_status = int(json.loads(response)["exit_status"])
+            except (ValueError, TypeError, KeyError):
+                # The protocol is out of step; the next run starts a new zygote
+                self._stop()
+                raise PytestWorkerError(
+                    f"malformed response from pytest worker: {response[:200]!r}"
+                ) from None
+            return {
+                "stdout": self._read_output(stdout_path),
+                "stderr": self._read_output(stderr_path),
+                "exit_status": str(exit_status),
+            }
+
+    def start(self) -> None:
+        """Start the zygote ahead of the first run"""
+        with self._lock:
+            self._ensure_started()
+
+    def close(self) -> None:
+        """Stop the zygote"""
+        with self._lock:
+            self._stop()
+
+    def _ensure_started(self) -> subprocess.Popen:
+        if self._unavailable:
+            raise PytestWorkerError("pytest worker is unavailable")
+        dependencies = self._dependency_fingerprint()
+        if self._process is not None and (
+            self._process.poll() is not None or dependencies != self._dependencies
+        ):
+            self._stop()
+        if self._process is not None:
+            return self._process
+
+        if not hasattr(os, "fork"):
+            self._unavailable = True
+            raise PytestWorkerError("fork is not available on this platform")
+        try:
+            process = subprocess.Popen(
+                [self.python, ZYGOTE_PATH],
+                cwd=self.root_path,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                start_new_session=True,
+            )
+        except OSError as e:
+            self._unavailable = True
+            raise PytestWorkerError(f"cannot start pytest worker: {e}") from None
+
+        # The zygote reports ready once pytest and the dependencies are imported
+        if not process.stdout.readline():
+            process.kill()
+            process.wait()
+            self._unavailable = True
+            raise PytestWorkerError("pytest worker failed to start")
+
+        self._process = process
+        self._dependencies = dependencies
+        self._output_dir = tempfile.TemporaryDirectory(prefix="pytest-worker-")
+        return process
+
+    def _stop(self) -> None:
+        process, self._process = self._process, None
+        if process is not None:
+            try:
+                # Closing stdin ends the zygote's request loop
+                process.stdin.close()
+                process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+                process.wait()
+            process.stdout.close()
+        if self._output_dir is not None:
+            self._output_dir.cleanup()
+            self._output_dir = None
+
+    def _dependency_fingerprint(self) -> Tuple[Tuple[str, float], ...]:
+        fingerprint = []
+        for name in DEPENDENCY_FILES:
+            try:
+                fingerprint.append(
+                    (name, os.stat(os.path.join(self.root_path, name)).st_mtime)
+                )
+            except OSError:
+                continue
+        return tuple(fingerprint)
+
+    @staticmethod
+    def _read_output(path: str) -> str:
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                return f.read()
+        except OSError:
+            return ""
+
+
+# Workers per project root, shared by the agents of this process
+_workers: Dict[str, PytestWorker] = {}
+_workers_lock = threading.Lock()
+
+
+def get_pytest_worker(root_path: str) -> PytestWorker:
+    """
+    Get the shared pytest worker of a project
+
+    Args:
+        root_path: Project root
+
+    Returns:
+        PytestWorker
+    """
+    root_path = os.path.abspath(root_path)
+    with _workers_lock:
+        worker = _workers.get(root_path)
+        if worker is None:
+            worker = PytestWorker(root_path)
+            _workers[root_path] = worker
+        return worker
+
+
+@atexit.register
+def _close_workers() -> None:
+    with _workers_lock:
+        for worker in _workers.values():
+            worker.close()
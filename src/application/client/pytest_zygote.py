@@ -0,0 +1,199 @@
+"""
+Pre-forked pytest worker
+
+Started by PytestWorker under the interpreter that runs the project's tests,
+with the project root as the working directory. It imports pytest and the
+third-party packages the test suite uses once, then forks a fresh child for
+every request. Children drop every module loaded from the project so edits
+are always seen, run pytest.main and exit; the parent stays clean.
+
+This file is run as a script and must not import anything from this package.
+
+Protocol (one JSON object per line):
+    stdin:  {"args": ["tests/test_x.py"], "stdout": "/tmp/..", "stderr": "/tmp/.."}
+    stdout: {"exit_status": 0}
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+
+# Directories under the project root that hold installed packages, not project code
+_ENVIRONMENT_DIRS = {
+    ".venv",
+    "venv",
+    "env",
+    ".tox",
+    ".nox",
+    "site-packages",
+    "node_modules",
+}
+
+
+# Leaves every preloaded plugin pytest could not rewrite out of the warnings;
+# project modules are always imported fresh, so they are rewritten as usual
+_PRELOADED_PLUGIN_FILTER = [
+    "-W",
+    "ignore:Module already imported so cannot be rewritten"
+    ":pytest.PytestAssertRewriteWarning",
+]
+
+
+def _is_project_path(path, root):
+    path = os.path.abspath(path)
+    if not path.startswith(root + os.sep):
+        return False
+    parts = os.path.relpath(path, root).split(os.sep)
+    return not _ENVIRONMENT_DIRS.intersection(parts)
+
+
+def _is_project_module(module, root):
+    filename = getattr(module, "__file__", None)
+    if filename:
+        return _is_project_path(filename, root)
+    # Namespace packages (a directory without __init__.py) have a path but no file
+    try:
+        locations = list(getattr(module, "__path__", None) or [])
+    except Exception:
+        return False
+    return any(_is_project_path(location, root) for location in locations)
+
+
+def _purge_project_modules(root):
+    purged = [
+        name
+        for name, module in list(sys.modules.items())
+        if _is_project_module(module, root)
+    ]
+    # Also drop parents of purged modules, so no package survives without its
+    # submodules
+    prefixes = {
+        name.rsplit(".", depth)[0]
+        for name in purged
+        for depth in range(1, name.count(".") + 1)
+    }
+    for name in set(purged) | prefixes:
+        sys.modules.pop(name, None)
+
+
+def _run_child(args, stdout_path, stderr_path, root):
+    """Run pytest in a forked child with its output going to the given files"""
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    for fd, path in ((1, stdout_path), (2, stderr_path)):
+        out = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.dup2(out, fd)
+        os.close(out)
+
+    random.seed()
+    _purge_project_modules(root)
+    status = 1
+    try:
+        import pytest
+
+        status = int(pytest.main(_PRELOADED_PLUGIN_FILTER + list(args)))
+    except SystemExit as e:
+        # Same mapping as the interpreter: None is success, other non-integers
+        # failure
+        status = 0 if e.code is None else e.code if isinstance(e.code, int) else 1
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(status)
+
+
+def _fork_and_wait(args, stdout_path, stderr_path, root):
+    sys.stdout.flush()
+    pid = os.fork()
+    if pid == 0:
+        _run_child(args, stdout_path, stderr_path, root)
+    _, wait_status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(wait_status)
+
+
+def _preload(root):
+    """
+    Import pytest and the third-party modules a collection of the test suite loads
+
+    Collection runs in a throwaway child, which reports the modules it imported
+    from outside the project; the parent imports those so every later child
+    inherits them already initialised.
+    """
+    import pytest  # noqa: F401
+    import _pytest.config  # noqa: F401
+
+    fd, modules_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    pid = os.fork()
+    if pid == 0:
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for target in (0, 1, 2):
+            os.dup2(devnull, target)
+        try:
+            pytest.main(["--collect-only", "-q", "-p", "no:cacheprovider"])
+            names = [
+                name
+                for name, module in list(sys.modules.items())
+                if not _is_project_module(module, root) and not name.startswith("__")
+            ]
+            with open(modules_path, "w") as f:
+                json.dump(names, f)
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+    try:
+        with open(modules_path) as f:
+            names = json.load(f)
+    except (OSError, ValueError):
+        names = []
+    finally:
+        os.unlink(modules_path)
+
+    # Names are in import order, so packages come before their submodules;
+    # a module that fails to import here is left to the children
+    for name in names:
+        if name in sys.modules:
+            continue
+        try:
+            __import__(name)
+        except BaseException:
+            pass
+    _purge_project_modules(root)
+
+
+def main():
+    root = os.path.abspath(os.getcwd())
+    # Running this file puts its own directory on sys.path; tests expect the
+    # project root
+    sys.path[0] = root
+    requests = sys.stdin
+    # Keep the protocol on a private descriptor so stray prints from imports
+    # cannot corrupt it
+    responses = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+
+    _preload(root)
+    responses.write(json.dumps({"ready": True}) + "\n")
+    responses.flush()
+
+    for line in requests:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        exit_status = _fork_and_wait(
+            request["args"], request["stdout"], request["stderr"], root
+        )
+        responses.write(json.dumps({"exit_status": exit_status}) + "\n")
+        responses.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from typing import List, Optional
+
+from pydantic import Field
+
+from src.application.schema.base import BaseSchema
+
+
+class DiffHunk(BaseSchema):
+    """A hunk of a file diff"""
+
+    header: str = Field(..., description="Hunk header line (@@ -a,b +c,d @@)")
+    old_start: int = Field(..., description="First line in the old file")
+    old_lines: int = Field(..., description="Number of lines in the old file")
+    new_start: int = Field(..., description="First line in the new file")
+    new_lines: int = Field(..., description="Number of lines in the new file")
+    added: int = Field(0, description="Number of added lines")
+    removed: int = Field(0, description="Number of removed lines")
+
+
+class FileDiff(BaseSchema):
+    """Changes of a single file"""
+
+    path: str = Field(..., description="Path of the file (new path for renames)")
+    old_path: Optional[str] = Field(None, description="Previous path of a renamed file")
+    status: str = Field("modified", description="added, deleted, renamed or modified")
+    binary: bool = Field(False, description="True for binary files")
+    added: int = Field(0, description="Number of added lines")
+    removed: int = Field(0, description="Number of removed lines")
+    hunks: List[DiffHunk] = Field(default_factory=list, description="Hunks of the diff")
+
+
+class DiffSnapshot(BaseSchema):
+    """
+    Parsed local changes of one working-tree generation
+    """
+
+    fingerprint: str = Field(
+        ..., description="Identifies the working-tree state the diff was taken from"
+    )
+    branch: str = Field("", description="Current branch")
+    diff: str = Field("", description="Unified diff text")
+    files: List[FileDiff] = Field(default_factory=list, description="Changed files")
+    added: int = Field(0, description="Total number of added lines")
+    removed: int = Field(0, description="Total number of removed lines")
+
+    @property
+    def paths(self) -> List[str]:
+        """Paths of the changed files"""
+        return [file.path for file in self.files]
+
+    @property
+    def is_empty(self) -> bool:
+        """True when there are no local changes"""
+        return not self.files and not self.diff
+
+    def summary(self) -> str:
+        """Return the counts, e.g. '3 files changed, +10 -2'"""
+        return f"{len(self.files)} files changed, +{self.added} -{self.removed}"
+
+    def stat(self) -> str:
+        """Return one "path | +a -r" line per file"""
+        return "\n".join(
+            f"{file.path} | "
+            + ("binary" if file.binary else f"+{file.added} -{file.removed}")
+            for file in self.files
+        )
@@ -14,6 +14,12 @@ class AgentSettings(BaseSettings):
     AZURE_OPENAI_DEPLOYMENT_NAME_GPT4O_MINI: str = ""
     AZURE_OPENAI_DEPLOYMENT_NAME_O3_MINI: str = ""
     AZURE_OPENAI_DEPLOYMENT_NAME_GPT_41: str = ""
+    FILE_INDEX_PERSIST: bool = False
+    SEARCH_TRIGRAM_INDEX: bool = False
+    READ_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    MAX_WRITE_BYTES: int = 16 * 1024 * 1024
+    REVIEW_DIFF_TOKEN_BUDGET: int = 20000
+    PYTEST_WORKER: bool = False
 
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.getcwd(), ".env"),
@@ -48,8 +48,13 @@ Please edit files according to the following user instructions.
 
 Please use the following tools as needed to execute tasks:
 - GetFilesList: Get list of files in the project
+- SearchCode: Search file contents (regex or literal) across the project
 - ReadFile: Read file contents
+- ReadFiles: Read several files (or line ranges) in one call
+- FindDefinition: Find where a Python class, function or variable is defined
+- FindReferences: Find where a Python name is called or used
 - MakeNewFile: Create new files
+- EditFile: Edit part of an existing file with search/replace blocks or a diff (preferred for changes)
 - OverwriteFile: Overwrite existing files
 - ExecTest: Execute tests (using test framework appropriate for the language)
 - GeneratePullRequestParams: Generate information needed for PR creation
@@ -70,12 +75,18 @@ by combining appropriate tools within the project (root is {project_root}) to he
 - Before execution, first understand the necessary information and perform tool selection and step-by-step execution.
 - When a directory is specified, always check where that directory is located.
 - Write code following the conventions of the project's language and framework.
+- Before reading unfamiliar files, list them with include_metadata=True and skip binary or generated files (lockfiles, minified bundles).
 Please aim for consistent, reproducible, and accurate code operations.
 
 You can use the following tools:
 - GetFilesList: Get list of files in the project
+- SearchCode: Search file contents (regex or literal) across the project
 - ReadFile: Read file contents
+- ReadFiles: Read several files (or line ranges) in one call
+- FindDefinition: Find where a Python class, function or variable is defined
+- FindReferences: Find where a Python name is called or used
 - MakeNewFile: Create new files
+- EditFile: Edit part of an existing file with search/replace blocks or a diff (preferred for changes)
 - OverwriteFile: Overwrite existing files
 - ExecTest: Execute tests (using test framework appropriate for the language)
 - GeneratePullRequestParams: Generate information needed for PR creation
@@ -92,6 +103,8 @@ Please review from the following perspectives:
 
 Important: Available tools
 - ReviewCode: Review code diff and summarize issues and improvements, determine LGTM (Looks Good To Me)
+- GenerateDiff: Fetch the diff of files not included in the request (use file_path, or token_budget and page)
+- ReadFiles: Read files (or line ranges) for context around the changes
 - RecordLgtm: Record LGTM (review approval)
 
 If the review result shows no issues and the code can be approved, you must call the record_lgtm_function tool to record LGTM (Looks Good To Me).
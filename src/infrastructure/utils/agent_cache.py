@@ -0,0 +1,70 @@
+"""
+Location of the agent's cache files
+
+Indexes and rollback snapshots must never land in the working tree, where they
+would show up in diffs, in `git add -A` and in pull requests of the target
+repository. Inside a git repository they are kept under the git directory
+(.git/agent/), on the same filesystem as the working tree so snapshots can be
+hard links; elsewhere under the system temporary directory.
+"""
+
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+CACHE_DIR_NAME = "agent"
+
+
+def find_git_dir(path: str) -> Optional[str]:
+    """
+    Find the git directory of the work tree containing a path without running git
+
+    Args:
+        path: Directory inside the work tree
+
+    Returns:
+        Absolute path of the git directory, or None outside a git work tree
+    """
+    current = os.path.abspath(path)
+    while True:
+        dot_git = os.path.join(current, ".git")
+        if os.path.isdir(dot_git):
+            return dot_git
+        if os.path.isfile(dot_git):
+            # Linked worktrees and submodules: ".git" is a file with "gitdir: <path>"
+            try:
+                with open(dot_git, "r", encoding="utf-8") as f:
+                    line = f.readline().strip()
+            except OSError:
+                return None
+            if line.startswith("gitdir:"):
+                return os.path.normpath(
+                    os.path.join(current, line[len("gitdir:") :].strip())
+                )
+            return None
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def agent_cache_dir(root_path: str) -> str:
+    """
+    Get the cache directory of a root directory (not created)
+
+    Args:
+        root_path: Root directory the cached data describes
+
+    Returns:
+        .git/agent/<root digest> inside a git repository, otherwise a directory
+        under the system temporary directory
+    """
+    root_path = os.path.abspath(root_path)
+    # Several roots (e.g. a subdirectory and the whole repository) can share a
+    # git directory
+    digest = hashlib.blake2b(root_path.encode("utf-8"), digest_size=8).hexdigest()
+    git_dir = find_git_dir(root_path)
+    if git_dir is not None:
+        return os.path.join(git_dir, CACHE_DIR_NAME, digest)
+    return os.path.join(tempfile.gettempdir(), f"{CACHE_DIR_NAME}-cache", digest)
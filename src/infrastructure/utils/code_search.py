@@ -0,0 +1,219 @@
+"""
+Parallel content search
+
+Scans files with a thread pool. Each file is memory-mapped and searched with a
+bytes regular expression, so no file is decoded or split into lines unless it
+contains a match. Results are collected in candidate order and scanning stops
+once enough matches were found.
+"""
+
+import mmap
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, List, NamedTuple, Optional, Pattern
+
+# Bytes read from the start of a file to detect binaries
+BINARY_SNIFF_SIZE = 8192
+
+# Longest snippet line returned for a match (minified files have huge lines)
+MAX_LINE_LENGTH = 200
+
+# Number of files handed to the pool at once; scanning stops between batches
+BATCH_SIZE = 256
+
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+class SearchMatch(NamedTuple):
+    """Line matching a search"""
+
+    path: str
+    line_number: int
+    line: str
+    before: List[str]
+    after: List[str]
+
+
+def compile_search_pattern(
+    pattern: str, is_regex: bool = False, case_sensitive: bool = True
+) -> Pattern[bytes]:
+    """
+    Compile a search pattern for scanning raw file bytes
+
+    Args:
+        pattern: Regular expression or literal text
+        is_regex: Whether pattern is a regular expression
+        case_sensitive: Whether the search is case sensitive
+
+    Returns:
+        Compiled bytes pattern
+
+    Raises:
+        re.error: When the regular expression is invalid
+    """
+    source = pattern.encode("utf-8")
+    if not is_regex:
+        source = re.escape(source)
+    flags = re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
+    return re.compile(source, flags)
+
+
+def _decode_line(data: bytes) -> str:
+    line = data.decode("utf-8", errors="replace").rstrip("\r")
+    if len(line) > MAX_LINE_LENGTH:
+        line = line[:MAX_LINE_LENGTH] + "..."
+    return line
+
+
+def _context_before(data: mmap.mmap, line_start: int, count: int) -> List[str]:
+    """Return up to count lines ending just before line_start"""
+    lines = []
+    end = line_start - 1
+    while count > 0 and end >= 0:
+        start = data.rfind(b"\n", 0, end) + 1
+        lines.append(_decode_line(data[start:end]))
+        end = start - 1
+        count -= 1
+    lines.reverse()
+    return lines
+
+
+def _context_after(data: mmap.mmap, line_end: int, count: int) -> List[str]:
+    """Return up to count lines starting just after line_end"""
+    lines = []
+    start = line_end + 1
+    while count > 0 and start < len(data):
+        end = data.find(b"\n", start)
+        if end == -1:
+            end = len(data)
+        lines.append(_decode_line(data[start:end]))
+        start = end + 1
+        count -= 1
+    return lines
+
+
+def search_file(
+    root_path: str,
+    rel_path: str,
+    regex: Pattern[bytes],
+    context_lines: int = 0,
+    max_matches: int = 100,
+    max_file_size: Optional[int] = None,
+) -> List[SearchMatch]:
+    """
+    Search a single file
+
+    Binary files, empty files and files larger than max_file_size are skipped.
+    Each line is reported at most once.
+
+    Args:
+        root_path: Root directory
+        rel_path: File path relative to root_path
+        regex: Compiled bytes pattern
+        context_lines: Number of lines to include before and after each match
+        max_matches: Maximum number of matches to return from this file
+        max_file_size: Maximum size in bytes of files to search
+
+    Returns:
+        Matches in line order
+    """
+    try:
+        with open(os.path.join(root_path, rel_path), "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or (max_file_size is not None and size > max_file_size):
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data.find(b"\0", 0, BINARY_SNIFF_SIZE) != -1:
+                    return []
+                return _scan(data, rel_path, regex, context_lines, max_matches)
+    except (OSError, ValueError):
+        return []
+
+
+def _scan(
+    data: mmap.mmap,
+    rel_path: str,
+    regex: Pattern[bytes],
+    context_lines: int,
+    max_matches: int,
+) -> List[SearchMatch]:
+    matches: List[SearchMatch] = []
+    line_number = 1
+    counted_until = 0
+    position = 0
+    while len(matches) < max_matches:
+        match = regex.search(data, position)
+        if match is None:
+            break
+        start = match.start()
+        line_start = data.rfind(b"\n", 0, start) + 1
+        line_end = data.find(b"\n", start)
+        if line_end == -1:
+            line_end = len(data)
+
+        # Count newlines incrementally so the whole scan stays linear
+        line_number += data[counted_until:line_start].count(b"\n")
+        counted_until = line_start
+
+        matches.append(
+            SearchMatch(
+                rel_path,
+                line_number,
+                _decode_line(data[line_start:line_end]),
+                _context_before(data, line_start, context_lines)
+                if context_lines
+                else [],
+                _context_after(data, line_end, context_lines) if context_lines else [],
+            )
+        )
+        # Continue on the next line; empty matches must not stall the scan
+        position = line_end + 1
+        if position > len(data):
+            break
+    return matches
+
+
+def search_files(
+    root_path: str,
+    paths: Iterable[str],
+    regex: Pattern[bytes],
+    context_lines: int = 0,
+    max_matches: int = 100,
+    max_file_size: Optional[int] = None,
+    max_workers: int = DEFAULT_WORKERS,
+) -> List[SearchMatch]:
+    """
+    Search files in parallel, stopping once max_matches matches were found
+
+    Args:
+        root_path: Root directory
+        paths: File paths relative to root_path, scanned lazily in batches
+        regex: Compiled bytes pattern
+        context_lines: Number of lines to include before and after each match
+        max_matches: Maximum total number of matches
+        max_file_size: Maximum size in bytes of files to search
+        max_workers: Number of scanning threads
+
+    Returns:
+        Matches ordered by path order, then line number. One match beyond
+        max_matches is included when more matches exist, so callers can
+        report truncation.
+    """
+    results: List[SearchMatch] = []
+    paths = iter(paths)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while len(results) <= max_matches:
+            batch = list(islice(paths, BATCH_SIZE))
+            if not batch:
+                break
+            remaining = max_matches + 1 - len(results)
+            for file_matches in executor.map(
+                lambda path: search_file(
+                    root_path, path, regex, context_lines, remaining, max_file_size
+                ),
+                batch,
+            ):
+                results.extend(file_matches)
+    return results[: max_matches + 1]
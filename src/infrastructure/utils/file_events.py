@@ -0,0 +1,49 @@
+"""
+File change notifications
+
+Write tools report the files they modify here so that in-process caches
+(file index, read cache, search indexes) can update themselves directly
+instead of rescanning the tree.
+"""
+
+import os
+from typing import Callable, List
+
+FileChangeListener = Callable[[str], None]
+
+_listeners: List[FileChangeListener] = []
+
+
+def add_file_change_listener(listener: FileChangeListener) -> None:
+    """
+    Register a listener called with the absolute path of every changed file
+
+    Args:
+        listener: Callable receiving the absolute file path
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_file_change_listener(listener: FileChangeListener) -> None:
+    """
+    Unregister a listener
+
+    Args:
+        listener: Previously registered listener
+    """
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def notify_file_changed(filepath: str) -> None:
+    """
+    Notify all listeners that a file was created, modified or deleted
+
+    Args:
+        filepath: Path of the changed file (relative to the current directory
+            or absolute)
+    """
+    abs_path = os.path.abspath(filepath)
+    for listener in list(_listeners):
+        listener(abs_path)
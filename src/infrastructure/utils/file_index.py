@@ -0,0 +1,378 @@
+"""
+Persistent file index
+
+Keeps a process-wide index of the files under a root directory (path, size,
+mtime and extension). A refresh only rescans directories whose mtime changed,
+and write tools update entries directly through file change notifications, so
+repeated listings do not walk the whole tree again. The index can optionally
+be saved in the agent cache directory and reused by the next process.
+"""
+
+import bisect
+import json
+import os
+import stat
+import threading
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.infrastructure.utils.agent_cache import agent_cache_dir
+from src.infrastructure.utils.file_events import add_file_change_listener
+from src.infrastructure.utils.glob_matcher import compile_matcher
+from src.infrastructure.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_FILE_NAME = "file_index.json"
+INDEX_FORMAT_VERSION = 1
+
+# Directories modified this recently may change again within the same mtime tick,
+# so they are rescanned on the next refresh
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class FileEntry(NamedTuple):
+    """Indexed file"""
+
+    path: str
+    size: int
+    mtime_ns: int
+    extension: str
+
+
+class _DirectoryRecord(NamedTuple):
+    """Indexed directory with its direct children"""
+
+    mtime_ns: int
+    subdirs: List[str]
+    files: List[str]
+
+
+def _extension(name: str) -> str:
+    """Return the extension of a file name without the leading dot"""
+    base, dot, ext = name.rpartition(".")
+    return ext if dot and base else ""
+
+
+class FileIndex:
+    """Incrementally refreshed index of the files under a root directory"""
+
+    def __init__(
+        self,
+        root_path: str,
+        prune_patterns: Optional[List[str]] = None,
+        persist: bool = False,
+    ):
+        """
+        Args:
+            root_path: Root directory to index
+            prune_patterns: Glob patterns of directories that are never indexed
+            persist: Whether to save the index in the agent cache directory
+                (see agent_cache)
+        """
+        self.root_path = os.path.abspath(root_path)
+        self.persist = persist
+        self._prune_patterns = list(prune_patterns or [])
+        self._matcher = compile_matcher(
+            exclude_patterns=self._prune_patterns, enter_hidden=True
+        )
+        self._dirs: Dict[str, _DirectoryRecord] = {}
+        self._files: Dict[str, FileEntry] = {}
+        # Sorted file paths, rebuilt lazily after the set of files changes
+        self._sorted_paths: Optional[List[str]] = None
+        # Guards refreshes and updates; listings of other roots never wait on it
+        self._lock = threading.RLock()
+
+        if persist:
+            self._load()
+
+    @property
+    def cache_path(self) -> str:
+        """Path of the on-disk index"""
+        return os.path.join(agent_cache_dir(self.root_path), INDEX_FILE_NAME)
+
+    def entries(self) -> List[FileEntry]:
+        """
+        Refresh the index and return all indexed files
+
+        Returns:
+            List of file entries (unordered)
+        """
+        with self._lock:
+            self.refresh()
+            return list(self._files.values())
+
+    def sorted_paths(self, start_after: Optional[str] = None) -> Iterator[str]:
+        """
+        Refresh the index and iterate file paths in sorted order
+
+        Args:
+            start_after: Only yield paths sorting after this path
+
+        Yields:
+            File paths relative to the root directory
+        """
+        with self._lock:
+            self.refresh()
+            if self._sorted_paths is None:
+                self._sorted_paths = sorted(self._files)
+            paths = self._sorted_paths
+
+        # The list is replaced rather than mutated, so it can be read without the lock
+        start = (
+            bisect.bisect_right(paths, start_after) if start_after is not None else 0
+        )
+        for i in range(start, len(paths)):
+            yield paths[i]
+
+    def get(self, rel_path: str) -> Optional[FileEntry]:
+        """
+        Get the entry of a file without refreshing
+
+        Args:
+            rel_path: Path relative to the root directory
+
+        Returns:
+            File entry, or None when the file is not indexed
+        """
+        return self._files.get(rel_path)
+
+    def refresh(self) -> bool:
+        """
+        Rescan directories whose mtime changed since the last scan
+
+        Returns:
+            True when the index changed
+        """
+        with self._lock:
+            if not self._dirs:
+                self._scan_directory("")
+                changed = True
+            else:
+                changed = False
+                for rel_dir in list(self._dirs):
+                    record = self._dirs.get(rel_dir)
+                    if record is None:
+                        # Removed together with its parent during this refresh
+                        continue
+                    try:
+                        mtime_ns = os.stat(self._absolute(rel_dir)).st_mtime_ns
+                    except OSError:
+                        self._forget_directory(rel_dir)
+                        changed = True
+                        continue
+                    if mtime_ns != record.mtime_ns:
+                        self._scan_directory(rel_dir)
+                        changed = True
+
+            if changed:
+                self._sorted_paths = None
+                if self.persist:
+                    self.save()
+            return changed
+
+    def update_file(self, abs_path: str) -> None:
+        """
+        Update a single entry after the file was written or deleted
+
+        Files in directories that are not indexed yet are picked up by the next refresh.
+
+        Args:
+            abs_path: Absolute path of the file
+        """
+        rel_path = self._relative(abs_path)
+        if rel_path is None:
+            return
+        with self._lock:
+            parent = rel_path.rpartition("/")[0]
+            record = self._dirs.get(parent)
+            if record is None:
+                return
+
+            try:
+                file_stat = os.stat(abs_path)
+            except OSError:
+                if self._files.pop(rel_path, None) is not None:
+                    self._sorted_paths = None
+                return
+            if not stat.S_ISREG(file_stat.st_mode):
+                return
+            if rel_path not in self._files:
+                self._sorted_paths = None
+
+            self._files[rel_path] = FileEntry(
+                rel_path,
+                file_stat.st_size,
+                file_stat.st_mtime_ns,
+                _extension(rel_path.rpartition("/")[2]),
+            )
+            if rel_path not in record.files:
+                record.files.append(rel_path)
+
+    def save(self) -> None:
+        """Save the index in the agent cache directory"""
+        with self._lock:
+            data = {
+                "version": INDEX_FORMAT_VERSION,
+                "root_path": self.root_path,
+                "prune_patterns": self._prune_patterns,
+                "dirs": {path: list(record) for path, record in self._dirs.items()},
+                "files": {
+                    path: [e.size, e.mtime_ns] for path, e in self._files.items()
+                },
+            }
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to save file index: {e}")
+
+    def _load(self) -> None:
+        """Load the index saved by a previous process, if compatible"""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if (
+            data.get("version") != INDEX_FORMAT_VERSION
+            or data.get("root_path") != self.root_path
+            or data.get("prune_patterns") != self._prune_patterns
+        ):
+            return
+
+        self._dirs = {
+            path: _DirectoryRecord(mtime_ns, subdirs, files)
+            for path, (mtime_ns, subdirs, files) in data["dirs"].items()
+        }
+        self._files = {
+            path: FileEntry(path, size, mtime_ns, _extension(path.rpartition("/")[2]))
+            for path, (size, mtime_ns) in data["files"].items()
+        }
+
+    def _scan_directory(self, start_dir: str) -> None:
+        """Rescan a directory and every subdirectory not indexed yet"""
+        stack = [start_dir]
+        while stack:
+            rel_dir = stack.pop()
+            previous = self._dirs.get(rel_dir)
+            abs_dir = self._absolute(rel_dir)
+            try:
+                # Stat before listing so that concurrent changes trigger another rescan
+                mtime_ns = os.stat(abs_dir).st_mtime_ns
+                with os.scandir(abs_dir) as iterator:
+                    entries = list(iterator)
+            except OSError:
+                self._forget_directory(rel_dir)
+                continue
+
+            subdirs: List[str] = []
+            files: List[str] = []
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not self._matcher.prunes_directory(rel_path):
+                            subdirs.append(rel_path)
+                        continue
+                    if not entry.is_file():
+                        continue
+                    file_stat = entry.stat()
+                except OSError:
+                    continue
+                files.append(rel_path)
+                self._files[rel_path] = FileEntry(
+                    rel_path,
+                    file_stat.st_size,
+                    file_stat.st_mtime_ns,
+                    _extension(entry.name),
+                )
+
+            if previous is not None:
+                for rel_path in set(previous.files).difference(files):
+                    self._files.pop(rel_path, None)
+                for subdir in set(previous.subdirs).difference(subdirs):
+                    self._forget_directory(subdir)
+
+            if time.time_ns() - mtime_ns < RACY_WINDOW_NS:
+                mtime_ns = -1
+            self._dirs[rel_dir] = _DirectoryRecord(mtime_ns, subdirs, files)
+            stack.extend(subdir for subdir in subdirs if subdir not in self._dirs)
+
+    def _forget_directory(self, rel_dir: str) -> None:
+        """Remove a directory and everything below it from the index"""
+        stack = [rel_dir]
+        while stack:
+            record = self._dirs.pop(stack.pop(), None)
+            if record is None:
+                continue
+            for rel_path in record.files:
+                self._files.pop(rel_path, None)
+            stack.extend(record.subdirs)
+
+    def _absolute(self, rel_path: str) -> str:
+        """Convert a root-relative path to an absolute path"""
+        return os.path.join(self.root_path, rel_path) if rel_path else self.root_path
+
+    def _relative(self, abs_path: str) -> Optional[str]:
+        """Convert an absolute path to a root-relative one (None outside the root)"""
+        prefix = self.root_path.rstrip(os.sep) + os.sep
+        if not abs_path.startswith(prefix):
+            return None
+        return abs_path[len(prefix) :].replace(os.sep, "/")
+
+
+# Process-wide indexes keyed by (root directory, prune patterns)
+_indexes: Dict[Tuple[str, Tuple[str, ...]], FileIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_file_index(
+    root_path: str,
+    prune_patterns: Optional[List[str]] = None,
+    persist: bool = False,
+) -> FileIndex:
+    """
+    Get the shared index for a root directory, creating it on first use
+
+    Args:
+        root_path: Root directory to index
+        prune_patterns: Glob patterns of directories that are never indexed
+        persist: Whether to save the index in the agent cache directory
+            (see agent_cache)
+
+    Returns:
+        Shared FileIndex instance
+    """
+    key = (os.path.abspath(root_path), tuple(prune_patterns or ()))
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = FileIndex(root_path, prune_patterns, persist)
+                _indexes[key] = index
+    return index
+
+
+def refresh_file_entry(filepath: str) -> None:
+    """
+    Refresh the entry of a file in every index that contains it
+
+    Args:
+        filepath: Path of the file (relative to the current directory or absolute)
+    """
+    _on_file_changed(os.path.abspath(filepath))
+
+
+def _on_file_changed(abs_path: str) -> None:
+    """Update every index containing the changed file"""
+    for index in list(_indexes.values()):
+        index.update_file(abs_path)
+
+
+add_file_change_listener(_on_file_changed)
@@ -0,0 +1,166 @@
+"""
+File metadata for listings
+
+Describes a file from its stat data and a small header read: size, estimated
+line and token counts, and whether it is binary or generated. Agents use this
+to decide whether a file is worth reading before spending tokens on it.
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
+
+from src.infrastructure.utils.tree_render import CHARS_PER_TOKEN
+
+# Bytes read from the start of a file to detect binaries and count lines
+HEADER_SIZE = 8192
+
+# Extensions that are always binary, so no header read is needed
+BINARY_EXTENSIONS = frozenset(
+    [
+        "class", "jar", "war", "pyc", "pyo", "so", "dll", "dylib", "exe", "o", "a",
+        "zip", "gz", "tgz", "bz2", "xz", "7z", "tar", "whl",
+        "png", "jpg", "jpeg", "gif", "bmp", "ico", "webp", "pdf",
+        "woff", "woff2", "ttf", "otf", "eot", "mp3", "mp4", "mov", "wasm",
+        "sqlite", "db",
+    ]
+)  # fmt: skip
+
+# Lockfiles and other files written by tools rather than people
+GENERATED_NAMES = frozenset(
+    [
+        "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "npm-shrinkwrap.json",
+        "poetry.lock", "Pipfile.lock", "uv.lock", "Cargo.lock", "Gemfile.lock",
+        "composer.lock", "go.sum", "mix.lock", "pubspec.lock", "Podfile.lock",
+    ]
+)  # fmt: skip
+GENERATED_SUFFIXES = (
+    ".min.js",
+    ".min.css",
+    ".map",
+    ".bundle.js",
+    "_pb2.py",
+    ".pb.go",
+    ".g.dart",
+)
+GENERATED_MARKERS = (
+    b"@generated",
+    b"DO NOT EDIT",
+    b"Code generated by",
+    b"autogenerated",
+)
+
+# Average line length above which a text file is treated as minified
+MINIFIED_LINE_LENGTH = 500
+
+
+@lru_cache(maxsize=4096)
+def _sniff_header(abs_path: str, size: int, mtime_ns: int) -> Tuple[bool, bool, int]:
+    """
+    Read the header of a file (cached per file version)
+
+    Returns:
+        Tuple of (binary, generated marker found, estimated line count)
+    """
+    try:
+        with open(abs_path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+    except OSError:
+        return False, False, 0
+
+    if b"\0" in header:
+        return True, False, 0
+
+    generated = any(marker in header for marker in GENERATED_MARKERS)
+    newlines = header.count(b"\n")
+    if not header:
+        lines = 0
+    elif size <= len(header):
+        lines = newlines + (0 if header.endswith(b"\n") else 1)
+    else:
+        # Extrapolate the line density of the header to the whole file
+        lines = max(1, round(newlines * size / len(header)))
+    return False, generated, lines
+
+
+def is_generated_name(path: str) -> bool:
+    """
+    Check whether a path names a lockfile or another tool-written file
+
+    Args:
+        path: File path
+
+    Returns:
+        True for lockfiles and generated suffixes such as .min.js
+    """
+    name = os.path.basename(path)
+    return name in GENERATED_NAMES or name.endswith(GENERATED_SUFFIXES)
+
+
+def is_generated_content(data: bytes) -> bool:
+    """
+    Check file contents for a generated marker or minified lines
+
+    Args:
+        data: File contents, e.g. of a version that no longer exists on disk
+
+    Returns:
+        True for text with a generated marker in its header or a minified line length
+    """
+    header = data[:HEADER_SIZE]
+    if not data or b"\0" in header:
+        return False
+    if any(marker in header for marker in GENERATED_MARKERS):
+        return True
+    lines = data.count(b"\n") + (not data.endswith(b"\n"))
+    return len(data) / lines > MINIFIED_LINE_LENGTH
+
+
+def get_file_metadata(
+    abs_path: str, size: Optional[int] = None, mtime_ns: Optional[int] = None
+) -> Dict[str, Union[int, bool]]:
+    """
+    Describe a file for a listing
+
+    Args:
+        abs_path: Absolute path of the file
+        size: File size from an earlier stat or scandir, to avoid another stat
+        mtime_ns: Modification time from the same stat
+
+    Returns:
+        Dictionary with size (bytes), lines and tokens (estimates),
+        binary and generated flags
+    """
+    if size is None or mtime_ns is None:
+        try:
+            file_stat = os.stat(abs_path)
+        except OSError:
+            return {
+                "size": 0,
+                "lines": 0,
+                "tokens": 0,
+                "binary": False,
+                "generated": False,
+            }
+        size, mtime_ns = file_stat.st_size, file_stat.st_mtime_ns
+
+    name = os.path.basename(abs_path)
+    extension = name.rpartition(".")[2].lower() if "." in name[1:] else ""
+    generated = is_generated_name(name)
+
+    if extension in BINARY_EXTENSIONS:
+        binary, lines = True, 0
+    else:
+        binary, marker_found, lines = _sniff_header(abs_path, size, mtime_ns)
+        generated = generated or marker_found
+        # Minified bundles: a few very long lines
+        if not binary and lines and size / lines > MINIFIED_LINE_LENGTH:
+            generated = True
+
+    return {
+        "size": size,
+        "lines": lines,
+        "tokens": 0 if binary else (size + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN,
+        "binary": binary,
+        "generated": generated,
+    }
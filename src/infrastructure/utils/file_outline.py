@@ -0,0 +1,113 @@
+"""
+File outlines
+
+Summarises a source file as its signatures and docstring summaries with line
+numbers, so an agent can locate the part it needs before reading it.
+"""
+
+import ast
+import re
+from typing import List
+
+# Definition lines of common languages, used when a file is not Python
+_DEFINITION_PATTERN = re.compile(
+    r"^\s*(?:export\s+)?(?:default\s+)?"
+    r"(?:public\s+|private\s+|protected\s+|static\s+|abstract\s+|async\s+)*"
+    r"(?:class|interface|enum|struct|trait|impl|module|def|function|func|fn|type|"
+    r"resource|describe|context|it)\b"
+)
+_MARKDOWN_HEADING = re.compile(r"^#{1,6}\s")
+
+
+def _docstring_summary(node: ast.AST) -> str:
+    docstring = ast.get_docstring(node)
+    if not docstring:
+        return ""
+    return docstring.strip().splitlines()[0]
+
+
+def _signature(lines: List[str], node: ast.AST) -> str:
+    """Return the source of a definition up to its body, on one line"""
+    body_line = node.body[0].lineno
+    if body_line == node.lineno:
+        # "def f(): pass"
+        return lines[node.lineno - 1].strip()
+    return " ".join(line.strip() for line in lines[node.lineno - 1 : body_line - 1])
+
+
+def outline_python(source: str) -> List[str]:
+    """
+    Outline a Python module
+
+    Args:
+        source: Module source
+
+    Returns:
+        Lines of "line: signature" for classes and functions, indented by nesting,
+        each followed by its docstring summary
+
+    Raises:
+        SyntaxError: When the source cannot be parsed
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines()
+    outline: List[str] = []
+
+    summary = _docstring_summary(tree)
+    if summary:
+        outline.append(f"1: {summary}")
+
+    def visit(nodes, depth: int) -> None:
+        for node in nodes:
+            if not isinstance(
+                node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+            ):
+                continue
+            indent = "    " * depth
+            for decorator in node.decorator_list:
+                outline.append(f"{decorator.lineno}: {indent}@{ast.unparse(decorator)}")
+            outline.append(f"{node.lineno}: {indent}{_signature(lines, node)}")
+            summary = _docstring_summary(node)
+            if summary:
+                outline.append(f'{node.body[0].lineno}: {indent}    """{summary}"""')
+            if isinstance(node, ast.ClassDef):
+                visit(node.body, depth + 1)
+
+    visit(tree.body, 0)
+    return outline
+
+
+def outline_text(source: str) -> List[str]:
+    """
+    Outline a file of any language by its definition lines and Markdown headings
+
+    Args:
+        source: File contents
+
+    Returns:
+        Lines of "line: text"
+    """
+    return [
+        f"{number}: {line.rstrip()}"
+        for number, line in enumerate(source.splitlines(), start=1)
+        if _DEFINITION_PATTERN.match(line) or _MARKDOWN_HEADING.match(line)
+    ]
+
+
+def outline_file(filepath: str, source: str) -> List[str]:
+    """
+    Outline a file, using the Python parser for Python files
+
+    Args:
+        filepath: Path of the file (used to choose the outline)
+        source: File contents
+
+    Returns:
+        Outline lines
+    """
+    if filepath.endswith((".py", ".pyi")):
+        try:
+            return outline_python(source)
+        except (SyntaxError, ValueError):
+            pass
+    return outline_text(source)
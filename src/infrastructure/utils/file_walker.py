@@ -0,0 +1,106 @@
+"""
+Single-pass directory walker
+
+Walks a directory tree once with os.scandir, pruning excluded directories before
+entering them and matching every extension and include pattern in the same pass.
+Paths are yielded in sorted order, so callers can stop after one page and resume
+from the last path they received.
+"""
+
+import os
+from typing import Iterator, List, Optional, Tuple
+
+from src.infrastructure.utils.glob_matcher import PathMatcher, compile_matcher
+
+
+def _sorted_children(
+    root_path: str, rel_dir: str, matcher: PathMatcher
+) -> List[Tuple[str, os.DirEntry, bool]]:
+    """List a directory as (relative path, entry, is directory) in path order"""
+    try:
+        with os.scandir(os.path.join(root_path, rel_dir)) as iterator:
+            entries = list(iterator)
+    except OSError:
+        return []
+
+    children = []
+    for entry in entries:
+        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                # Prune excluded directories before entering them
+                if not matcher.prunes_directory(rel_path):
+                    children.append((rel_path, entry, True))
+            elif entry.is_file():
+                children.append((rel_path, entry, False))
+        except OSError:
+            continue
+
+    # Sorting directories as "name/" makes the walk order equal to sorted(paths)
+    children.sort(key=lambda child: child[0] + "/" if child[2] else child[0])
+    return children
+
+
+def walk_tree(
+    root_path: str, matcher: PathMatcher, start_after: Optional[str] = None
+) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Walk the tree once, yielding every file in directories that are not pruned
+
+    Args:
+        root_path: Root directory to walk
+        matcher: Matcher deciding which directories to enter
+        start_after: Only yield paths sorting after this path.
+            Directories whose files all sort before it are not entered.
+
+    Yields:
+        Tuples of (path relative to root_path separated by "/", directory entry)
+        in sorted path order
+    """
+    stack = [iter(_sorted_children(root_path, "", matcher))]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            continue
+
+        rel_path, entry, is_dir = child
+        if is_dir:
+            prefix = rel_path + "/"
+            if (
+                start_after is not None
+                and start_after > prefix
+                and not start_after.startswith(prefix)
+            ):
+                continue
+            stack.append(iter(_sorted_children(root_path, rel_path, matcher)))
+        elif start_after is None or rel_path > start_after:
+            yield rel_path, entry
+
+
+def walk_files(
+    root_path: str,
+    file_extensions: Optional[List[str]] = None,
+    include_patterns: Optional[List[str]] = None,
+    exclude_patterns: Optional[List[str]] = None,
+    start_after: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Walk the tree once and yield matching file paths
+
+    The walk is lazy: it stops as soon as the caller stops iterating.
+
+    Args:
+        root_path: Root directory to walk
+        file_extensions: File extensions to match (without leading dot)
+        include_patterns: Glob patterns (relative to root) to match
+        exclude_patterns: Glob patterns for files and directories to skip
+        start_after: Only yield paths sorting after this path
+
+    Yields:
+        File paths relative to root_path, separated by "/", in sorted order
+    """
+    matcher = compile_matcher(file_extensions, include_patterns, exclude_patterns)
+    for rel_path, _ in walk_tree(root_path, matcher, start_after):
+        if matcher.matches(rel_path):
+            yield rel_path
@@ -0,0 +1,265 @@
+"""
+Compiled glob matcher
+
+Compiles extensions, include patterns and exclude patterns into one matcher
+that checks a path in a single pass over its segments, however many patterns
+there are. Common pattern shapes ("*.ext", "**/name", "**/dir/**") become set
+lookups; the remaining patterns are combined into one regular expression.
+Matchers are built once per pattern set and kept in an LRU cache.
+"""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Pattern, Tuple
+
+_WILDCARD_CHARS = frozenset("*?[")
+
+
+def glob_to_regex(pattern: str, match_hidden: bool = False) -> str:
+    """
+    Translate a recursive glob pattern into a regular expression
+
+    Follows glob.glob(recursive=True) semantics: "**" matches zero or more
+    directories and wildcards do not match names starting with a dot unless
+    match_hidden is True.
+
+    Args:
+        pattern: Glob pattern relative to the root directory (e.g. "src/**/*.py")
+        match_hidden: Whether wildcards may match hidden (dot) names
+
+    Returns:
+        Regular expression string to be used with fullmatch
+    """
+    if pattern.startswith("./"):
+        pattern = pattern[2:]
+
+    name = r"[^/]+" if match_hidden else r"(?!\.)[^/]+"
+    segments = pattern.split("/")
+    parts = []
+    for index, segment in enumerate(segments):
+        is_last = index == len(segments) - 1
+        if segment == "**":
+            if is_last:
+                # Trailing "**" matches everything below
+                parts.append(".*" if match_hidden else f"(?:{name}(?:/{name})*)?")
+            else:
+                parts.append(f"(?:{name}/)*")
+            continue
+        parts.append(_translate_segment(segment, match_hidden))
+        if not is_last:
+            parts.append("/")
+    return "".join(parts)
+
+
+def _translate_segment(segment: str, match_hidden: bool) -> str:
+    """Translate a single path segment of a glob pattern"""
+    result = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        i += 1
+        if char == "*":
+            result.append("[^/]*")
+        elif char == "?":
+            result.append("[^/]")
+        elif char == "[":
+            start = i + 1 if segment[i : i + 1] == "!" else i
+            if segment[start : start + 1] == "]":
+                start += 1
+            end = segment.find("]", start)
+            if end == -1:
+                result.append(r"\[")
+                continue
+            body = segment[i:end].replace("\\", r"\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            result.append(f"[{body}]")
+            i = end + 1
+        else:
+            result.append(re.escape(char))
+
+    translated = "".join(result)
+    # Wildcards never match a leading dot (same as glob)
+    if not match_hidden and not segment.startswith("."):
+        translated = r"(?!\.)" + translated
+    return translated
+
+
+def _is_literal(segment: str) -> bool:
+    """Return True when a segment has no wildcard characters"""
+    return bool(segment) and not _WILDCARD_CHARS.intersection(segment)
+
+
+class _PatternSet:
+    """Patterns split into set lookups and one combined regex"""
+
+    def __init__(self, patterns: Tuple[str, ...], match_hidden: bool):
+        extensions = set()
+        basenames = set()
+        dirnames = set()
+        remaining = []
+        for pattern in patterns:
+            if pattern.startswith("./"):
+                pattern = pattern[2:]
+            segments = pattern.split("/")
+            if (
+                len(segments) == 2
+                and segments[0] == "**"
+                and _is_literal(segments[1])
+                and (match_hidden or not segments[1].startswith("."))
+            ):
+                # "**/name"
+                basenames.add(segments[1])
+            elif (
+                len(segments) == 2
+                and segments[0] == "**"
+                and segments[1].startswith("*.")
+                and _is_literal(segments[1][2:])
+            ):
+                # "**/*.ext"
+                extensions.add(segments[1][2:])
+            elif (
+                match_hidden
+                and len(segments) == 3
+                and segments[0] == segments[2] == "**"
+                and _is_literal(segments[1])
+            ):
+                # "**/dir/**" (only for excludes, where hidden names may match)
+                dirnames.add(segments[1])
+            else:
+                remaining.append(pattern)
+
+        self.extensions: FrozenSet[str] = frozenset(extensions)
+        self.basenames: FrozenSet[str] = frozenset(basenames)
+        self.dirnames: FrozenSet[str] = frozenset(dirnames)
+        self.regex: Optional[Pattern[str]] = (
+            re.compile(
+                "|".join(f"(?:{glob_to_regex(p, match_hidden)})" for p in remaining)
+            )
+            if remaining
+            else None
+        )
+
+
+def _name_suffixes(name: str) -> List[str]:
+    """Return every dot-suffix of a file name ("a.d.ts" -> ["d.ts", "ts"])"""
+    suffixes = []
+    index = name.find(".")
+    while index != -1:
+        suffixes.append(name[index + 1 :])
+        index = name.find(".", index + 1)
+    return suffixes
+
+
+class PathMatcher:
+    """Decides which directories to enter and which files to select"""
+
+    def __init__(
+        self,
+        file_extensions: Tuple[str, ...] = (),
+        include_patterns: Tuple[str, ...] = (),
+        exclude_patterns: Tuple[str, ...] = (),
+        enter_hidden: Optional[bool] = None,
+    ):
+        """
+        Args:
+            file_extensions: File extensions to match (without leading dot)
+            include_patterns: Glob patterns (relative to root) to match
+            exclude_patterns: Glob patterns for files and directories to skip
+            enter_hidden: Whether to enter hidden directories.
+                Defaults to True only when an include pattern names one.
+        """
+        self._include = _PatternSet(include_patterns, match_hidden=False)
+        self._exclude = _PatternSet(exclude_patterns, match_hidden=True)
+        self._extensions = frozenset(ext.lstrip(".") for ext in file_extensions).union(
+            self._include.extensions
+        )
+
+        if enter_hidden is None:
+            enter_hidden = any(
+                segment.startswith(".") and segment not in (".", "..")
+                for pattern in include_patterns
+                for segment in pattern.split("/")[:-1]
+            )
+        self.enter_hidden = enter_hidden
+
+    def prunes_directory(self, rel_dir: str) -> bool:
+        """Return True when the directory must not be entered"""
+        name = rel_dir.rsplit("/", 1)[-1]
+        if name.startswith(".") and not self.enter_hidden:
+            return True
+        if name in self._exclude.dirnames:
+            return True
+        regex = self._exclude.regex
+        return bool(regex and regex.fullmatch(rel_dir + "/"))
+
+    def excludes(self, rel_path: str) -> bool:
+        """Return True when the file matches an exclude pattern"""
+        exclude = self._exclude
+        segments = rel_path.split("/")
+        name = segments[-1]
+        if exclude.dirnames and not exclude.dirnames.isdisjoint(segments[:-1]):
+            return True
+        if name in exclude.basenames:
+            return True
+        if exclude.extensions and not exclude.extensions.isdisjoint(
+            _name_suffixes(name)
+        ):
+            return True
+        return bool(exclude.regex and exclude.regex.fullmatch(rel_path))
+
+    def matches(self, rel_path: str) -> bool:
+        """Return True when the file is selected"""
+        if self.excludes(rel_path):
+            return False
+
+        # Extensions and "**/name" follow glob semantics: no hidden names on the path
+        if "/." not in "/" + rel_path:
+            name = rel_path.rsplit("/", 1)[-1]
+            if name in self._include.basenames:
+                return True
+            if self._extensions and not self._extensions.isdisjoint(
+                _name_suffixes(name)
+            ):
+                return True
+        regex = self._include.regex
+        return bool(regex and regex.fullmatch(rel_path))
+
+
+@lru_cache(maxsize=64)
+def _compile(
+    file_extensions: Tuple[str, ...],
+    include_patterns: Tuple[str, ...],
+    exclude_patterns: Tuple[str, ...],
+    enter_hidden: Optional[bool],
+) -> PathMatcher:
+    return PathMatcher(
+        file_extensions, include_patterns, exclude_patterns, enter_hidden
+    )
+
+
+def compile_matcher(
+    file_extensions: Optional[List[str]] = None,
+    include_patterns: Optional[List[str]] = None,
+    exclude_patterns: Optional[List[str]] = None,
+    enter_hidden: Optional[bool] = None,
+) -> PathMatcher:
+    """
+    Get the compiled matcher for a pattern set, reusing it from the LRU cache
+
+    Args:
+        file_extensions: File extensions to match (without leading dot)
+        include_patterns: Glob patterns (relative to root) to match
+        exclude_patterns: Glob patterns for files and directories to skip
+        enter_hidden: Whether to enter hidden directories.
+            Defaults to True only when an include pattern names one.
+
+    Returns:
+        Shared PathMatcher instance
+    """
+    return _compile(
+        tuple(sorted(set(file_extensions or ()))),
+        tuple(sorted(set(include_patterns or ()))),
+        tuple(sorted(set(exclude_patterns or ()))),
+        enter_hidden,
+    )
@@ -0,0 +1,111 @@
+"""
+Line-offset index for range reads
+
+Records the byte offset of every line start of a file, so a range of lines
+can be sliced directly out of a memory map. Indexes are cached per file
+version (size and mtime), so repeated range reads of the same file do not
+scan it again.
+"""
+
+import array
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+# Number of files whose line offsets are kept
+MAX_CACHED_FILES = 128
+
+
+class LineRange(NamedTuple):
+    """Lines read from a file"""
+
+    text: str
+    start_line: int
+    end_line: int
+    total_lines: int
+
+
+_cache: "OrderedDict[str, Tuple[int, int, array.array]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _build_offsets(data) -> array.array:
+    """Return the offsets of every line start, plus the end of the data"""
+    offsets = array.array("Q", [0])
+    find = data.find
+    position = find(b"\n")
+    while position != -1:
+        offsets.append(position + 1)
+        position = find(b"\n", position + 1)
+    if offsets[-1] != len(data):
+        # Last line without a trailing newline
+        offsets.append(len(data))
+    return offsets
+
+
+def get_line_offsets(abs_path: str, data, size: int, mtime_ns: int) -> array.array:
+    """
+    Get the cached line offsets of a file version, building them on a miss
+
+    Args:
+        abs_path: Absolute path of the file (cache key)
+        data: File contents (bytes or memory map)
+        size: File size
+        mtime_ns: File modification time
+
+    Returns:
+        Offsets of every line start followed by the end offset; line n
+        (1-based) spans offsets[n - 1]:offsets[n]
+    """
+    with _cache_lock:
+        cached = _cache.get(abs_path)
+        if cached is not None and cached[:2] == (size, mtime_ns):
+            _cache.move_to_end(abs_path)
+            return cached[2]
+
+    offsets = _build_offsets(data)
+    with _cache_lock:
+        _cache[abs_path] = (size, mtime_ns, offsets)
+        _cache.move_to_end(abs_path)
+        while len(_cache) > MAX_CACHED_FILES:
+            _cache.popitem(last=False)
+    return offsets
+
+
+def read_line_range(
+    filepath: str, start_line: Optional[int] = None, end_line: Optional[int] = None
+) -> LineRange:
+    """
+    Read a range of lines through a memory map
+
+    Args:
+        filepath: Path of the file
+        start_line: First line to read (1-based, inclusive). Defaults to the first line.
+        end_line: Last line to read (inclusive). Defaults to the last line.
+
+    Returns:
+        The lines read, with the clamped range and the total number of lines
+
+    Raises:
+        OSError: When the file cannot be read
+    """
+    abs_path = os.path.abspath(filepath)
+    with open(abs_path, "rb") as f:
+        file_stat = os.fstat(f.fileno())
+        if file_stat.st_size == 0:
+            return LineRange("", 0, 0, 0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offsets = get_line_offsets(
+                abs_path, data, file_stat.st_size, file_stat.st_mtime_ns
+            )
+            total_lines = len(offsets) - 1
+            start = max(1, start_line or 1)
+            end = min(total_lines, end_line or total_lines)
+            if start > end:
+                return LineRange("", start, end, total_lines)
+            text = data[offsets[start - 1] : offsets[end]].decode(
+                "utf-8", errors="replace"
+            )
+    return LineRange(text, start, end, total_lines)
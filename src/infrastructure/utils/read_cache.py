@@ -0,0 +1,144 @@
+"""
+Process-wide read cache
+
+Keeps decoded file contents keyed by (path, mtime_ns, size), so files read
+again within an iteration, or by the reviewer after the programmer, are served
+from memory. Entries are evicted least recently used once the cached text
+exceeds a byte budget, and write tools drop entries directly through file
+change notifications.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple
+
+from src.infrastructure.config.agent_setting import agent_settings
+from src.infrastructure.utils.file_events import add_file_change_listener
+
+
+class _CachedText(NamedTuple):
+    size: int
+    mtime_ns: int
+    text: str
+
+
+class ReadCache:
+    """LRU cache of decoded file contents"""
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Maximum total size in bytes of the cached files
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CachedText]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Bytes that did not have to be read and decoded again
+        self.bytes_saved = 0
+
+    def read_text(self, filepath: str) -> str:
+        """
+        Read a UTF-8 text file, from the cache when it did not change
+
+        Args:
+            filepath: Path of the file
+
+        Returns:
+            File contents
+
+        Raises:
+            OSError: When the file cannot be read
+            UnicodeDecodeError: When the file is not valid UTF-8
+        """
+        abs_path = os.path.abspath(filepath)
+        try:
+            file_stat = os.stat(abs_path)
+        except OSError:
+            # Let open() raise the usual error
+            with open(filepath, "r", encoding="utf-8") as f:
+                return f.read()
+
+        with self._lock:
+            entry = self._entries.get(abs_path)
+            if entry is not None and (entry.size, entry.mtime_ns) == (
+                file_stat.st_size,
+                file_stat.st_mtime_ns,
+            ):
+                self._entries.move_to_end(abs_path)
+                self.hits += 1
+                self.bytes_saved += entry.size
+                return entry.text
+            self.misses += 1
+
+        with open(abs_path, "r", encoding="utf-8") as f:
+            before = os.fstat(f.fileno())
+            text = f.read()
+            after = os.fstat(f.fileno())
+
+        # Only cache contents that were not modified while being read
+        if (before.st_size, before.st_mtime_ns) == (after.st_size, after.st_mtime_ns):
+            self._store(abs_path, _CachedText(after.st_size, after.st_mtime_ns, text))
+        return text
+
+    def invalidate(self, abs_path: str) -> None:
+        """
+        Drop the cached contents of a file
+
+        Args:
+            abs_path: Absolute path of the file
+        """
+        with self._lock:
+            entry = self._entries.pop(abs_path, None)
+            if entry is not None:
+                self._cached_bytes -= entry.size
+
+    def clear(self) -> None:
+        """Drop all cached contents"""
+        with self._lock:
+            self._entries.clear()
+            self._cached_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters
+
+        Returns:
+            Dictionary with hits, misses, bytes_saved, cached_bytes and cached_files
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes_saved": self.bytes_saved,
+                "cached_bytes": self._cached_bytes,
+                "cached_files": len(self._entries),
+            }
+
+    def reset_stats(self) -> None:
+        """Reset the hit, miss and saved byte counters"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.bytes_saved = 0
+
+    def _store(self, abs_path: str, entry: _CachedText) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(abs_path, None)
+            if previous is not None:
+                self._cached_bytes -= previous.size
+            self._entries[abs_path] = entry
+            self._cached_bytes += entry.size
+            while self._cached_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._cached_bytes -= evicted.size
+
+
+read_cache = ReadCache(agent_settings.READ_CACHE_MAX_BYTES)
+
+add_file_change_listener(read_cache.invalidate)
@@ -0,0 +1,381 @@
+"""
+Python symbol index
+
+Parses Python files with ast and records their definitions (classes,
+functions, methods, module-level assignments, imports) and references (call
+sites and other uses of a name). Files are re-parsed only when their size or
+mtime changed and their content hash differs, so lookups after an edit only
+cost the files that were touched.
+"""
+
+import ast
+import hashlib
+import os
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Set
+
+from src.infrastructure.utils.file_events import add_file_change_listener
+
+
+class Symbol(NamedTuple):
+    """Definition of a name"""
+
+    name: str
+    qualname: str
+    kind: str
+    path: str
+    line: int
+    end_line: int
+
+
+class Reference(NamedTuple):
+    """Use of a name"""
+
+    name: str
+    kind: str
+    path: str
+    line: int
+
+
+class _FileSymbols(NamedTuple):
+    size: int
+    mtime_ns: int
+    digest: str
+    definitions: List[Symbol]
+    references: List[Reference]
+
+
+class _SymbolVisitor(ast.NodeVisitor):
+    """Collect definitions and references of one module"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.definitions: List[Symbol] = []
+        self.references: List[Reference] = []
+        self._scopes: List[str] = []
+        self._in_class: List[bool] = []
+
+    def _qualname(self, name: str) -> str:
+        return ".".join(self._scopes + [name])
+
+    def _define(self, name: str, kind: str, node: ast.AST) -> None:
+        self.definitions.append(
+            Symbol(
+                name,
+                self._qualname(name),
+                kind,
+                self.path,
+                node.lineno,
+                getattr(node, "end_lineno", None) or node.lineno,
+            )
+        )
+
+    def _visit_scope(self, name: str, is_class: bool, node: ast.AST) -> None:
+        self._scopes.append(name)
+        self._in_class.append(is_class)
+        self.generic_visit(node)
+        self._scopes.pop()
+        self._in_class.pop()
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._define(node.name, "class", node)
+        for decorator in node.decorator_list + node.bases:
+            self.visit(decorator)
+        self._visit_scope(node.name, True, ast.Module(body=node.body, type_ignores=[]))
+
+    def _visit_function(self, node) -> None:
+        kind = "method" if self._in_class and self._in_class[-1] else "function"
+        self._define(node.name, kind, node)
+        for child in node.decorator_list:
+            self.visit(child)
+        self.visit(node.args)
+        if node.returns is not None:
+            self.visit(node.returns)
+        self._visit_scope(node.name, False, ast.Module(body=node.body, type_ignores=[]))
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def _visit_targets(self, targets: List[ast.expr], node: ast.AST) -> None:
+        # Only module and class level assignments are definitions worth indexing
+        if self._in_class and not self._in_class[-1]:
+            return
+        for target in targets:
+            for child in ast.walk(target):
+                if isinstance(child, ast.Name):
+                    self._define(child.id, "variable", node)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self._visit_targets(node.targets, node)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        self._visit_targets([node.target], node)
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            name = alias.asname or alias.name.split(".")[0]
+            self._define(name, "import", node)
+            self.references.append(
+                Reference(
+                    alias.name.rsplit(".", 1)[-1], "import", self.path, node.lineno
+                )
+            )
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        for alias in node.names:
+            self._define(alias.asname or alias.name, "import", node)
+            self.references.append(
+                Reference(alias.name, "import", self.path, node.lineno)
+            )
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if isinstance(func, ast.Name):
+            self.references.append(Reference(func.id, "call", self.path, node.lineno))
+        elif isinstance(func, ast.Attribute):
+            self.references.append(Reference(func.attr, "call", self.path, node.lineno))
+            self.visit(func.value)
+        else:
+            self.visit(func)
+        for child in node.args + node.keywords:
+            self.visit(child)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Load):
+            self.references.append(Reference(node.id, "name", self.path, node.lineno))
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if isinstance(node.ctx, ast.Load):
+            self.references.append(
+                Reference(node.attr, "attribute", self.path, node.lineno)
+            )
+        self.generic_visit(node)
+
+
+def parse_symbols(source: bytes, path: str) -> _FileSymbols:
+    """
+    Parse the definitions and references of a Python source
+
+    Args:
+        source: File contents
+        path: Path recorded in the results
+
+    Returns:
+        Parsed symbols (empty when the source has syntax errors)
+    """
+    visitor = _SymbolVisitor(path)
+    try:
+        visitor.visit(ast.parse(source, filename=path))
+    except (SyntaxError, ValueError, RecursionError):
+        pass
+    return _FileSymbols(
+        len(source), 0, _digest(source), visitor.definitions, visitor.references
+    )
+
+
+def _digest(source: bytes) -> str:
+    return hashlib.blake2b(source, digest_size=16).hexdigest()
+
+
+class SymbolIndex:
+    """Incrementally updated symbol index of the Python files under a root directory"""
+
+    def __init__(self, root_path: str):
+        """
+        Args:
+            root_path: Root directory
+        """
+        self.root_path = os.path.abspath(root_path)
+        self._files: Dict[str, _FileSymbols] = {}
+        # Inverted maps from a name to the files defining or referencing it
+        self._defined_in: Dict[str, Set[str]] = {}
+        self._referenced_in: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+    def sync(self, paths: Iterable[str]) -> None:
+        """
+        Bring the index up to date with the given files
+
+        Args:
+            paths: Paths relative to the root directory of the Python files to index
+        """
+        with self._lock:
+            seen = set()
+            for rel_path in paths:
+                seen.add(rel_path)
+                self._update(rel_path)
+            for rel_path in set(self._files).difference(seen):
+                self._remove(rel_path)
+
+    def update_file(self, abs_path: str) -> None:
+        """
+        Re-parse a single file after it was written or deleted
+
+        Args:
+            abs_path: Absolute path of the file
+        """
+        prefix = self.root_path.rstrip(os.sep) + os.sep
+        if not abs_path.startswith(prefix) or not abs_path.endswith((".py", ".pyi")):
+            return
+        with self._lock:
+            if self._files:
+                self._update(abs_path[len(prefix) :].replace(os.sep, "/"))
+
+    def find_definitions(self, symbol: str) -> List[Symbol]:
+        """
+        Find where a name is defined
+
+        Args:
+            symbol: Name ("execute") or dotted qualified name
+                ("ReadFileFunction.execute")
+
+        Returns:
+            Definitions sorted by path and line; imports are listed last
+        """
+        name = symbol.rsplit(".", 1)[-1]
+        with self._lock:
+            results = [
+                definition
+                for path in self._defined_in.get(name, ())
+                for definition in self._files[path].definitions
+                if definition.qualname == symbol
+                or definition.qualname.endswith("." + symbol)
+            ]
+        return sorted(results, key=lambda d: (d.kind == "import", d.path, d.line))
+
+    def find_references(self, symbol: str) -> List[Reference]:
+        """
+        Find where a name is used
+
+        Args:
+            symbol: Name; for a dotted name only the last part is matched
+
+        Returns:
+            References sorted by path and line
+        """
+        name = symbol.rsplit(".", 1)[-1]
+        with self._lock:
+            results = [
+                reference
+                for path in self._referenced_in.get(name, ())
+                for reference in self._files[path].references
+                if reference.name == name
+            ]
+        return sorted(results, key=lambda r: (r.path, r.line))
+
+    def _update(self, rel_path: str) -> None:
+        """Re-parse a file if its size, mtime and content hash changed"""
+        abs_path = os.path.join(self.root_path, rel_path)
+        try:
+            file_stat = os.stat(abs_path)
+        except OSError:
+            self._remove(rel_path)
+            return
+
+        previous = self._files.get(rel_path)
+        if (
+            previous is not None
+            and previous.size == file_stat.st_size
+            and previous.mtime_ns == file_stat.st_mtime_ns
+        ):
+            return
+
+        try:
+            with open(abs_path, "rb") as f:
+                source = f.read()
+        except OSError:
+            self._remove(rel_path)
+            return
+
+        if previous is not None and previous.digest == _digest(source):
+            # Touched but unchanged: keep the parsed symbols, remember the new mtime
+            self._files[rel_path] = previous._replace(mtime_ns=file_stat.st_mtime_ns)
+            return
+
+        parsed = parse_symbols(source, rel_path)
+        self._remove(rel_path)
+        self._files[rel_path] = parsed._replace(mtime_ns=file_stat.st_mtime_ns)
+        for definition in parsed.definitions:
+            self._defined_in.setdefault(definition.name, set()).add(rel_path)
+        for reference in parsed.references:
+            self._referenced_in.setdefault(reference.name, set()).add(rel_path)
+
+    def _remove(self, rel_path: str) -> None:
+        previous = self._files.pop(rel_path, None)
+        if previous is None:
+            return
+        for names, inverted in (
+            ({d.name for d in previous.definitions}, self._defined_in),
+            ({r.name for r in previous.references}, self._referenced_in),
+        ):
+            for name in names:
+                paths = inverted.get(name)
+                if paths is not None:
+                    paths.discard(rel_path)
+                    if not paths:
+                        del inverted[name]
+
+
+# Process-wide indexes keyed by root directory
+_indexes: Dict[str, SymbolIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_symbol_index(root_path: str) -> SymbolIndex:
+    """
+    Get the shared symbol index for a root directory, creating it on first use
+
+    Args:
+        root_path: Root directory
+
+    Returns:
+        Shared SymbolIndex instance
+    """
+    key = os.path.abspath(root_path)
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = SymbolIndex(key)
+                _indexes[key] = index
+    return index
+
+
+def read_lines(abs_path: str, line_numbers: Iterable[int]) -> Dict[int, str]:
+    """
+    Read selected lines of a file
+
+    Args:
+        abs_path: Absolute path of the file
+        line_numbers: 1-based line numbers to return
+
+    Returns:
+        Dictionary mapping each requested line number to its stripped text
+    """
+    wanted = set(line_numbers)
+    lines: Dict[int, str] = {}
+    if not wanted:
+        return lines
+    last = max(wanted)
+    try:
+        with open(abs_path, "r", encoding="utf-8", errors="replace") as f:
+            for number, text in enumerate(f, start=1):
+                if number in wanted:
+                    lines[number] = text.strip()
+                if number >= last:
+                    break
+    except OSError:
+        pass
+    return lines
+
+
+def _on_file_changed(abs_path: str) -> None:
+    """Re-parse the changed file in every index containing it"""
+    for index in list(_indexes.values()):
+        index.update_file(abs_path)
+
+
+add_file_change_listener(_on_file_changed)
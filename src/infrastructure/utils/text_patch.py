@@ -0,0 +1,292 @@
+"""
+Text patching
+
+Applies search/replace blocks and unified diffs to file contents. Exact
+matches are preferred; when the model's copy of the code differs slightly
+(indentation, trailing whitespace, a changed word) the closest unique region
+is used instead, and reported in the result so the change can be checked.
+Anything ambiguous or too different raises PatchError with a message the model
+can act on.
+"""
+
+import difflib
+import re
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+# Minimum similarity of a region to be used as a fuzzy match
+FUZZY_THRESHOLD = 0.85
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class PatchError(Exception):
+    """A search block or hunk could not be applied"""
+
+
+class FuzzyMatch(NamedTuple):
+    """An edit applied to the most similar region instead of an exact match"""
+
+    edit: str
+    start_line: int
+    end_line: int
+    ratio: float
+
+    def summary(self) -> str:
+        """Return e.g. 'Edit 2 replaced lines 4-5 (91% similar)'"""
+        return (
+            f"{self.edit} replaced lines {self.start_line}-{self.end_line} "
+            f"({self.ratio:.0%} similar)"
+        )
+
+
+class PatchResult(NamedTuple):
+    """Patched contents and the edits that were applied by similarity"""
+
+    text: str
+    fuzzy_matches: List[FuzzyMatch]
+
+
+def _indent(line: str) -> str:
+    return line[: len(line) - len(line.lstrip())]
+
+
+def _closest_region(lines: Sequence[str], target: Sequence[str]) -> Tuple[int, float]:
+    """Return the start and similarity of the region most similar to target"""
+    wanted = "\n".join(line.strip() for line in target)
+    best_start, best_ratio = -1, 0.0
+    for start in range(0, max(1, len(lines) - len(target) + 1)):
+        window = "\n".join(line.strip() for line in lines[start : start + len(target)])
+        matcher = difflib.SequenceMatcher(None, window, wanted, autojunk=False)
+        if (
+            matcher.real_quick_ratio() <= best_ratio
+            or matcher.quick_ratio() <= best_ratio
+        ):
+            continue
+        ratio = matcher.ratio()
+        if ratio > best_ratio:
+            best_start, best_ratio = start, ratio
+    return best_start, best_ratio
+
+
+def _locate(
+    lines: Sequence[str], target: Sequence[str], hint: Optional[int] = None
+) -> Tuple[int, Optional[float]]:
+    """
+    Find where target lines occur in lines
+
+    Tries an exact match, then a match ignoring surrounding whitespace, then
+    the most similar region. Among several exact or whitespace matches the one
+    closest to hint wins; without a hint they are ambiguous.
+
+    Returns:
+        Tuple of (index of the first matched line, similarity of the region or
+        None when the lines matched apart from whitespace)
+
+    Raises:
+        PatchError: When the lines are not found or the match is ambiguous
+    """
+    size = len(target)
+    stripped_target = [line.strip() for line in target]
+    for normalize in (lambda line: line.rstrip("\n"), lambda line: line.strip()):
+        wanted = [normalize(line) for line in target]
+        starts = [
+            start
+            for start in range(len(lines) - size + 1)
+            if [normalize(line) for line in lines[start : start + size]] == wanted
+        ]
+        if len(starts) == 1:
+            return starts[0], None
+        if starts:
+            if hint is None:
+                raise PatchError(
+                    f"The text matches {len(starts)} places (lines "
+                    f"{', '.join(str(s + 1) for s in starts[:5])}). "
+                    "Add surrounding lines to make it unique."
+                )
+            return min(starts, key=lambda start: abs(start - hint)), None
+
+    if not any(stripped_target):
+        raise PatchError("The text to find is empty.")
+    start, ratio = _closest_region(lines, target)
+    if start >= 0 and ratio >= FUZZY_THRESHOLD:
+        return start, ratio
+
+    message = "The text was not found in the file."
+    if start >= 0:
+        closest = "".join(lines[start : start + size])
+        message += (
+            f" The most similar text (lines {start + 1}-{start + size}, "
+            f"{ratio:.0%} similar) is:\n{closest}"
+        )
+    raise PatchError(message)
+
+
+def _reindent(
+    replacement: List[str], found: Sequence[str], target: Sequence[str]
+) -> List[str]:
+    """Shift replacement lines by the indentation difference of the matched region"""
+    for found_line, target_line in zip(found, target):
+        if target_line.strip():
+            source, destination = _indent(target_line), _indent(found_line)
+            break
+    else:
+        return replacement
+    if source == destination:
+        return replacement
+    return [
+        destination + line[len(source) :]
+        if line.startswith(source) and line.strip()
+        else line
+        for line in replacement
+    ]
+
+
+def _split_lines(text: str) -> List[str]:
+    return text.splitlines(keepends=True)
+
+
+def apply_search_replace(text: str, blocks: Sequence[Tuple[str, str]]) -> PatchResult:
+    """
+    Apply search/replace blocks in order
+
+    Args:
+        text: Original contents
+        blocks: (search, replace) pairs; search must identify one place in the text
+
+    Returns:
+        PatchResult with the new contents and the blocks matched by similarity
+        (line numbers of the contents the block was applied to)
+
+    Raises:
+        PatchError: When a block cannot be applied (the message names the block)
+    """
+    fuzzy_matches = []
+    for number, (search, replace) in enumerate(blocks, start=1):
+        try:
+            if not search:
+                raise PatchError("The search text is empty.")
+            count = text.count(search)
+            if count == 1:
+                text = text.replace(search, replace, 1)
+                continue
+            if count > 1:
+                raise PatchError(
+                    f"The search text matches {count} places. "
+                    "Add surrounding lines to make it unique."
+                )
+
+            lines = _split_lines(text)
+            target = _split_lines(search)
+            start, ratio = _locate(lines, target)
+            found = lines[start : start + len(target)]
+            if ratio is not None:
+                fuzzy_matches.append(
+                    FuzzyMatch(f"Edit {number}", start + 1, start + len(found), ratio)
+                )
+            replacement = _reindent(_split_lines(replace), found, target)
+            if (
+                replacement
+                and found[-1].endswith("\n")
+                and not replacement[-1].endswith("\n")
+            ):
+                replacement[-1] += "\n"
+            text = "".join(lines[:start] + replacement + lines[start + len(target) :])
+        except PatchError as e:
+            raise PatchError(f"Edit {number} could not be applied: {e}") from None
+    return PatchResult(text, fuzzy_matches)
+
+
+def _parse_hunks(diff: str) -> List[Tuple[str, int, List[str], List[str]]]:
+    """Parse a unified diff into (header, old start, old lines, new lines) per hunk"""
+    hunks = []
+    current = None
+    for line in _split_lines(diff):
+        match = _HUNK_HEADER.match(line)
+        if match:
+            current = (line.strip(), int(match.group(1)), [], [])
+            hunks.append(current)
+            continue
+        if current is None:
+            # File headers and anything else before the first hunk
+            continue
+        if line.startswith("\\"):
+            # "\ No newline at end of file"
+            continue
+        body = line[1:] if line[:1] in (" ", "-", "+") else line
+        if not body.endswith("\n"):
+            body += "\n"
+        if line.startswith("-"):
+            current[2].append(body)
+        elif line.startswith("+"):
+            current[3].append(body)
+        else:
+            # Context lines; blank lines whose leading space was stripped count too
+            current[2].append(body)
+            current[3].append(body)
+    return hunks
+
+
+def apply_unified_diff(text: str, diff: str) -> PatchResult:
+    """
+    Apply the hunks of a unified diff
+
+    Hunks are located by their context, starting from the line numbers in
+    their headers, so slightly stale line numbers and whitespace differences
+    still apply.
+
+    Args:
+        text: Original contents
+        diff: Unified diff of a single file
+
+    Returns:
+        PatchResult with the new contents and the hunks matched by similarity
+        (line numbers of the contents the hunk was applied to)
+
+    Raises:
+        PatchError: When the diff has no hunks or a hunk cannot be applied
+    """
+    hunks = _parse_hunks(diff)
+    if not hunks:
+        raise PatchError("The diff contains no hunks (lines starting with '@@').")
+
+    lines = _split_lines(text)
+    if lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+        missing_final_newline = True
+    else:
+        missing_final_newline = False
+
+    offset = 0
+    fuzzy_matches = []
+    for number, (header, old_start, old_lines, new_lines) in enumerate(hunks, start=1):
+        try:
+            ratio = None
+            if old_lines:
+                start, ratio = _locate(
+                    lines, old_lines, hint=max(0, old_start - 1 + offset)
+                )
+            else:
+                # Pure insertion: the header gives the line to insert after
+                start = min(len(lines), old_start + offset)
+        except PatchError as e:
+            raise PatchError(
+                f"Hunk {number} ({header}) could not be applied: {e}"
+            ) from None
+        found = lines[start : start + len(old_lines)]
+        if ratio is not None:
+            fuzzy_matches.append(
+                FuzzyMatch(
+                    f"Hunk {number} ({header})", start + 1, start + len(found), ratio
+                )
+            )
+        replacement = _reindent(new_lines, found, old_lines)
+        lines[start : start + len(old_lines)] = replacement
+        # Shift of the following lines relative to the original line numbers;
+        # an insertion goes after line old_start instead of replacing from it
+        old_end = old_start - 1 + len(old_lines) if old_lines else old_start
+        offset = start + len(replacement) - old_end
+
+    result = "".join(lines)
+    if missing_final_newline and result.endswith("\n"):
+        result = result[:-1]
+    return PatchResult(result, fuzzy_matches)
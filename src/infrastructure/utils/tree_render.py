@@ -0,0 +1,153 @@
+"""
+Compact directory tree rendering
+
+Renders a list of file paths as an indented tree so that shared directory
+prefixes appear once. Under a token budget, large directories are collapsed
+into a file count, starting with the biggest leaf directories.
+"""
+
+import heapq
+from typing import Dict, List, Optional
+
+INDENT = "  "
+
+# Rough number of characters per token for code and paths
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a text
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Estimated token count
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class _Node:
+    """Directory in the rendered tree"""
+
+    def __init__(self, name: str, depth: int, parent: Optional["_Node"] = None):
+        self.name = name
+        self.depth = depth
+        self.parent = parent
+        self.children: Dict[str, "_Node"] = {}
+        self.files: List[str] = []
+        self.file_count = 0
+        self.collapsed = False
+        # Number of expanded child directories, used to find collapsible leaves
+        self.expanded_children = 0
+
+    def collapsed_line(self) -> str:
+        unit = "file" if self.file_count == 1 else "files"
+        return f"{self.name}/ ({self.file_count} {unit})"
+
+    def rendered_size(self) -> int:
+        """Approximate number of characters of the expanded subtree"""
+        size = len(INDENT) * self.depth + len(self.name) + 2
+        for child in self.children.values():
+            size += child.collapsed_size() if child.collapsed else child.rendered_size()
+        size += sum(
+            len(INDENT) * (self.depth + 1) + len(name) + 1 for name in self.files
+        )
+        return size
+
+    def collapsed_size(self) -> int:
+        return len(INDENT) * self.depth + len(self.collapsed_line()) + 1
+
+
+def _build_tree(paths: List[str]) -> _Node:
+    """Build the directory tree of the given paths"""
+    root = _Node("", -1)
+    for path in paths:
+        node = root
+        node.file_count += 1
+        *directories, filename = path.split("/")
+        for directory in directories:
+            child = node.children.get(directory)
+            if child is None:
+                child = _Node(directory, node.depth + 1, node)
+                node.children[directory] = child
+                node.expanded_children += 1
+            node = child
+            node.file_count += 1
+        node.files.append(filename)
+    return root
+
+
+def _render(node: _Node, lines: List[str], depth: int) -> None:
+    """Append the lines of a node's children and files"""
+    indent = INDENT * depth
+    for name in sorted(node.children):
+        child = node.children[name]
+        label = name
+        # Print chains of single directories on one line ("src/agent/function/")
+        while not child.collapsed and not child.files and len(child.children) == 1:
+            (only_child,) = child.children.values()
+            label = f"{label}/{only_child.name}"
+            child = only_child
+        if child.collapsed:
+            unit = "file" if child.file_count == 1 else "files"
+            lines.append(f"{indent}{label}/ ({child.file_count} {unit})")
+        else:
+            lines.append(f"{indent}{label}/")
+            _render(child, lines, depth + 1)
+    for filename in sorted(node.files):
+        lines.append(f"{indent}{filename}")
+
+
+def render_tree(paths: List[str], token_budget: Optional[int] = None) -> str:
+    """
+    Render file paths as an indented directory tree
+
+    Args:
+        paths: File paths separated by "/"
+        token_budget: Maximum estimated tokens of the output. Directories are
+            collapsed into "name/ (N files)" until the tree fits.
+
+    Returns:
+        Rendered tree
+    """
+    root = _build_tree(paths)
+
+    if token_budget is not None:
+        budget_chars = token_budget * CHARS_PER_TOKEN
+        total = root.rendered_size()
+
+        # Collapse the largest leaf directories first; a parent becomes a
+        # candidate once all of its subdirectories are collapsed
+        heap = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children.values())
+            if node is not root and not node.children:
+                heapq.heappush(heap, (-node.rendered_size(), id(node), node))
+
+        while total > budget_chars and heap:
+            _, _, node = heapq.heappop(heap)
+            total -= node.rendered_size() - node.collapsed_size()
+            node.collapsed = True
+            parent = node.parent
+            parent.expanded_children -= 1
+            if parent is not root and parent.expanded_children == 0:
+                heapq.heappush(heap, (-parent.rendered_size(), id(parent), parent))
+
+    lines: List[str] = []
+    _render(root, lines, 0)
+
+    if token_budget is not None:
+        # Still too large (e.g. many files at the top level): cut the tail
+        budget_chars = token_budget * CHARS_PER_TOKEN
+        used = 0
+        for i, line in enumerate(lines):
+            used += len(line) + 1
+            if used > budget_chars:
+                lines = lines[:i] + [f"... ({len(lines) - i} more lines truncated)"]
+                break
+
+    return "\n".join(lines)
@@ -0,0 +1,395 @@
+"""
+Trigram index for code search
+
+Maps every three-byte sequence (lowercased) to the files that contain it, in
+the style of codesearch/Zoekt. A search extracts the literals a regular
+expression requires, intersects the posting lists of their trigrams and only
+scans the remaining candidates.
+
+Postings are stored in one flat file of unsigned 32-bit arrays (sorted trigram
+keys, offsets, file ids) that is memory-mapped when loaded, so startup does not
+build Python objects per posting. Files changed since the index was built are
+kept in a small in-memory delta; the index is rebuilt once the delta grows.
+"""
+
+import array
+import bisect
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from src.infrastructure.utils.file_events import add_file_change_listener
+from src.infrastructure.utils.agent_cache import agent_cache_dir
+from src.infrastructure.utils.logger import get_logger
+
+try:
+    # Python 3.11+
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover
+    import sre_constants
+    import sre_parse
+
+logger = get_logger(__name__)
+
+POSTINGS_FILE_NAME = "trigram.idx"
+FILES_FILE_NAME = "trigram_files.json"
+INDEX_FORMAT_VERSION = 1
+_MAGIC = b"TRG1"
+_HEADER = struct.Struct("<4sII")
+
+# Files larger than this are not indexed (same limit as the search itself)
+MAX_INDEXED_FILE_SIZE = 4 * 1024 * 1024
+
+# Bytes read from the start of a file to detect binaries
+BINARY_SNIFF_SIZE = 8192
+
+# Rebuild the postings once this many files changed since the last build
+REBUILD_THRESHOLD = 1000
+
+
+def _file_trigrams(data: bytes) -> FrozenSet[int]:
+    """Return the lowercased trigram keys of a file's contents"""
+    data = data.lower()
+    return frozenset(
+        (a << 16) | (b << 8) | c for a, b, c in set(zip(data, data[1:], data[2:]))
+    )
+
+
+def _literal_trigrams(literal: bytes) -> Set[int]:
+    literal = literal.lower()
+    return {
+        (a << 16) | (b << 8) | c for a, b, c in zip(literal, literal[1:], literal[2:])
+    }
+
+
+def required_literals(pattern: str, is_regex: bool = False) -> List[bytes]:
+    """
+    Extract literal strings that every match of a pattern must contain
+
+    Only unconditional parts of the regular expression are used: alternations,
+    optional groups and character classes contribute nothing.
+
+    Args:
+        pattern: Regular expression or literal text
+        is_regex: Whether pattern is a regular expression
+
+    Returns:
+        UTF-8 encoded literals (possibly empty when nothing is required)
+    """
+    if not is_regex:
+        return [pattern.encode("utf-8")]
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return []
+    return [literal.encode("utf-8") for literal in _parsed_literals(parsed) if literal]
+
+
+def _parsed_literals(parsed) -> List[str]:
+    literals: List[str] = []
+    current: List[str] = []
+    for op, av in parsed:
+        if op is sre_constants.LITERAL:
+            current.append(chr(av))
+            continue
+        literals.append("".join(current))
+        current = []
+        if op is sre_constants.SUBPATTERN:
+            literals.extend(_parsed_literals(av[-1]))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+            # The body appears at least once
+            literals.extend(_parsed_literals(av[2]))
+    literals.append("".join(current))
+    return literals
+
+
+class _Postings:
+    """Read-only posting lists backed by a bytes buffer or a memory map"""
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        magic, key_count, id_count = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError("Invalid trigram index")
+        view = memoryview(buffer)[_HEADER.size :].cast("I")
+        self.keys = view[:key_count]
+        self.offsets = view[key_count : 2 * key_count + 1]
+        self.ids = view[2 * key_count + 1 : 2 * key_count + 1 + id_count]
+
+    @staticmethod
+    def serialize(postings: Dict[int, List[int]]) -> bytes:
+        keys = array.array("I", sorted(postings))
+        offsets = array.array("I", [0])
+        ids = array.array("I")
+        for key in keys:
+            ids.extend(postings[key])
+            offsets.append(len(ids))
+        header = _HEADER.pack(_MAGIC, len(keys), len(ids))
+        return header + keys.tobytes() + offsets.tobytes() + ids.tobytes()
+
+    def lookup(self, key: int) -> memoryview:
+        """Return the sorted file ids containing a trigram"""
+        i = bisect.bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return self.ids[0:0]
+        return self.ids[self.offsets[i] : self.offsets[i + 1]]
+
+    def close(self) -> None:
+        self.keys.release()
+        self.offsets.release()
+        self.ids.release()
+        if isinstance(self._buffer, mmap.mmap):
+            try:
+                self._buffer.close()
+            except BufferError:
+                # A posting list is still referenced; the map is closed when collected
+                pass
+
+
+class TrigramIndex:
+    """On-disk trigram index of the files under a root directory"""
+
+    def __init__(self, root_path: str):
+        """
+        Args:
+            root_path: Root directory; the index is stored in its agent cache directory
+        """
+        self.root_path = os.path.abspath(root_path)
+        self._postings: Optional[_Postings] = None
+        # Files of the built postings: path -> (file id, size, mtime_ns)
+        self._files: Dict[str, Tuple[int, int, int]] = {}
+        self._paths: List[str] = []
+        # Files changed since the build: path -> (size, mtime_ns, trigrams);
+        # None trigrams for files that are binary, too large or deleted
+        self._delta: Dict[str, Tuple[int, int, Optional[FrozenSet[int]]]] = {}
+        self._lock = threading.RLock()
+        self._load()
+
+    @property
+    def cache_dir(self) -> str:
+        return agent_cache_dir(self.root_path)
+
+    def sync(self, paths: Iterable[str]) -> None:
+        """
+        Bring the index up to date with the given files
+
+        Builds the index on first use; afterwards only files whose size or
+        mtime changed are read again.
+
+        Args:
+            paths: Paths relative to the root directory of the files to index
+        """
+        with self._lock:
+            paths = list(paths)
+            if self._postings is None:
+                self.build(paths)
+                return
+
+            for rel_path in paths:
+                try:
+                    file_stat = os.stat(os.path.join(self.root_path, rel_path))
+                except OSError:
+                    continue
+                version = (file_stat.st_size, file_stat.st_mtime_ns)
+                delta = self._delta.get(rel_path)
+                if delta is not None:
+                    if delta[:2] != version:
+                        self._update(rel_path)
+                    continue
+                record = self._files.get(rel_path)
+                if record is None or record[1:] != version:
+                    self._update(rel_path)
+
+            if len(self._delta) > REBUILD_THRESHOLD:
+                self.build(paths)
+
+    def build(self, paths: Iterable[str]) -> None:
+        """
+        Read every file and write new postings
+
+        Args:
+            paths: Paths relative to the root directory of the files to index
+        """
+        with self._lock:
+            postings: Dict[int, List[int]] = {}
+            files: Dict[str, Tuple[int, int, int]] = {}
+            file_paths: List[str] = []
+            for rel_path in paths:
+                (size, mtime_ns), trigrams = self._read(rel_path)
+                if size < 0:
+                    continue
+                # Binary and large files are recorded without postings, so they are
+                # not reread
+                file_id = len(file_paths)
+                file_paths.append(rel_path)
+                files[rel_path] = (file_id, size, mtime_ns)
+                for key in trigrams or ():
+                    postings.setdefault(key, []).append(file_id)
+
+            data = _Postings.serialize(postings)
+            del postings
+            if self._postings is not None:
+                self._postings.close()
+            self._files = files
+            self._paths = file_paths
+            self._delta = {}
+            self._postings = self._save(data)
+
+    def update_file(self, abs_path: str) -> None:
+        """
+        Re-index a single file after it was written or deleted
+
+        Args:
+            abs_path: Absolute path of the file
+        """
+        prefix = self.root_path.rstrip(os.sep) + os.sep
+        if not abs_path.startswith(prefix):
+            return
+        with self._lock:
+            if self._postings is not None:
+                self._update(abs_path[len(prefix) :].replace(os.sep, "/"))
+
+    def candidates(self, literals: List[bytes]) -> Optional[Set[str]]:
+        """
+        Return the files that may contain all the literals
+
+        Args:
+            literals: Literals every match must contain
+
+        Returns:
+            Set of candidate paths, or None when the literals are too short
+            to narrow the search (every file is a candidate)
+        """
+        keys: Set[int] = set()
+        for literal in literals:
+            keys.update(_literal_trigrams(literal))
+        if not keys:
+            return None
+
+        with self._lock:
+            if self._postings is None:
+                return None
+            # Intersect the shortest posting lists first
+            lists = sorted((self._postings.lookup(key) for key in keys), key=len)
+            ids = set(lists[0])
+            for posting in lists[1:]:
+                if not ids:
+                    break
+                ids.intersection_update(posting)
+
+            # Changed files are answered from the delta instead of the stale postings
+            result = {self._paths[file_id] for file_id in ids}.difference(self._delta)
+            for rel_path, (_, _, trigrams) in self._delta.items():
+                if trigrams is not None and keys <= trigrams:
+                    result.add(rel_path)
+            return result
+
+    def _update(self, rel_path: str) -> None:
+        stat_result, trigrams = self._read(rel_path)
+        self._delta[rel_path] = (*stat_result, trigrams)
+
+    def _read(self, rel_path: str) -> Tuple[Tuple[int, int], Optional[FrozenSet[int]]]:
+        """Read a file and return ((size, mtime_ns), trigrams or None)"""
+        try:
+            with open(os.path.join(self.root_path, rel_path), "rb") as f:
+                file_stat = os.fstat(f.fileno())
+                version = (file_stat.st_size, file_stat.st_mtime_ns)
+                if file_stat.st_size > MAX_INDEXED_FILE_SIZE:
+                    return version, None
+                data = f.read()
+        except OSError:
+            return (-1, -1), None
+        if b"\0" in data[:BINARY_SNIFF_SIZE]:
+            return version, None
+        return version, _file_trigrams(data)
+
+    def _save(self, data: bytes) -> _Postings:
+        """Write the postings and file table, returning the loaded postings"""
+        files = [
+            [path, size, mtime_ns] for path, (_, size, mtime_ns) in self._files.items()
+        ]
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            postings_path = os.path.join(self.cache_dir, POSTINGS_FILE_NAME)
+            files_path = os.path.join(self.cache_dir, FILES_FILE_NAME)
+            with open(f"{postings_path}.tmp", "wb") as f:
+                f.write(data)
+            with open(f"{files_path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": INDEX_FORMAT_VERSION,
+                        "root_path": self.root_path,
+                        "files": files,
+                    },
+                    f,
+                    separators=(",", ":"),
+                )
+            os.replace(f"{postings_path}.tmp", postings_path)
+            os.replace(f"{files_path}.tmp", files_path)
+        except OSError as e:
+            logger.warning(f"Failed to save trigram index: {e}")
+        return _Postings(data)
+
+    def _load(self) -> None:
+        """Memory-map the index saved by a previous build, if compatible"""
+        try:
+            with open(
+                os.path.join(self.cache_dir, FILES_FILE_NAME), "r", encoding="utf-8"
+            ) as f:
+                meta = json.load(f)
+            if (
+                meta.get("version") != INDEX_FORMAT_VERSION
+                or meta.get("root_path") != self.root_path
+            ):
+                return
+            with open(os.path.join(self.cache_dir, POSTINGS_FILE_NAME), "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            postings = _Postings(buffer)
+        except (OSError, ValueError):
+            return
+
+        self._paths = [path for path, _, _ in meta["files"]]
+        self._files = {
+            path: (file_id, size, mtime_ns)
+            for file_id, (path, size, mtime_ns) in enumerate(meta["files"])
+        }
+        self._postings = postings
+
+
+# Process-wide indexes keyed by root directory
+_indexes: Dict[str, TrigramIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_trigram_index(root_path: str) -> TrigramIndex:
+    """
+    Get the shared trigram index for a root directory, loading it on first use
+
+    Args:
+        root_path: Root directory
+
+    Returns:
+        Shared TrigramIndex instance
+    """
+    key = os.path.abspath(root_path)
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = TrigramIndex(key)
+                _indexes[key] = index
+    return index
+
+
+def _on_file_changed(abs_path: str) -> None:
+    """Re-index the changed file in every index containing it"""
+    for index in list(_indexes.values()):
+        index.update_file(abs_path)
+
+
+add_file_change_listener(_on_file_changed)
@@ -0,0 +1,678 @@
+"""
+Transactional file writes
+
+A WriteSet stages file writes and commits them together: every file is
+written to a temporary file next to its target, all temporary files are
+fsynced in one batch, and then each is moved into place with os.replace.
+Before a file is replaced for the first time, its previous version is
+hard-linked into a snapshot directory under the git directory (see
+agent_cache), outside the working tree. Because os.replace swaps directory
+entries instead of rewriting the old inode, the link keeps the old contents
+without copying them, and rollback just moves the links back.
+
+While a write set is active (see iteration_write_set), the write tools go
+through it, so a failed development iteration can be undone as a whole. Their
+files are moved into place right away, so tests and diffs see them, but are
+only fsynced together when the iteration's write set is committed.
+
+Writes whose contents equal the current file are skipped, so its mtime and
+every cache keyed on it stay valid. Large files can be streamed from a
+generator (write_chunks) or built up chunk by chunk (append_text); every write
+is refused once it exceeds MAX_WRITE_BYTES or the free disk space.
+"""
+
+import difflib
+import filecmp
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from src.infrastructure.config.agent_setting import agent_settings
+from src.infrastructure.utils.file_events import notify_file_changed
+from src.infrastructure.utils.agent_cache import agent_cache_dir
+from src.infrastructure.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_DIR_NAME = "snapshots"
+# Above this many differing lines the delta is counted without matching lines
+MAX_DIFF_LINES = 5000
+# Streamed files larger than this are counted as fully rewritten
+STREAM_DELTA_MAX_BYTES = 1024 * 1024
+BLOCK_SIZE = 1024 * 1024
+# Files whose line count is remembered between appends
+LINE_COUNTS_MAX_ENTRIES = 256
+
+
+class WriteTooLargeError(ValueError):
+    """A write would exceed the size limit or the free disk space"""
+
+
+class LineDelta(NamedTuple):
+    """Line changes made by a write"""
+
+    created: bool
+    added: int
+    removed: int
+    total_lines: int
+
+    def summary(self) -> str:
+        """Return the delta, e.g. '+3 -1 lines, 120 lines total'"""
+        total = f"{self.total_lines} line{'' if self.total_lines == 1 else 's'}"
+        if self.created:
+            return f"created, {total}"
+        return f"+{self.added} -{self.removed} lines, {total} total"
+
+
+def _read_bytes(abs_path: str) -> Optional[bytes]:
+    try:
+        with open(abs_path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _iter_blocks(abs_path: str) -> Iterator[bytes]:
+    with open(abs_path, "rb") as f:
+        while True:
+            block = f.read(BLOCK_SIZE)
+            if not block:
+                return
+            yield block
+
+
+def _count_lines(abs_path: str) -> int:
+    count, last = 0, b"\n"
+    for block in _iter_blocks(abs_path):
+        count += block.count(b"\n")
+        last = block[-1:]
+    return count + (last != b"\n")
+
+
+def _free_bytes(abs_path: str) -> int:
+    directory = os.path.dirname(abs_path)
+    while not os.path.isdir(directory) and os.path.dirname(directory) != directory:
+        directory = os.path.dirname(directory)
+    return shutil.disk_usage(directory).free
+
+
+def _check_size(
+    filepath: str, size: int, max_bytes: Optional[int], free_bytes: int
+) -> None:
+    """
+    Refuse a write of size bytes
+
+    Raises:
+        WriteTooLargeError: When size exceeds max_bytes (default MAX_WRITE_BYTES)
+            or free_bytes
+    """
+    if max_bytes is None:
+        max_bytes = agent_settings.MAX_WRITE_BYTES
+    if size > max_bytes:
+        raise WriteTooLargeError(
+            f"Refusing to write {filepath}: "
+            f"{size} bytes exceeds the limit of {max_bytes} bytes."
+        )
+    if size > free_bytes:
+        raise WriteTooLargeError(
+            f"Refusing to write {filepath}: "
+            f"{size} bytes exceeds the free disk space ({free_bytes} bytes)."
+        )
+
+
+def _is_unchanged(current: Optional[bytes], data: bytes) -> bool:
+    # Both are in memory: a byte comparison stops at the first difference
+    return current == data
+
+
+def line_delta(previous: Optional[str], text: str) -> LineDelta:
+    """
+    Count the lines added and removed between two versions of a file
+
+    Args:
+        previous: Previous contents, or None if the file did not exist
+        text: New contents
+
+    Returns:
+        LineDelta
+    """
+    new_lines = text.splitlines()
+    if previous is None:
+        return LineDelta(True, len(new_lines), 0, len(new_lines))
+    old_lines = previous.splitlines()
+
+    # Only the region between the common prefix and suffix needs matching
+    prefix = 0
+    limit = min(len(old_lines), len(new_lines))
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < limit - prefix
+        and old_lines[len(old_lines) - 1 - suffix]
+        == new_lines[len(new_lines) - 1 - suffix]
+    ):
+        suffix += 1
+    old_middle = old_lines[prefix : len(old_lines) - suffix]
+    new_middle = new_lines[prefix : len(new_lines) - suffix]
+
+    if len(old_middle) + len(new_middle) > MAX_DIFF_LINES:
+        unchanged = 0
+    else:
+        matcher = difflib.SequenceMatcher(None, old_middle, new_middle, autojunk=False)
+        unchanged = sum(block.size for block in matcher.get_matching_blocks())
+    return LineDelta(
+        False, len(new_middle) - unchanged, len(old_middle) - unchanged, len(new_lines)
+    )
+
+
+def _temp_path(abs_path: str) -> str:
+    directory, name = os.path.split(abs_path)
+    return os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+def _fsync_directory(directory: str) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_temp(abs_path: str, data: bytes) -> str:
+    """Write data to a new temporary file next to abs_path, with its mode"""
+    os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+    tmp_path = _temp_path(abs_path)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        if os.path.exists(abs_path):
+            shutil.copymode(abs_path, tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return tmp_path
+
+
+def atomic_write_text(filepath: str, text: str) -> None:
+    """
+    Write a text file through a temporary file and os.replace
+
+    Readers see either the old or the new contents, never a partial file.
+
+    Args:
+        filepath: Path of the file
+        text: New contents
+    """
+    abs_path = os.path.abspath(filepath)
+    tmp_path = _write_temp(abs_path, text.encode("utf-8"))
+    try:
+        os.replace(tmp_path, abs_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class WriteSet:
+    """Set of file writes committed atomically and undone together"""
+
+    def __init__(self, root_path: Optional[str] = None, durable: bool = True):
+        """
+        Args:
+            root_path: Directory whose agent cache directory keeps the snapshots
+                (.git/agent/<root>/snapshots/ in a git repository).
+                Defaults to the current directory.
+            durable: Whether to fsync files and directories on commit
+        """
+        self.root_path = os.path.abspath(root_path or os.getcwd())
+        self.durable = durable
+        self._staged: Dict[str, str] = {}
+        # Previous version of every replaced file: snapshot path, or None if it
+        # did not exist
+        self._snapshots: Dict[str, Optional[str]] = {}
+        self._snapshot_dir: Optional[str] = None
+        # Files put in place by replace_file or appended to, fsynced on commit
+        self._unsynced: Set[str] = set()
+        self._lock = threading.RLock()
+
+    def stage(self, filepath: str, text: str) -> None:
+        """
+        Stage a file write; nothing is written until commit
+
+        Args:
+            filepath: Path of the file
+            text: New contents
+        """
+        with self._lock:
+            self._staged[os.path.abspath(filepath)] = text
+
+    def commit(self) -> List[str]:
+        """
+        Write all staged files atomically
+
+        Files whose contents would not change are left untouched. Files put in
+        place earlier with replace_file or appended to are fsynced in the same
+        batch.
+
+        Returns:
+            Absolute paths of the written files
+        """
+        with self._lock:
+            staged, self._staged = self._staged, {}
+            temp_paths: Dict[str, str] = {}
+            try:
+                for abs_path, text in staged.items():
+                    data = text.encode("utf-8")
+                    if _is_unchanged(_read_bytes(abs_path), data):
+                        continue
+                    temp_paths[abs_path] = _write_temp(abs_path, data)
+            except BaseException:
+                self._discard(temp_paths)
+                raise
+            self._install(temp_paths)
+
+        for abs_path in temp_paths:
+            notify_file_changed(abs_path)
+        return list(temp_paths)
+
+    def replace_file(self, filepath: str, temp_path: str) -> None:
+        """
+        Move an already written temporary file into place now, fsyncing it on commit
+
+        Args:
+            filepath: Path of the file
+            temp_path: Temporary file in the same directory
+        """
+        abs_path = os.path.abspath(filepath)
+        with self._lock:
+            try:
+                self._snapshot(abs_path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            os.replace(temp_path, abs_path)
+            if self.durable:
+                self._unsynced.add(abs_path)
+        notify_file_changed(abs_path)
+
+    def prepare_append(self, filepath: str) -> None:
+        """
+        Snapshot a file that is about to be appended to in place
+
+        A hard link would share the appended inode, so the file is copied.
+
+        Args:
+            filepath: Path of the file
+        """
+        abs_path = os.path.abspath(filepath)
+        with self._lock:
+            self._snapshot(abs_path, copy=True)
+            if self.durable:
+                self._unsynced.add(abs_path)
+
+    def rollback(self) -> List[str]:
+        """
+        Drop staged writes and restore every file replaced by this write set
+
+        Returns:
+            Absolute paths of the restored (or removed) files
+        """
+        with self._lock:
+            self._staged = {}
+            self._unsynced = set()
+            restored = []
+            for abs_path, snapshot in self._snapshots.items():
+                try:
+                    if snapshot is None:
+                        if os.path.exists(abs_path):
+                            os.unlink(abs_path)
+                    else:
+                        # A rename, or a copy when the snapshot is on another filesystem
+                        shutil.move(snapshot, abs_path)
+                    restored.append(abs_path)
+                except OSError as e:
+                    logger.error(f"Failed to restore {abs_path}: {e}")
+            self._snapshots = {}
+            self._remove_snapshot_dir()
+
+        for abs_path in restored:
+            notify_file_changed(abs_path)
+        return restored
+
+    def release(self) -> None:
+        """Keep the committed writes and delete the snapshots"""
+        with self._lock:
+            self._snapshots = {}
+            self._remove_snapshot_dir()
+
+    @property
+    def touched_files(self) -> List[str]:
+        """Absolute paths of the files replaced since the write set was created"""
+        return list(self._snapshots)
+
+    def _install(self, temp_paths: Dict[str, str]) -> None:
+        """
+        fsync temporary files and earlier unsynced files in one batch, snapshot
+        the targets and replace them
+        """
+        unsynced, self._unsynced = self._unsynced, set()
+        try:
+            if self.durable:
+                for path in list(temp_paths.values()) + list(unsynced):
+                    try:
+                        fd = os.open(path, os.O_RDONLY)
+                    except FileNotFoundError:
+                        # An unsynced file removed since
+                        continue
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+            for abs_path in temp_paths:
+                self._snapshot(abs_path)
+        except BaseException:
+            self._unsynced |= unsynced
+            self._discard(temp_paths)
+            raise
+
+        for abs_path, temp_path in temp_paths.items():
+            os.replace(temp_path, abs_path)
+        if self.durable:
+            for directory in {
+                os.path.dirname(path) for path in [*temp_paths, *unsynced]
+            }:
+                _fsync_directory(directory)
+
+    @staticmethod
+    def _discard(temp_paths: Dict[str, str]) -> None:
+        for temp_path in temp_paths.values():
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def _snapshot(self, abs_path: str, copy: bool = False) -> None:
+        """Keep the current version of a file, once per write set"""
+        if abs_path in self._snapshots:
+            return
+        if not os.path.exists(abs_path):
+            self._snapshots[abs_path] = None
+            return
+
+        if self._snapshot_dir is None:
+            self._snapshot_dir = os.path.join(
+                agent_cache_dir(self.root_path), SNAPSHOT_DIR_NAME, uuid.uuid4().hex
+            )
+            os.makedirs(self._snapshot_dir)
+        snapshot = os.path.join(self._snapshot_dir, str(len(self._snapshots)))
+        if copy:
+            shutil.copy2(abs_path, snapshot)
+        else:
+            try:
+                # Constant time: the old inode stays untouched because targets are
+                # replaced
+                os.link(abs_path, snapshot)
+            except OSError:
+                # Different filesystem or no hard link support
+                shutil.copy2(abs_path, snapshot)
+        self._snapshots[abs_path] = snapshot
+
+    def _remove_snapshot_dir(self) -> None:
+        if self._snapshot_dir is not None:
+            shutil.rmtree(self._snapshot_dir, ignore_errors=True)
+            self._snapshot_dir = None
+
+    def __enter__(self) -> "WriteSet":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+            self.release()
+        else:
+            self.rollback()
+
+
+# Write set the write tools go through, if any; a context variable so that
+# concurrent coordinators and their threads each see their own
+_active_write_set: ContextVar[Optional[WriteSet]] = ContextVar(
+    "active_write_set", default=None
+)
+
+# Line count after the last append: path -> (size, mtime_ns, lines)
+_line_counts: Dict[str, Tuple[int, int, int]] = {}
+_line_counts_lock = threading.Lock()
+
+
+@contextmanager
+def iteration_write_set(root_path: Optional[str] = None) -> Iterator[WriteSet]:
+    """
+    Route all tool writes through one write set, committed in one batch when
+    the block ends and rolled back if it fails
+
+    Args:
+        root_path: Directory under which snapshots are kept
+
+    Yields:
+        The active WriteSet
+    """
+    write_set = WriteSet(root_path)
+    token = _active_write_set.set(write_set)
+    try:
+        yield write_set
+        write_set.commit()
+    except BaseException:
+        restored = write_set.rollback()
+        logger.warning(f"Rolled back {len(restored)} files written by the failed block")
+        raise
+    finally:
+        _active_write_set.reset(token)
+        write_set.release()
+
+
+def write_text(filepath: str, text: str) -> Optional[LineDelta]:
+    """
+    Write a text file atomically, through the active write set if there is one
+
+    Nothing is written, and no change is notified, when the file already has
+    these contents.
+
+    Args:
+        filepath: Path of the file
+        text: New contents
+
+    Returns:
+        Line changes made, or None when the contents were unchanged
+
+    Raises:
+        WriteTooLargeError: When the contents exceed MAX_WRITE_BYTES or the free
+            disk space
+    """
+    abs_path = os.path.abspath(filepath)
+    data = text.encode("utf-8")
+    current = _read_bytes(abs_path)
+    if _is_unchanged(current, data):
+        return None
+    _check_size(filepath, len(data), None, _free_bytes(abs_path))
+    previous = None if current is None else current.decode("utf-8", errors="replace")
+
+    write_set = _active_write_set.get()
+    if write_set is not None:
+        write_set.replace_file(abs_path, _write_temp(abs_path, data))
+    else:
+        atomic_write_text(filepath, text)
+        notify_file_changed(filepath)
+    return line_delta(previous, text)
+
+
+def write_chunks(
+    filepath: str, chunks: Iterable[str], max_bytes: Optional[int] = None
+) -> Optional[LineDelta]:
+    """
+    Stream text chunks to a file with bounded memory
+
+    The chunks go to a temporary file that replaces the target once the
+    generator is exhausted (through the active write set if there is one), so a
+    failing generator leaves the file unchanged.
+
+    Args:
+        filepath: Path of the file
+        chunks: Text chunks, e.g. a generator
+        max_bytes: Size limit (default MAX_WRITE_BYTES)
+
+    Returns:
+        Line changes made, or None when the contents were unchanged
+
+    Raises:
+        WriteTooLargeError: As soon as the written size exceeds the limit or the
+            free disk space
+    """
+    abs_path = os.path.abspath(filepath)
+    os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+    exists = os.path.exists(abs_path)
+    current_size = os.path.getsize(abs_path) if exists else 0
+    # The target's blocks are freed when the temporary file replaces it
+    free_bytes = _free_bytes(abs_path) + current_size
+    tmp_path = _temp_path(abs_path)
+    size = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                size += len(data)
+                _check_size(filepath, size, max_bytes, free_bytes)
+                f.write(data)
+
+        if (
+            exists
+            and current_size == size
+            and filecmp.cmp(abs_path, tmp_path, shallow=False)
+        ):
+            os.unlink(tmp_path)
+            return None
+
+        if not exists:
+            new_lines = _count_lines(tmp_path)
+            delta = LineDelta(True, new_lines, 0, new_lines)
+        elif max(size, current_size) <= STREAM_DELTA_MAX_BYTES:
+            previous = _read_bytes(abs_path).decode("utf-8", errors="replace")
+            delta = line_delta(previous, _read_bytes(tmp_path).decode("utf-8"))
+        else:
+            new_lines = _count_lines(tmp_path)
+            delta = LineDelta(False, new_lines, _count_lines(abs_path), new_lines)
+        if exists:
+            shutil.copymode(abs_path, tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    write_set = _active_write_set.get()
+    if write_set is not None:
+        write_set.replace_file(abs_path, tmp_path)
+    else:
+        os.replace(tmp_path, abs_path)
+        notify_file_changed(abs_path)
+    return delta
+
+
+def append_text(
+    filepath: str, text: str, max_bytes: Optional[int] = None
+) -> Optional[LineDelta]:
+    """
+    Append text to a file, creating it if needed
+
+    Args:
+        filepath: Path of the file
+        text: Text to add at the end
+        max_bytes: Limit on the resulting file size (default MAX_WRITE_BYTES)
+
+    Returns:
+        Line changes made, or None when text is empty
+
+    Raises:
+        WriteTooLargeError: When the resulting file exceeds the limit or the chunk
+            the free disk space
+    """
+    if not text:
+        return None
+    abs_path = os.path.abspath(filepath)
+    data = text.encode("utf-8")
+    exists = os.path.exists(abs_path)
+    current_size = os.path.getsize(abs_path) if exists else 0
+    free_bytes = _free_bytes(abs_path)
+    _check_size(
+        filepath, current_size + len(data), max_bytes, current_size + free_bytes
+    )
+
+    previous_lines, partial = (
+        _line_count_before_append(abs_path) if exists else (0, False)
+    )
+
+    write_set = _active_write_set.get()
+    if write_set is not None:
+        write_set.prepare_append(abs_path)
+    os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+    with open(abs_path, "ab") as f:
+        f.write(data)
+        f.flush()
+        file_stat = os.fstat(f.fileno())
+    notify_file_changed(abs_path)
+
+    # Without a trailing newline, the first appended line extends the last line
+    added = text.count("\n") + (not text.endswith("\n"))
+    removed = int(partial)
+    total_lines = previous_lines - removed + added
+    with _line_counts_lock:
+        if len(_line_counts) >= LINE_COUNTS_MAX_ENTRIES:
+            _line_counts.clear()
+        _line_counts[abs_path] = (file_stat.st_size, file_stat.st_mtime_ns, total_lines)
+    return LineDelta(not exists, added, removed, total_lines)
+
+
+def _line_count_before_append(abs_path: str) -> Tuple[int, bool]:
+    """
+    Count the lines of a file about to be appended to
+
+    The count left by the previous append is reused while the file is unchanged
+    since, so appending chunk by chunk does not rescan the growing file.
+
+    Returns:
+        Tuple of (line count, whether the file lacks a trailing newline)
+    """
+    file_stat = os.stat(abs_path)
+    with open(abs_path, "rb") as f:
+        if file_stat.st_size:
+            f.seek(-1, os.SEEK_END)
+        partial = f.read(1) not in (b"", b"\n")
+    with _line_counts_lock:
+        cached = _line_counts.get(abs_path)
+    if cached is not None and cached[:2] == (file_stat.st_size, file_stat.st_mtime_ns):
+        return cached[2], partial
+    return _count_lines(abs_path), partial
+
+
+def write_result(delta: Optional[LineDelta]) -> Dict[str, str]:
+    """
+    Build the result a write tool returns to the agent
+
+    Args:
+        delta: Return value of write_text
+
+    Returns:
+        {"result": "success", "changes": <summary>}, or {"result": "unchanged", ...}
+    """
+    if delta is None:
+        return {
+            "result": "unchanged",
+            "message": "The file already has this content. Nothing was written.",
+        }
+    return {"result": "success", "changes": delta.summary()}
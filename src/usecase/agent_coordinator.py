@@ -1,18 +1,27 @@
 import os
 import subprocess
+from typing import Optional
 
 from langchain.schema import HumanMessage
 from langchain_core.prompts import PromptTemplate
 
 from src.agent.schema.reviewer_input import ReviewerInput
 from src.agent.schema.reviewer_output import ReviewerOutput
+from src.application.client.diff_engine import get_diff_engine, paginate_diff
+from src.application.client.git_service import get_git_service
 from src.application.client.llm.azure_openai_client import AzureOpenAIClient
+from src.infrastructure.config.agent_setting import agent_settings
 from src.infrastructure.utils.logger import get_logger
+from src.infrastructure.utils.read_cache import read_cache
+from src.infrastructure.utils.write_set import iteration_write_set
 from src.usecase.programmer.agent import ProgrammerAgent
 from src.usecase.reviewer.agent import ReviewerAgent
 
 logger = get_logger(__name__)
 
+# Length of the previous review summary passed to the next incremental review
+PREVIOUS_REVIEW_SUMMARY_MAX_CHARS = 2000
+
 
 class AgentCoordinator:
     """Coordinator that manages collaboration between ProgrammerAgent and ReviewerAgent."""
@@ -27,6 +36,9 @@ class AgentCoordinator:
         self.chat_llm = self.llm_client.initialize_chat()
         self.repo_path = os.getcwd()  # Use current directory as repository path
         self.repo_full_name = "coding_agent_from_scratch"
+        # Tree snapshot and summary of the last review, for incremental reviews
+        self.reviewed_tree: Optional[str] = None
+        self.previous_review_summary: Optional[str] = None
 
     def generate_branch_name(self, instruction: str) -> str:
         """Generate Git branch name from instruction content.
@@ -99,6 +111,9 @@ Output only the branch name. No explanation or surrounding text needed.
     def run_reviewer(self, programmer_comment: str = None) -> ReviewerOutput:
         """Execute the reviewer agent.
 
+        From the second review on, only the changes made since the previous
+        review are sent, together with the summary of that review.
+
         Args:
             programmer_comment (str, optional): Comment from programmer. Defaults to None.
 
@@ -112,12 +127,40 @@ Output only the branch name. No explanation or surrounding text needed.
             logger.error(error_msg)
             raise ValueError(error_msg)
 
-        # Get current local diff (comparison between HEAD and working directory)
-        logger.info(f"Getting local diff: working_branch={self.working_branch}")
-        diff = self.programmer_agent.get_diff(
-            base_branch=self.base_branch,
-        )
+        diff_engine = get_diff_engine(self.repo_path)
+        try:
+            tree = diff_engine.snapshot_tree()
+        except subprocess.CalledProcessError as e:
+            logger.warning(
+                "Failed to snapshot the working tree, reviewing the full diff: "
+                f"{e.output}"
+            )
+            tree = None
+
+        previous_review_summary = None
+        if (
+            tree is not None
+            and self.reviewed_tree is not None
+            # The previous snapshot is unreachable, so git gc may have pruned it
+            and diff_engine.git.object_info(self.reviewed_tree) is not None
+        ):
+            # Only the changes made since the previous review
+            logger.info(
+                "Getting diff since the previous review: "
+                f"{self.reviewed_tree[:7]}..{tree[:7]}"
+            )
+            diff = diff_engine.diff_trees(self.reviewed_tree, tree)
+            previous_review_summary = self.previous_review_summary
+            if not diff:
+                diff = "(No changes since the previous review)"
+        else:
+            # Get current local diff (comparison between HEAD and working directory)
+            logger.info(f"Getting local diff: working_branch={self.working_branch}")
+            snapshot = diff_engine.snapshot()
+            logger.info(f"Local changes: {snapshot.summary()}")
+            diff = snapshot.diff
         logger.info(f"Retrieved diff length: {len(diff)} characters")
+        diff = self._fit_diff(diff)
         if diff:
             logger.info(f"First 100 characters of diff: {diff[:100]}...")
         else:
@@ -127,9 +170,43 @@ Output only the branch name. No explanation or surrounding text needed.
         reviewer_input = ReviewerInput(
             diff=diff,
             programmer_comment=programmer_comment,
+            previous_review_summary=previous_review_summary,
         )
 
-        return self.reviewer_agent.run(reviewer_input)
+        reviewer_output = self.reviewer_agent.run(reviewer_input)
+        self.reviewed_tree = tree
+        self.previous_review_summary = reviewer_output.summary[
+            :PREVIOUS_REVIEW_SUMMARY_MAX_CHARS
+        ]
+        return reviewer_output
+
+    @staticmethod
+    def _fit_diff(diff: str) -> str:
+        """Keep the first page of a diff over the review token budget and list the rest.
+
+        Args:
+            diff (str): Diff for the reviewer
+
+        Returns:
+            str: Diff that fits REVIEW_DIFF_TOKEN_BUDGET
+        """
+        pages = paginate_diff(diff, agent_settings.REVIEW_DIFF_TOKEN_BUDGET)
+        if len(pages) <= 1:
+            return diff
+        remaining = [path for page in pages[1:] for path in page.paths]
+        logger.info(
+            f"Diff split into {len(pages)} pages; "
+            "sending the first page to the reviewer"
+        )
+        return (
+            pages[0].text
+            + "\n[The diff is too large to send at once. "
+            + f"{len(remaining)} more changed files are not shown above; "
+            + "fetch each one with the GenerateDiff tool "
+            + "(file_path=<path>, context_lines=1) when reviewing it:\n"
+            + "\n".join(remaining)
+            + "]\n"
+        )
 
     def development_cycle(
         self,
@@ -165,55 +242,57 @@ Output only the branch name. No explanation or surrounding text needed.
                 )
 
             # Execute development cycle
+            self.reviewed_tree = None
+            self.previous_review_summary = None
             for i in range(max_iterations):
                 logger.info(f"=== Development cycle {i + 1}/{max_iterations} ===")
 
-                programmer_output = self.run_programmer(
-                    instruction,
-                    reviewer_comment=reviewer_output.summary
-                    if reviewer_output
-                    else None,
-                )
-                logger.info(f"Programmer output: {programmer_output[:100]}...")
+                # Files written during a failed iteration are restored
+                with iteration_write_set(self.repo_path):
+                    programmer_output = self.run_programmer(
+                        instruction,
+                        reviewer_comment=reviewer_output.summary
+                        if reviewer_output
+                        else None,
+                    )
+                    logger.info(f"Programmer output: {programmer_output[:100]}...")
+
+                    reviewer_output = self.run_reviewer(
+                        programmer_comment=f"Implementation for development cycle {i + 1} is completed. Please review."
+                    )
+                logger.info(f"Reviewer output: {reviewer_output.summary[:100]}...")
 
-                reviewer_output = self.run_reviewer(
-                    programmer_comment=f"Implementation for development cycle {i + 1} is completed. Please review."
+                stats = read_cache.stats()
+                logger.info(
+                    f"Read cache: {stats['hits']} hits, {stats['misses']} misses, "
+                    f"{stats['bytes_saved']} bytes not re-read"
                 )
-                logger.info(f"Reviewer output: {reviewer_output.summary[:100]}...")
+                read_cache.reset_stats()
+
+                git_service = get_git_service(self.repo_path)
+                for op, op_stats in sorted(git_service.stats().items()):
+                    logger.info(
+                        f"Git {op}: {op_stats['calls']} calls, {op_stats['total_ms']} ms "
+                        f"({op_stats['avg_ms']} ms avg)"
+                    )
+                git_service.reset_stats()
 
                 if reviewer_output.lgtm:
                     logger.info("Review approval (LGTM) obtained. Ending the cycle.")
                     break
 
             # Check and process diff
-            diff = self.programmer_agent.get_diff(
-                base_branch=self.base_branch,
-            )
-            if not diff:
+            snapshot = get_diff_engine(self.repo_path).snapshot()
+            if snapshot.is_empty:
                 logger.warning("No local diff found. Cannot create pull request.")
                 exit(1)
-
-            try:
-                diff_output = subprocess.check_output(
-                    [
-                        "git",
-                        "diff",
-                        "--name-only",
-                        "HEAD",
-                        "--",
-                        self.repo_path,
-                    ],
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                )
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Failed to execute git diff command: {e}")
-                raise
+            logger.info(f"Local changes: {snapshot.summary()}\n{snapshot.stat()}")
 
             return {
                 "programmer_output": programmer_output,
                 "reviewer_output": reviewer_output.summary if reviewer_output else None,
                 "branch_name": self.working_branch,
+                "diff_snapshot": snapshot,
             }
 
         except Exception as e:
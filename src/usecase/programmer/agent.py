@@ -8,7 +8,10 @@ from langchain_core.prompts import (
 from langchain_core.tools import BaseTool
 
 from src.agent.function.create_branch import CreateBranchFunction
+from src.agent.function.edit_file import EditFileFunction
 from src.agent.function.exec_pytest_test import ExecPytestTestFunction
+from src.agent.function.find_definition import FindDefinitionFunction
+from src.agent.function.find_references import FindReferencesFunction
 from src.agent.function.generate_diff import GenerateDiffFunction
 from src.agent.function.generate_pull_request_params import (
     GeneratePullRequestParamsFunction,
@@ -19,6 +22,8 @@ from src.agent.function.make_new_file import MakeNewFileFunction
 from src.agent.function.open_url import OpenUrlFunction
 from src.agent.function.over_write_file import OverwriteFileFunction
 from src.agent.function.read_file import ReadFileFunction
+from src.agent.function.read_files import ReadFilesFunction
+from src.agent.function.search_code import SearchCodeFunction
 from src.agent.schema.programmer_input import ProgrammerInput
 from src.agent.schema.programmer_output import ProgrammerOutput
 from src.application.chain.pydantic_chain import PydanticChain
@@ -55,7 +60,12 @@ class ProgrammerAgent:
     def _initialize_tools(self) -> list[BaseTool]:
         return [
             GetFilesListFunction.to_tool(),
+            SearchCodeFunction.to_tool(),
             ReadFileFunction.to_tool(),
+            ReadFilesFunction.to_tool(),
+            FindDefinitionFunction.to_tool(),
+            FindReferencesFunction.to_tool(),
+            EditFileFunction.to_tool(),
             OverwriteFileFunction.to_tool(),
             MakeNewFileFunction.to_tool(),
             ExecPytestTestFunction.to_tool(),
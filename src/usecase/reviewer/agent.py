@@ -8,6 +8,8 @@ from langchain_core.prompts import (
 from langchain_core.tools import BaseTool
 
 from src.agent.function.exec_pytest_test import ExecPytestTestFunction
+from src.agent.function.generate_diff import GenerateDiffFunction
+from src.agent.function.read_files import ReadFilesFunction
 from src.agent.function.record_lgtm import RecordLgtmFunction
 from src.agent.function.review_code_function import ReviewCodeFunction
 from src.agent.schema.reviewer_input import ReviewerInput
@@ -35,6 +37,8 @@ class ReviewerAgent:
         return [
             ReviewCodeFunction.to_tool(),
             ExecPytestTestFunction.to_tool(),
+            GenerateDiffFunction.to_tool(),
+            ReadFilesFunction.to_tool(),
             RecordLgtmFunction.to_tool(),
         ]
 
@@ -81,6 +85,14 @@ class ReviewerAgent:
             {reviewer_input.diff}
             
             """
+        if reviewer_input.previous_review_summary:
+            input_text += (
+                "\n\nThe diff above only contains the changes made since "
+                "your previous review. Code outside it was already reviewed; "
+                "use ReadFiles if you need the surrounding code."
+                "\n\nSummary of your previous review:\n"
+                f"{reviewer_input.previous_review_summary}"
+            )
         if reviewer_input.programmer_comment:
             input_text += f"\n\nComment from programmer:\n{reviewer_input.programmer_comment}"
 
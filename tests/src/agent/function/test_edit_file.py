@@ -0,0 +1,86 @@
+"""
+Unit tests for EditFileFunction
+"""
+
+from src.agent.function.edit_file import EditFileFunction
+from src.agent.schema.edit_file_input import EditFileInput
+
+
+def test_execute_search_replace(tmp_path):
+    """Test editing a file with search/replace blocks"""
+    test_file = tmp_path / "app.py"
+    test_file.write_text("x = 1\ny = 2\n", encoding="utf-8")
+
+    result = EditFileFunction.execute(
+        filepath=str(test_file), edits=[{"search": "y = 2", "replace": "y = 3"}]
+    )
+
+    assert result == {"result": "success", "changes": "+1 -1 lines, 2 lines total"}
+    assert test_file.read_text(encoding="utf-8") == "x = 1\ny = 3\n"
+
+
+def test_execute_diff(tmp_path):
+    """Test editing a file with a unified diff"""
+    test_file = tmp_path / "app.py"
+    test_file.write_text("x = 1\ny = 2\n", encoding="utf-8")
+
+    result = EditFileFunction.execute(
+        filepath=str(test_file), diff="@@ -1,2 +1,2 @@\n-x = 1\n+x = 0\n y = 2\n"
+    )
+
+    assert result == {"result": "success", "changes": "+1 -1 lines, 2 lines total"}
+    assert test_file.read_text(encoding="utf-8") == "x = 0\ny = 2\n"
+
+
+def test_execute_failing_edit_leaves_file_unchanged(tmp_path):
+    """Test that nothing is written when one edit does not apply"""
+    test_file = tmp_path / "app.py"
+    test_file.write_text("x = 1\ny = 2\n", encoding="utf-8")
+
+    result = EditFileFunction.execute(
+        filepath=str(test_file),
+        edits=[
+            {"search": "x = 1", "replace": "x = 0"},
+            {"search": "z = 3", "replace": "z = 4"},
+        ],
+    )
+
+    assert result["error"].startswith("Edit 2 could not be applied")
+    assert test_file.read_text(encoding="utf-8") == "x = 1\ny = 2\n"
+
+
+def test_execute_reports_fuzzy_matches(tmp_path):
+    """Test that an edit applied to merely similar text is reported"""
+    test_file = tmp_path / "app.py"
+    test_file.write_text("def sub(a, b):\n    return a - b\n", encoding="utf-8")
+
+    result = EditFileFunction.execute(
+        filepath=str(test_file),
+        edits=[
+            {
+                "search": "def sub(a, b):\n    return a-b\n",
+                "replace": "def sub(a, b):\n    return b - a\n",
+            }
+        ],
+    )
+
+    assert result["result"] == "success"
+    assert len(result["fuzzy_matches"]) == 1
+    assert result["fuzzy_matches"][0].startswith("Edit 1 replaced lines 1-2 (")
+    assert "warning" in result
+    assert test_file.read_text(encoding="utf-8") == "def sub(a, b):\n    return b - a\n"
+
+
+def test_execute_file_not_found(tmp_path):
+    """Test editing a missing file"""
+    result = EditFileFunction.execute(filepath=str(tmp_path / "missing.py"), diff="@@")
+
+    assert result["error"] == "File not found."
+
+
+def test_to_tool():
+    """Test that the tool is built with the input schema"""
+    tool = EditFileFunction.to_tool()
+
+    assert tool.name == "edit_file_function"
+    assert tool.args_schema == EditFileInput
@@ -0,0 +1,83 @@
+"""
+Unit test for ExecPytestTestFunction
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.agent.function.exec_pytest_test import ExecPytestTestFunction
+from src.application.client.pytest_worker import PytestWorkerError
+from src.infrastructure.config.agent_setting import agent_settings
+
+
+def _completed(stdout):
+    result = MagicMock()
+    result.stdout = stdout
+    result.stderr = ""
+    result.returncode = 0
+    return result
+
+
+@patch.object(agent_settings, "PYTEST_WORKER", True)
+class TestExecPytestTestFunction(unittest.TestCase):
+    """Test class for ExecPytestTestFunction"""
+
+    @patch("src.agent.function.exec_pytest_test.subprocess.run")
+    @patch("src.agent.function.exec_pytest_test.get_pytest_worker")
+    def test_execute_uses_worker(self, mock_get_worker, mock_run):
+        """Test that tests run in the warm worker"""
+        mock_get_worker.return_value.run.return_value = {
+            "stdout": "1 passed",
+            "stderr": "",
+            "exit_status": "0",
+        }
+
+        result = ExecPytestTestFunction.execute("tests/test_x.py")
+
+        mock_get_worker.return_value.run.assert_called_once_with(["tests/test_x.py"])
+        mock_run.assert_not_called()
+        self.assertEqual(result["exit_status"], "0")
+
+    @patch("src.agent.function.exec_pytest_test.subprocess.run")
+    @patch("src.agent.function.exec_pytest_test.get_pytest_worker")
+    def test_execute_falls_back_to_subprocess(self, mock_get_worker, mock_run):
+        """Test the fallback when the worker is unavailable"""
+        mock_get_worker.return_value.run.side_effect = PytestWorkerError("unavailable")
+        mock_run.return_value = _completed("1 passed")
+
+        result = ExecPytestTestFunction.execute("tests/test_x.py")
+
+        # No shell, so the path is passed as a single argument
+        mock_run.assert_called_once_with(
+            ["pytest", "tests/test_x.py"], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result["stdout"], "1 passed")
+        self.assertEqual(result["exit_status"], "0")
+
+    @patch("src.agent.function.exec_pytest_test.subprocess.run")
+    @patch("src.agent.function.exec_pytest_test.get_pytest_worker")
+    def test_execute_falls_back_on_any_worker_error(self, mock_get_worker, mock_run):
+        """Test the fallback when the worker fails in an unexpected way"""
+        mock_get_worker.return_value.run.side_effect = ValueError("bad response")
+        mock_run.return_value = _completed("1 passed")
+
+        result = ExecPytestTestFunction.execute("tests/test_x.py")
+
+        mock_run.assert_called_once()
+        self.assertEqual(result["stdout"], "1 passed")
+
+    @patch("src.agent.function.exec_pytest_test.subprocess.run")
+    @patch("src.agent.function.exec_pytest_test.get_pytest_worker")
+    def test_execute_without_worker(self, mock_get_worker, mock_run):
+        """Test that the worker is not used when PYTEST_WORKER is off"""
+        mock_run.return_value = _completed("1 passed")
+
+        with patch.object(agent_settings, "PYTEST_WORKER", False):
+            result = ExecPytestTestFunction.execute("tests/test_x.py")
+
+        mock_get_worker.assert_not_called()
+        self.assertEqual(result["stdout"], "1 passed")
+
+
+if __name__ == "__main__":
+    unittest.main()
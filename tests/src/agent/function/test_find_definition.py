@@ -0,0 +1,63 @@
+"""
+Unit test for FindDefinitionFunction and FindReferencesFunction
+"""
+
+from src.agent.function.find_definition import FindDefinitionFunction
+from src.agent.function.find_references import FindReferencesFunction
+from src.agent.schema.find_definition_input import FindDefinitionInput
+
+
+def _project(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "tools.py").write_text(
+        "class Tool:\n    def run(self):\n        return 1\n"
+    )
+    (tmp_path / "main.py").write_text(
+        "from pkg.tools import Tool\n\nTool().run()\nTool().run()  # again\n"
+    )
+
+
+class TestFindDefinitionFunction:
+    def test_execute(self, tmp_path):
+        """Test that definitions are returned with their source line"""
+        _project(tmp_path)
+
+        result = FindDefinitionFunction.execute(
+            "Tool.run", root_directory=str(tmp_path)
+        )
+
+        assert result == {
+            "definitions": "pkg/tools.py:2-3: method Tool.run | def run(self):",
+            "count": 1,
+        }
+
+    def test_execute_max_results(self, tmp_path):
+        """Test that the number of definitions is capped"""
+        _project(tmp_path)
+
+        result = FindDefinitionFunction.execute(
+            "Tool", root_directory=str(tmp_path), max_results=1
+        )
+
+        assert result["definitions"] == "pkg/tools.py:1-3: class Tool | class Tool:"
+        assert "warning" in result
+
+    def test_find_references(self, tmp_path):
+        """Test that references are returned once per line"""
+        _project(tmp_path)
+
+        result = FindReferencesFunction.execute("run", root_directory=str(tmp_path))
+
+        assert result["references"] == "\n".join(
+            [
+                "main.py:3: call | Tool().run()",
+                "main.py:4: call | Tool().run()  # again",
+            ]
+        )
+
+    def test_to_tool(self):
+        """Test that the tool is built with the input schema"""
+        tool = FindDefinitionFunction.to_tool()
+
+        assert tool.name == "find_definition_function"
+        assert tool.args_schema == FindDefinitionInput
@@ -2,66 +2,56 @@
 Unit test for GetFilesListFunction
 """
 
+import asyncio
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 import pytest
+from pydantic import ValidationError
 
 from src.agent.function.get_files_list import GetFilesListFunction
 from src.agent.schema.get_files_list_input import GetFilesListInput
 
 
 class TestGetFilesListFunction:
-    @patch("src.agent.function.get_files_list.glob.glob")
-    @patch("src.agent.function.get_files_list.os.path.isfile")
-    def test_execute(self, mock_isfile, mock_glob):
+    def test_execute(self, tmp_path):
         """Test for execute method"""
-        # Set up mock
-        mock_glob.side_effect = lambda pattern, recursive: {
-            "**/*.py": ["config.py", "dir/settings.py"],
-            "**/*.pyx": ["module.pyx"],
-            "**/*.pyi": ["types.pyi"],
-            "**/*.ipynb": ["notebook.ipynb"],
-            "**/*.js": ["script.js"],
-            "**/*.jsx": ["component.jsx"],
-            "**/*.mjs": ["module.mjs"],
-            "**/*.cjs": ["common.cjs"],
-            "**/*.ts": ["app.ts"],
-            "**/*.tsx": ["component.tsx"],
-            "**/*.d.ts": ["types.d.ts"],
-            "**/*.md": ["README.md"],
-            "**/*.mdx": ["doc.mdx"],
-            "**/*.markdown": ["guide.markdown"],
-            "**/*.json": ["package.json"],
-            "**/*.jsonc": ["config.jsonc"],
-            "**/*.yml": ["config.yml"],
-            "**/*.yaml": ["docker-compose.yaml"],
-        }.get(pattern, [])
-
-        # Make all files treated as actual files
-        mock_isfile.return_value = True
+        # Set up files
+        for path in [
+            "config.py",
+            "dir/settings.py",
+            "script.js",
+            "component.tsx",
+            "README.md",
+            "package.json",
+            "config.yml",
+        ]:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text("")
 
         # Test execution
-        result = GetFilesListFunction.execute()
+        result = GetFilesListFunction.execute(root_directory=str(tmp_path))
 
         # Verification
         assert "files_list" in result
         assert isinstance(result["files_list"], list)
         # Check that multiple language files are included by default
-        assert len(result["files_list"]) > 0
+        assert len(result["files_list"]) == 7
 
-    @patch("src.agent.function.get_files_list.glob.glob")
-    @patch("src.agent.function.get_files_list.os.path.isfile")
-    def test_execute_with_specific_extensions(self, mock_isfile, mock_glob):
+    def test_execute_with_specific_extensions(self, tmp_path):
         """Test for specific extensions"""
-        # Set up mock
-        mock_glob.side_effect = lambda pattern, recursive: {
-            "**/*.py": ["config.py", "dir/settings.py"],
-        }.get(pattern, [])
-
-        mock_isfile.return_value = True
+        # Set up files
+        (tmp_path / "dir").mkdir()
+        (tmp_path / "config.py").write_text("")
+        (tmp_path / "dir" / "settings.py").write_text("")
+        (tmp_path / "script.js").write_text("")
 
         # Test execution
-        result = GetFilesListFunction.execute(file_extensions=["py"])
+        result = GetFilesListFunction.execute(
+            file_extensions=["py"], root_directory=str(tmp_path)
+        )
 
         # Verification
         assert "files_list" in result
@@ -69,6 +59,245 @@ class TestGetFilesListFunction:
         assert "config.py" in result["files_list"]
         assert "dir/settings.py" in result["files_list"]
 
+    def test_execute_prunes_excluded_directories(self, tmp_path):
+        """Test that excluded directories and files are skipped"""
+        # Set up files
+        for path in [
+            "main.py",
+            "node_modules/pkg/index.js",
+            "src/__pycache__/main.py",
+            "src/app.js",
+            "src/debug.log",
+            ".venv/lib/site.py",
+        ]:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text("")
+
+        # Test execution
+        result = GetFilesListFunction.execute(
+            file_extensions=["py", "js", "log"], root_directory=str(tmp_path)
+        )
+
+        # Verification
+        assert result["files_list"] == ["main.py", "src/app.js"]
+
+    def test_execute_with_include_patterns(self, tmp_path):
+        """Test for include patterns matched in the same pass"""
+        # Set up files
+        for path in ["pyproject.toml", "sub/requirements.txt", "sub/other.txt"]:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text("")
+
+        # Test execution
+        result = GetFilesListFunction.execute(
+            file_extensions=["toml"],
+            include_patterns=["**/requirements.txt"],
+            root_directory=str(tmp_path),
+        )
+
+        # Verification
+        assert result["files_list"] == ["pyproject.toml", "sub/requirements.txt"]
+
+    def test_execute_max_files(self, tmp_path):
+        """Test that the result is truncated after sorting"""
+        for name in ["c.py", "a.py", "b.py"]:
+            (tmp_path / name).write_text("")
+
+        result = GetFilesListFunction.execute(
+            file_extensions=["py"], root_directory=str(tmp_path), max_files=2
+        )
+
+        assert result["files_list"] == ["a.py", "b.py"]
+        assert "warning" in result
+
+    @pytest.mark.parametrize("max_files", [0, -1])
+    def test_execute_rejects_empty_pages(self, tmp_path, max_files):
+        """Test that max_files below 1 is an error instead of endless paging"""
+        (tmp_path / "a.py").write_text("")
+
+        result = GetFilesListFunction.execute(
+            root_directory=str(tmp_path), max_files=max_files
+        )
+
+        assert result["result"] == "error"
+        with pytest.raises(ValidationError):
+            GetFilesListInput(max_files=max_files)
+
+    def test_execute_tree_output(self, tmp_path):
+        """Test that output_format='tree' returns an indented directory tree"""
+        for path in ["main.py", "pkg/a.py", "pkg/b.py"]:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text("")
+
+        result = GetFilesListFunction.execute(
+            file_extensions=["py"], root_directory=str(tmp_path), output_format="tree"
+        )
+
+        assert result == {
+            "files_tree": "pkg/\n  a.py\n  b.py\nmain.py",
+            "files_count": 3,
+        }
+
+    @pytest.mark.parametrize("backend", ["index", "walk"])
+    def test_execute_include_metadata(self, tmp_path, backend):
+        """Test that include_metadata describes every listed file"""
+        (tmp_path / "main.py").write_text("print(1)\n")
+        (tmp_path / "package-lock.json").write_text("{}\n")
+
+        result = GetFilesListFunction.execute(
+            file_extensions=["py", "json"],
+            root_directory=str(tmp_path),
+            backend=backend,
+            include_metadata=True,
+        )
+
+        assert result["files_list"] == ["main.py", "package-lock.json"]
+        assert result["files_metadata"]["main.py"]["size"] == 9
+        assert result["files_metadata"]["main.py"]["lines"] == 1
+        assert result["files_metadata"]["package-lock.json"]["generated"] is True
+
+    def test_execute_metadata_sees_in_place_edits(self, tmp_path):
+        """Test that metadata follows an edit that keeps the directory mtime"""
+        path = tmp_path / "main.py"
+        path.write_text("a\n")
+        kwargs = dict(
+            file_extensions=["py"],
+            root_directory=str(tmp_path),
+            backend="index",
+            include_metadata=True,
+        )
+        assert (
+            GetFilesListFunction.execute(**kwargs)["files_metadata"]["main.py"]["lines"]
+            == 1
+        )
+
+        directory_mtime = os.stat(tmp_path).st_mtime_ns
+        path.write_text("a\nb\nc\n")
+        os.utime(tmp_path, ns=(directory_mtime, directory_mtime))
+
+        metadata = GetFilesListFunction.execute(**kwargs)["files_metadata"]["main.py"]
+        assert metadata["size"] == 6
+        assert metadata["lines"] == 3
+
+    def test_execute_git_backend_honours_gitignore(self, tmp_path):
+        """Test that the git backend uses .gitignore instead of default excludes"""
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        (tmp_path / ".gitignore").write_text("ignored/\n")
+        for path in ["main.py", "ignored/skip.py", "vendor/lib.py"]:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text("")
+
+        result = GetFilesListFunction.execute(
+            file_extensions=["py"], root_directory=str(tmp_path), backend="git"
+        )
+
+        assert result["files_list"] == ["main.py", "vendor/lib.py"]
+
+    def test_execute_git_backend_falls_back_outside_repository(self, tmp_path):
+        """Test the fallback to the walker when not in a git repository"""
+        (tmp_path / "main.py").write_text("")
+        (tmp_path / "vendor").mkdir()
+        (tmp_path / "vendor" / "lib.py").write_text("")
+
+        with (
+            patch(
+                "src.agent.function.get_files_list.list_git_files", return_value=None
+            ),
+            patch("src.agent.function.get_files_list.get_file_index") as index,
+        ):
+            result = GetFilesListFunction.execute(
+                file_extensions=["py"], root_directory=str(tmp_path), backend="git"
+            )
+
+        assert result["files_list"] == ["main.py"]
+        index.assert_not_called()
+
+    def test_execute_auto_backend_uses_file_index(self, tmp_path):
+        """Test that the default backend keeps using the file index in git checkouts"""
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        (tmp_path / ".gitignore").write_text("ignored/\n")
+        for path in ["main.py", "ignored/keep.py"]:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text("")
+
+        with patch("src.agent.function.get_files_list.list_git_files") as git_files:
+            result = GetFilesListFunction.execute(
+                file_extensions=["py"], root_directory=str(tmp_path)
+            )
+
+        assert result["files_list"] == ["ignored/keep.py", "main.py"]
+        git_files.assert_not_called()
+
+    @pytest.mark.parametrize("backend", ["git", "index", "walk"])
+    def test_execute_pages_with_cursor(self, tmp_path, backend):
+        """Test that pages are sorted, stable and resumable with next_cursor"""
+        if backend == "git":
+            subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        paths = ["a.py", "a/x.py", "a0.py", "b/c/d.py", "b/e.py", "z.py"]
+        for path in paths:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text("")
+
+        pages = []
+        cursor = None
+        while True:
+            result = GetFilesListFunction.execute(
+                file_extensions=["py"],
+                root_directory=str(tmp_path),
+                max_files=4,
+                backend=backend,
+                cursor=cursor,
+            )
+            pages.append(result["files_list"])
+            cursor = result.get("next_cursor")
+            if cursor is None:
+                break
+
+        assert pages == [sorted(paths)[:4], sorted(paths)[4:]]
+
+    def test_execute_concurrently_without_changing_cwd(self, tmp_path):
+        """Test that concurrent listings are independent and keep the cwd"""
+        roots = []
+        for i in range(4):
+            root = tmp_path / f"project{i}"
+            (root / "pkg").mkdir(parents=True)
+            for j in range(i + 1):
+                (root / "pkg" / f"mod{j}.py").write_text("")
+            roots.append(root)
+        original_cwd = os.getcwd()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(
+                    lambda root: GetFilesListFunction.execute(
+                        file_extensions=["py"], root_directory=str(root)
+                    ),
+                    roots * 4,
+                )
+            )
+
+        assert os.getcwd() == original_cwd
+        for i, result in enumerate(results):
+            assert len(result["files_list"]) == i % 4 + 1
+
+    def test_aexecute(self, tmp_path):
+        """Test the async variant"""
+        (tmp_path / "a.py").write_text("")
+        (tmp_path / "b.py").write_text("")
+
+        async def run():
+            return await asyncio.gather(
+                GetFilesListFunction.aexecute(
+                    file_extensions=["py"], root_directory=str(tmp_path)
+                ),
+                GetFilesListFunction.aexecute(
+                    file_extensions=["py"], root_directory=str(tmp_path)
+                ),
+            )
+
+        first, second = asyncio.run(run())
+        assert first["files_list"] == second["files_list"] == ["a.py", "b.py"]
+
     def test_get_extensions_for_language(self):
         """Test for getting extensions for language"""
         # Python
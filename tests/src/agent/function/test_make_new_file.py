@@ -3,10 +3,11 @@ Unit tests for MakeNewFileFunction
 """
 
 import unittest
-from unittest.mock import mock_open, patch
+from unittest.mock import patch
 
 from src.agent.function.make_new_file import MakeNewFileFunction
 from src.agent.schema.make_new_file_input import MakeNewFileInput
+from src.infrastructure.utils.write_set import LineDelta
 
 
 class TestMakeNewFileFunction(unittest.TestCase):
@@ -14,13 +15,14 @@ class TestMakeNewFileFunction(unittest.TestCase):
 
     @patch("src.agent.function.make_new_file.os.path.exists")
     @patch("src.agent.function.make_new_file.os.makedirs")
-    @patch("src.agent.function.make_new_file.open", new_callable=mock_open)
+    @patch("src.agent.function.make_new_file.write_text")
     def test_execute_with_existing_directory(
-        self, mock_file, mock_makedirs, mock_exists
+        self, mock_write_text, mock_makedirs, mock_exists
     ):
         """Test creating a file in an existing directory"""
         # Mock setup
         mock_exists.return_value = True
+        mock_write_text.return_value = LineDelta(True, 1, 0, 1)
 
         # Execute test
         filepath = "existing_dir/test_file.txt"
@@ -32,17 +34,19 @@ class TestMakeNewFileFunction(unittest.TestCase):
         # Verification
         mock_exists.assert_called_once_with("existing_dir")
         mock_makedirs.assert_not_called()  # Directory already exists, so not created
-        mock_file.assert_called_once_with(filepath, "w", encoding="utf-8")
-        mock_file().write.assert_called_once_with(file_contents)
-        self.assertEqual(result, {"result": "success"})
+        mock_write_text.assert_called_once_with(filepath, file_contents)
+        self.assertEqual(result, {"result": "success", "changes": "created, 1 line"})
 
     @patch("src.agent.function.make_new_file.os.path.exists")
     @patch("src.agent.function.make_new_file.os.makedirs")
-    @patch("src.agent.function.make_new_file.open", new_callable=mock_open)
-    def test_execute_with_new_directory(self, mock_file, mock_makedirs, mock_exists):
+    @patch("src.agent.function.make_new_file.write_text")
+    def test_execute_with_new_directory(
+        self, mock_write_text, mock_makedirs, mock_exists
+    ):
         """Test creating a file in a new directory"""
         # Mock setup
         mock_exists.return_value = False
+        mock_write_text.return_value = LineDelta(True, 1, 0, 1)
 
         # Execute test
         filepath = "new_dir/test_file.txt"
@@ -54,9 +58,8 @@ class TestMakeNewFileFunction(unittest.TestCase):
         # Verification
         mock_exists.assert_called_once_with("new_dir")
         mock_makedirs.assert_called_once_with("new_dir", exist_ok=True)
-        mock_file.assert_called_once_with(filepath, "w", encoding="utf-8")
-        mock_file().write.assert_called_once_with(file_contents)
-        self.assertEqual(result, {"result": "success"})
+        mock_write_text.assert_called_once_with(filepath, file_contents)
+        self.assertEqual(result, {"result": "success", "changes": "created, 1 line"})
 
     @patch("src.agent.function.make_new_file.StructuredTool.from_function")
     def test_to_tool(self, mock_from_function):
@@ -73,7 +76,9 @@ class TestMakeNewFileFunction(unittest.TestCase):
         # Verification
         mock_from_function.assert_called_once_with(
             name="make_new_file",
-            description="Creates a new file and writes the specified content to it.",
+            description="Creates a new file and writes the specified content to it. "
+            "For large files, write the first part and add the rest "
+            "with mode='append'.",
             func=MakeNewFileFunction.execute,
             args_schema=MakeNewFileInput,
         )
@@ -93,7 +98,7 @@ def test_execute_with_real_filesystem(tmp_path):
     )
 
     # Verification
-    assert result == {"result": "success"}
+    assert result == {"result": "success", "changes": "created, 1 line"}
     assert test_dir.exists()  # Check if directory was created
     assert test_file.exists()  # Check if file was created
     assert (
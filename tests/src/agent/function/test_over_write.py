@@ -2,28 +2,34 @@
 Unit tests for OverwriteFileFunction
 """
 
+import os
 import unittest
-from unittest.mock import mock_open, patch
+from unittest.mock import patch
 
 from src.agent.function.over_write_file import OverwriteFileFunction
 from src.agent.schema.over_write_input import OverwriteFileInput
+from src.infrastructure.utils.write_set import LineDelta
 
 
 class TestOverwriteFileFunction(unittest.TestCase):
     """Test class for OverwriteFileFunction"""
 
-    @patch("src.agent.function.over_write_file.open", new_callable=mock_open)
-    def test_execute(self, mock_file):
+    @patch("src.agent.function.over_write_file.write_text")
+    def test_execute(self, mock_write_text):
         """Test for overwriting a file"""
+        # Mock setup
+        mock_write_text.return_value = LineDelta(False, 1, 1, 1)
+
         # Execute test
         filepath = "test_dir/test_file.txt"
         new_text = "New test content"
         result = OverwriteFileFunction.execute(filepath=filepath, new_text=new_text)
 
         # Verify
-        mock_file.assert_called_once_with(filepath, "w", encoding="utf-8")
-        mock_file().write.assert_called_once_with(new_text)
-        self.assertEqual(result, {"result": "success"})
+        mock_write_text.assert_called_once_with(filepath, new_text)
+        self.assertEqual(
+            result, {"result": "success", "changes": "+1 -1 lines, 1 line total"}
+        )
 
     @patch("src.agent.function.over_write_file.StructuredTool.from_function")
     def test_to_tool(self, mock_from_function):
@@ -40,7 +46,8 @@ class TestOverwriteFileFunction(unittest.TestCase):
         # Verify
         mock_from_function.assert_called_once_with(
             name="overwrite_file",
-            description="Overwrites the specified file with new content.",
+            description="Overwrites the specified file with new content. "
+            "With mode='append' the content is added to the end of the file instead.",
             func=OverwriteFileFunction.execute,
             args_schema=OverwriteFileInput,
         )
@@ -65,7 +72,7 @@ def test_execute_with_real_filesystem(tmp_path):
     )
 
     # Verify
-    assert result == {"result": "success"}
+    assert result == {"result": "success", "changes": "+1 -1 lines, 1 line total"}
     assert test_file.exists()  # Check if file exists
     assert (
         test_file.read_text(encoding="utf-8") == new_content
@@ -77,3 +84,42 @@ def test_execute_with_real_filesystem(tmp_path):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+def test_execute_unchanged_content_is_not_written(tmp_path):
+    """Test that identical content leaves the file and its mtime untouched"""
+    test_file = tmp_path / "test_file.txt"
+    test_file.write_text("line 1\nline 2\n", encoding="utf-8")
+    os.utime(test_file, ns=(1, 1))
+
+    result = OverwriteFileFunction.execute(
+        filepath=str(test_file), new_text="line 1\nline 2\n"
+    )
+
+    assert result["result"] == "unchanged"
+    assert test_file.stat().st_mtime_ns == 1
+
+
+def test_execute_returns_line_delta(tmp_path):
+    """Test the line-delta summary of a changed file"""
+    test_file = tmp_path / "test_file.txt"
+    test_file.write_text("a\nb\nc\nd\n", encoding="utf-8")
+
+    result = OverwriteFileFunction.execute(
+        filepath=str(test_file), new_text="a\nB\nB2\nc\n"
+    )
+
+    assert result == {"result": "success", "changes": "+2 -2 lines, 4 lines total"}
+
+
+def test_execute_append_mode(tmp_path):
+    """Test writing a file in chunks with mode='append'"""
+    test_file = tmp_path / "test_file.txt"
+
+    OverwriteFileFunction.execute(filepath=str(test_file), new_text="part 1\n")
+    result = OverwriteFileFunction.execute(
+        filepath=str(test_file), new_text="part 2\n", mode="append"
+    )
+
+    assert result == {"result": "success", "changes": "+1 -0 lines, 2 lines total"}
+    assert test_file.read_text(encoding="utf-8") == "part 1\npart 2\n"
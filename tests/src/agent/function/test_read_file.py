@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import mock_open, patch
 
@@ -41,6 +43,40 @@ class TestReadFileFunction(unittest.TestCase):
             self.assertEqual(result["filepath"], filepath)
             self.assertEqual(result["error"], "File not found.")
 
+    def test_execute_line_range(self):
+        """Test reading a range of lines"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, "module.py")
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write("".join(f"line {i}\n" for i in range(1, 11)))
+
+            result = ReadFileFunction.execute(filepath, start_line=3, end_line=4)
+            self.assertEqual(result["file_contents"], "line 3\nline 4\n")
+            self.assertEqual(result["total_lines"], 10)
+
+            # The range is clamped to the file
+            result = ReadFileFunction.execute(filepath, start_line=9, end_line=50)
+            self.assertEqual(result["file_contents"], "line 9\nline 10\n")
+            self.assertEqual(result["end_line"], 10)
+
+    def test_execute_outline(self):
+        """Test the outline mode"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, "module.py")
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write(
+                    'class A:\n    """Doc."""\n\n    def run(self):\n        return 1\n'
+                )
+
+            result = ReadFileFunction.execute(filepath, outline=True)
+
+            self.assertEqual(
+                result["outline"],
+                '1: class A:\n2:     """Doc."""\n4:     def run(self):',
+            )
+            self.assertEqual(result["total_lines"], 5)
+            self.assertNotIn("file_contents", result)
+
     def test_to_tool(self):
         """Check that to_tool function returns StructuredTool correctly"""
         tool = ReadFileFunction.to_tool()
@@ -0,0 +1,80 @@
+"""
+Unit test for ReadFilesFunction
+"""
+
+from src.agent.function.read_files import ReadFilesFunction
+from src.agent.schema.read_files_input import ReadFilesInput
+
+
+class TestReadFilesFunction:
+    def test_execute(self, tmp_path):
+        """Test that files and ranges are returned in request order"""
+        (tmp_path / "a.py").write_text("a1\na2\n")
+        (tmp_path / "b.py").write_text("b1\nb2\nb3\n")
+
+        result = ReadFilesFunction.execute(
+            [
+                str(tmp_path / "a.py"),
+                {"filepath": str(tmp_path / "b.py"), "start_line": 2, "end_line": 3},
+                str(tmp_path / "missing.py"),
+            ]
+        )
+
+        contents = [file.get("file_contents") for file in result["files"]]
+        assert contents == ["a1\na2\n", "b2\nb3\n", None]
+        assert result["files"][2]["error"] == "File not found."
+
+    def test_execute_keeps_other_files_when_one_fails(self, tmp_path):
+        """Test that binary, missing and directory entries only fail themselves"""
+        (tmp_path / "a.txt").write_text("text\n")
+        (tmp_path / "b.bin").write_bytes(b"\xff\xfe\x00\x81")
+        (tmp_path / "pkg").mkdir()
+
+        result = ReadFilesFunction.execute(
+            [
+                str(tmp_path / "b.bin"),
+                str(tmp_path / "missing.txt"),
+                str(tmp_path / "pkg"),
+                str(tmp_path / "a.txt"),
+            ]
+        )
+
+        binary, missing, directory, text = result["files"]
+        assert binary == {
+            "filepath": str(tmp_path / "b.bin"),
+            "error": "File is not UTF-8 text (binary?).",
+        }
+        assert missing["error"] == "File not found."
+        assert directory == {
+            "filepath": str(tmp_path / "pkg"),
+            "error": "Path is a directory.",
+        }
+        assert text["file_contents"] == "text\n"
+
+    def test_execute_truncates_largest_files_to_budget(self, tmp_path):
+        """Test that small files stay whole and large files get a marker"""
+        (tmp_path / "small.py").write_text("x = 1\n")
+        (tmp_path / "large.py").write_text(
+            "".join(f"line_{i:03}\n" for i in range(200))
+        )
+
+        result = ReadFilesFunction.execute(
+            [str(tmp_path / "small.py"), str(tmp_path / "large.py")], max_tokens=25
+        )
+
+        small, large = result["files"]
+        assert small["file_contents"] == "x = 1\n"
+        assert "truncated" not in small
+        assert large["truncated"] is True
+        assert large["file_contents"].startswith("line_000\n")
+        assert large["file_contents"].endswith(
+            "[truncated: 190 more lines, read them with start_line=11]"
+        )
+        assert result["total_tokens"] <= 25 + 15  # budget plus the marker
+
+    def test_to_tool(self):
+        """Test that the tool is built with the input schema"""
+        tool = ReadFilesFunction.to_tool()
+
+        assert tool.name == "read_files_function"
+        assert tool.args_schema == ReadFilesInput
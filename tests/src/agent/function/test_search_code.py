@@ -0,0 +1,139 @@
+"""
+Unit test for SearchCodeFunction
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.agent.function.search_code import SearchCodeFunction
+from src.agent.schema.search_code_input import SearchCodeInput
+from src.infrastructure.utils.code_search import search_file
+
+
+@pytest.fixture
+def project(tmp_path):
+    files = {
+        "src/app.py": "import os\n\n\ndef main():\n    return os.getcwd()\n",
+        "src/util.py": "def helper():\n    pass\n",
+        "node_modules/pkg/index.js": "function main() {}\n",
+        "image.bin": "main\0\0\0",
+    }
+    for path, content in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    return tmp_path
+
+
+class TestSearchCodeFunction:
+    def test_execute_literal(self, project):
+        """Test literal search with context lines, skipping excluded and binary files"""
+        result = SearchCodeFunction.execute(
+            pattern="def main",
+            root_directory=str(project),
+            context_lines=1,
+            backend="index",
+        )
+
+        assert result["match_count"] == 1
+        assert result["matches"] == "\n".join(
+            [
+                "src/app.py-3- ",
+                "src/app.py:4: def main():",
+                "src/app.py-5-     return os.getcwd()",
+            ]
+        )
+
+    def test_execute_regex_and_case(self, project):
+        """Test regular expressions and case-insensitive search"""
+        result = SearchCodeFunction.execute(
+            pattern=r"^def \w+",
+            is_regex=True,
+            root_directory=str(project),
+            file_extensions=["py"],
+            context_lines=0,
+        )
+        assert (
+            result["matches"]
+            == "src/app.py:4: def main():\n--\nsrc/util.py:1: def helper():"
+        )
+
+        result = SearchCodeFunction.execute(
+            pattern="IMPORT OS",
+            case_sensitive=False,
+            root_directory=str(project),
+            context_lines=0,
+        )
+        assert result["matches"] == "src/app.py:1: import os"
+
+    def test_execute_merges_overlapping_context(self, tmp_path):
+        """Test that adjacent matches share their context lines"""
+        (tmp_path / "a.py").write_text("x = 1\nx = 2\ny = 3\n")
+
+        result = SearchCodeFunction.execute(
+            pattern="x =", root_directory=str(tmp_path), context_lines=1, backend="walk"
+        )
+
+        assert result["matches"] == "a.py:1: x = 1\na.py:2: x = 2\na.py-3- y = 3"
+
+    def test_execute_max_matches(self, tmp_path):
+        """Test that the number of matches is capped"""
+        for i in range(10):
+            (tmp_path / f"m{i}.py").write_text("needle\nneedle\n")
+
+        result = SearchCodeFunction.execute(
+            pattern="needle",
+            root_directory=str(tmp_path),
+            context_lines=0,
+            max_matches=5,
+        )
+
+        assert result["match_count"] == 5
+        assert len(result["matches"].splitlines()) == 7  # 5 matches and 2 separators
+        assert "warning" in result
+
+    def test_execute_invalid_regex(self, tmp_path):
+        """Test that invalid regular expressions are reported"""
+        result = SearchCodeFunction.execute(
+            pattern="(", is_regex=True, root_directory=str(tmp_path)
+        )
+
+        assert "Invalid regular expression" in result["error"]
+
+    def test_execute_with_trigram_index(self, project):
+        """Test that the trigram index narrows the scan without changing results"""
+        with (
+            patch(
+                "src.agent.function.search_code.agent_settings.SEARCH_TRIGRAM_INDEX",
+                True,
+            ),
+            patch(
+                "src.infrastructure.utils.code_search.search_file", wraps=search_file
+            ) as mock_search_file,
+        ):
+            result = SearchCodeFunction.execute(
+                pattern=r"def\s+helper", is_regex=True, root_directory=str(project)
+            )
+
+        assert (
+            result["matches"] == "src/util.py:1: def helper():\nsrc/util.py-2-     pass"
+        )
+        assert [call.args[1] for call in mock_search_file.call_args_list] == [
+            "src/util.py"
+        ]
+
+    def test_aexecute(self, project):
+        """Test the async variant"""
+        result = asyncio.run(
+            SearchCodeFunction.aexecute(pattern="helper", root_directory=str(project))
+        )
+
+        assert result["match_count"] == 1
+
+    def test_to_tool(self):
+        """Test that the tool is built with the input schema"""
+        tool = SearchCodeFunction.to_tool()
+
+        assert tool.name == "search_code_function"
+        assert tool.args_schema == SearchCodeInput
@@ -0,0 +1,309 @@
+"""
+Unit tests for DiffEngine
+"""
+
+import io
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from src.application.client.diff_engine import (
+    DiffEngine,
+    DiffPage,
+    paginate_diff,
+    parse_status,
+    parse_unified_diff,
+    write_untracked_diff,
+)
+
+
+def _git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def _git_output(repo, *args):
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _loose_objects(repo):
+    objects = repo / ".git" / "objects"
+    return {
+        directory.name + path.name
+        for directory in objects.iterdir()
+        if len(directory.name) == 2
+        for path in directory.iterdir()
+    }
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "test")
+    (tmp_path / "tracked.py").write_text("x = 1\n")
+    (tmp_path / "staged.py").write_text("y = 1\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    return tmp_path
+
+
+def test_diff_combines_tracked_staged_and_untracked(repo):
+    """Test that untracked files are included even when tracked files changed"""
+    (repo / "tracked.py").write_text("x = 2\n")
+    (repo / "staged.py").write_text("y = 2\n")
+    _git(repo, "add", "staged.py")
+    (repo / "new.py").write_text("z = 1\n")
+
+    result = DiffEngine(str(repo)).diff()
+
+    assert result.branch == "main"
+    assert result.staged_files == ["staged.py"]
+    assert result.modified_files == ["tracked.py"]
+    assert result.untracked_files == ["new.py"]
+    assert "+x = 2" in result.diff
+    assert "+y = 2" in result.diff
+    assert "+++ b/new.py\n@@ -0,0 +1,1 @@\n+z = 1" in result.diff
+
+
+def test_diff_is_memoised_until_the_tree_changes(repo):
+    """Test that git diff only runs again after a change"""
+    engine = DiffEngine(str(repo))
+    (repo / "tracked.py").write_text("x = 2\n")
+    first = engine.diff()
+
+    with patch.object(engine.git, "run", wraps=engine.git.run) as mock_run:
+        assert engine.diff() is first
+        assert [call.args[0] for call in mock_run.call_args_list] == ["status"]
+
+        (repo / "tracked.py").write_text("x = 3\n")
+        assert "+x = 3" in engine.diff().diff
+
+
+def test_diff_on_clean_tree(repo):
+    """Test that a clean tree gives an empty diff"""
+    result = DiffEngine(str(repo)).diff()
+
+    assert result.diff == ""
+    assert result.untracked_files == []
+
+
+def test_parse_status_renames_and_paths_with_spaces():
+    """Test parsing of rename records and file names containing spaces"""
+    output = (
+        b"# branch.oid abc\0# branch.head feature/x\0"
+        b"2 R. N... 100644 100644 100644 h1 h2 R100 new name.py\0old name.py\0"
+        b"? untracked file.txt\0"
+    )
+
+    head, branch, entries = parse_status(output)
+
+    assert (head, branch) == ("abc", "feature/x")
+    assert [(e.path, e.staged, e.untracked) for e in entries] == [
+        ("new name.py", True, False),
+        ("untracked file.txt", False, True),
+    ]
+
+
+def test_write_untracked_diff_caps_and_binary_files(tmp_path):
+    """Test per-file and total caps, truncation markers and binary sniffing"""
+    (tmp_path / "big.log").write_text("".join(f"line {i}\n" for i in range(10000)))
+    (tmp_path / "image.png").write_bytes(b"\x89PNG\0\0" + b"x" * 100)
+    (tmp_path / "small.py").write_text("a = 1\nb = 2\n")
+    (tmp_path / "late.py").write_text("c = 3\n")
+    out = io.StringIO()
+
+    write_untracked_diff(
+        out,
+        str(tmp_path),
+        ["small.py", "image.png", "big.log", "late.py"],
+        max_file_bytes=100,
+        max_total_bytes=110,
+    )
+    diff = out.getvalue()
+
+    assert "+++ b/small.py\n@@ -0,0 +1,2 @@\n+a = 1\n+b = 2\n" in diff
+    assert "Binary file image.png added" in diff
+    assert "+line 0\n" in diff
+    assert "more bytes of big.log not shown]" in diff
+    assert "[truncated: 1 more untracked files not shown: late.py]" in diff
+    assert "c = 3" not in diff
+
+
+def test_snapshot_tree_diff_contains_only_new_changes(repo):
+    """Test that the diff between snapshots skips already snapshotted changes"""
+    engine = DiffEngine(str(repo))
+    (repo / "tracked.py").write_text("x = 2\n")
+    (repo / "new.py").write_text("z = 1\n")
+    first = engine.snapshot_tree()
+
+    (repo / "staged.py").write_text("y = 2\n")
+    second = engine.snapshot_tree()
+    diff = engine.diff_trees(first, second)
+
+    assert "+y = 2" in diff
+    assert "tracked.py" not in diff
+    assert "new.py" not in diff
+    assert engine.diff_trees(second, engine.snapshot_tree()) == ""
+    # The real index is untouched
+    assert engine.diff().staged_files == []
+
+
+def test_snapshot_tree_leaves_out_large_and_binary_untracked_files(repo):
+    """Test that artifacts are not hashed into the object store and are named instead"""
+    engine = DiffEngine(str(repo), max_file_bytes=100, max_total_bytes=1000)
+    first = engine.snapshot_tree()
+    (repo / "app.log").write_text("line\n" * 100)
+    (repo / "image.png").write_bytes(b"\x89PNG\0\0")
+    (repo / "new.py").write_text("z = 1\n")
+    objects_before = _loose_objects(repo)
+
+    second = engine.snapshot_tree()
+    diff = engine.diff_trees(first, second)
+
+    assert "+z = 1" in diff
+    assert "app.log" not in diff.split("[not shown")[0]
+    assert diff.endswith(
+        "[not shown: 2 untracked files that are binary "
+        "or over the size limits: app.log, image.png]\n"
+    )
+    written = _loose_objects(repo) - objects_before
+    assert _git_output(repo, "hash-object", "app.log") not in written
+    assert _git_output(repo, "hash-object", "image.png") not in written
+
+
+def test_diff_trees_takes_shaping_options(repo):
+    """Test context, whitespace and generated-file options of the incremental diff"""
+    engine = DiffEngine(str(repo))
+    (repo / "tracked.py").write_text("".join(f"v{i} = {i}\n" for i in range(10)))
+    first = engine.snapshot_tree()
+    (repo / "tracked.py").write_text(
+        "".join(f"v{i} = {i}\n" for i in range(5))
+        + "v5 = 50\n"
+        + "".join(f"v{i}  =  {i}\n" for i in range(6, 10))
+    )
+    (repo / "poetry.lock").write_text("lock\n")
+    second = engine.snapshot_tree()
+
+    diff = engine.diff_trees(
+        first, second, context_lines=0, ignore_whitespace=True, exclude_generated=True
+    )
+
+    assert "+v5 = 50" in diff
+    assert "\n v4 = 4\n" not in diff
+    assert "v6  =  6" not in diff
+    assert "poetry.lock" not in diff
+    assert "poetry.lock" in engine.diff_trees(first, second)
+
+
+def test_snapshot_parses_files_and_hunks(repo):
+    """Test the parsed snapshot and that it is shared while the tree is unchanged"""
+    engine = DiffEngine(str(repo))
+    (repo / "tracked.py").write_text("x = 2\nw = 0\n")
+    (repo / "staged.py").unlink()
+    (repo / "new.py").write_text("z = 1\n")
+
+    snapshot = engine.snapshot()
+
+    files = {file.path: file for file in snapshot.files}
+    assert (
+        files["tracked.py"].status,
+        files["tracked.py"].added,
+        files["tracked.py"].removed,
+    ) == (
+        "modified",
+        2,
+        1,
+    )
+    assert files["tracked.py"].hunks[0].header == "@@ -1 +1,2 @@"
+    assert (files["staged.py"].status, files["staged.py"].removed) == ("deleted", 1)
+    assert (files["new.py"].status, files["new.py"].added) == ("added", 1)
+    assert snapshot.summary() == "3 files changed, +3 -2"
+    assert engine.snapshot() is snapshot
+
+    (repo / "new.py").write_text("z = 2\n")
+    assert engine.snapshot().fingerprint != snapshot.fingerprint
+
+
+def test_parse_unified_diff_hunk_lines_that_look_like_headers():
+    """Test that removed/added lines starting with ---/+++ are counted as body lines"""
+    diff = (
+        "diff --git a/notes.md b/notes.md\n"
+        "--- a/notes.md\n"
+        "+++ b/notes.md\n"
+        "@@ -1,2 +1,2 @@\n"
+        "--- old rule\n"
+        "+++ new rule\n"
+        " keep\n"
+    )
+
+    (file,) = parse_unified_diff(diff)
+
+    assert (file.path, file.added, file.removed) == ("notes.md", 1, 1)
+
+
+def test_diff_shaping_options(repo):
+    """Test context lines, whitespace and generated-file exclusion"""
+    (repo / "tracked.py").write_text("".join(f"v{i} = {i}\n" for i in range(10)))
+    (repo / "staged.py").write_text("y  =  1\n")
+    _git(repo, "commit", "-q", "-am", "more lines")
+    (repo / "tracked.py").write_text(
+        "".join(f"v{i} = {i * 2 if i == 5 else i}\n" for i in range(10))
+    )
+    (repo / "staged.py").write_text("y = 1\n")
+    (repo / "poetry.lock").write_text("[[package]]\n")
+    engine = DiffEngine(str(repo))
+
+    shaped = engine.diff(
+        context_lines=1, ignore_whitespace=True, exclude_generated=True
+    )
+
+    assert " v4 = 4\n-v5 = 5\n+v5 = 10\n v6 = 6\n" in shaped.diff
+    assert "\n v3 = 3\n" not in shaped.diff
+    assert "staged.py" not in shaped.diff
+    assert "poetry.lock" not in shaped.diff
+    assert shaped.excluded_files == ["poetry.lock"]
+    assert "poetry.lock" in engine.diff().diff
+
+
+def test_paginate_diff_keeps_files_whole():
+    """Test per-file pages under a token budget and truncation of oversized files"""
+    sections = [
+        f"diff --git a/f{i}.py b/f{i}.py\n--- a/f{i}.py\n+++ b/f{i}.py\n"
+        f"@@ -1 +1 @@\n-a\n+{'b' * 100}\n"
+        for i in range(3)
+    ]
+    big = (
+        "diff --git a/big.py b/big.py\n--- a/big.py\n+++ b/big.py\n@@ -0,0 +1,500 @@\n"
+        + "+x = 1\n" * 500
+    )
+
+    pages = paginate_diff("".join(sections) + big, token_budget=90)
+
+    assert [page.paths for page in pages] == [["f0.py", "f1.py"], ["f2.py"], ["big.py"]]
+    assert pages[0].text == sections[0] + sections[1]
+    assert (
+        "more lines of big.py; request it alone with file_path='big.py'"
+        in pages[2].text
+    )
+    assert len(pages[2].text) <= 90 * 4
+    assert paginate_diff("", token_budget=90) == [DiffPage("", [])]
+
+
+def test_exclude_generated_reads_deleted_files_from_head(repo):
+    """Test that a deleted generated file is recognised from its committed version"""
+    (repo / "schema.py").write_text("# @generated by protoc\nX = 1\n")
+    (repo / "handwritten.py").write_text("Y = 1\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "add files")
+    (repo / "schema.py").unlink()
+    (repo / "handwritten.py").unlink()
+    engine = DiffEngine(str(repo))
+
+    result = engine.diff(exclude_generated=True)
+
+    assert result.excluded_files == ["schema.py"]
+    assert "handwritten.py" in result.diff
+    assert engine.git.stats()["cat-file"]["calls"] == 2
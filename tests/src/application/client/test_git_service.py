@@ -0,0 +1,101 @@
+"""
+Unit tests for GitService
+"""
+
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from git import Git
+
+from src.application.client.git_service import GitService, list_git_files
+
+
+def _git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "test")
+    (tmp_path / "app.py").write_text("x = 1\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    return tmp_path
+
+
+def test_branches_checkout_add_and_commit(repo):
+    """Test the branch, status, add and commit operations"""
+    service = GitService(str(repo))
+
+    assert service.current_branch() == "main"
+    service.checkout("feature/x", create=True)
+    assert service.current_branch() == "feature/x"
+    assert sorted(service.branches()) == ["feature/x", "main"]
+
+    (repo / "app.py").write_text("x = 2\n")
+    assert service.status("--porcelain") == b" M app.py\n"
+    service.add("app.py")
+    assert "1 file changed" in service.commit("Change x")
+    assert service.read_blob("HEAD", "app.py") == b"x = 2\n"
+    assert service.read_blob("HEAD", "missing.py") is None
+    assert service.object_info("HEAD")[1] == "commit"
+
+
+def test_commit_paths_in_process(repo):
+    """Test that commit_paths commits changes and deletions without new git processes"""
+    (repo / "app.py").unlink()
+    (repo / "pkg").mkdir()
+    (repo / "pkg" / "new.py").write_text("y = 1\n")
+    service = GitService(str(repo / "pkg"))
+    # Starts the long-lived cat-file processes GitPython reads objects with
+    service.repo.head.commit.tree
+
+    with patch.object(
+        Git, "execute", autospec=True, side_effect=Git.execute
+    ) as execute:
+        sha = service.commit_paths(["new.py", "../app.py"], "Move app")
+
+    execute.assert_not_called()
+    assert service.repo.head.commit.hexsha == sha
+    assert service.read_blob("HEAD", "pkg/new.py") == b"y = 1\n"
+    assert service.read_blob("HEAD", "app.py") is None
+    assert service.stats()["index-commit"]["calls"] == 1
+
+
+def test_errors_and_latency_counters(repo):
+    """Test that failures raise CalledProcessError and operations are counted"""
+    service = GitService(str(repo))
+
+    with pytest.raises(subprocess.CalledProcessError):
+        service.checkout("does-not-exist")
+    service.diff("HEAD")
+    service.diff("HEAD")
+
+    stats = service.stats()
+    assert stats["diff"]["calls"] == 2
+    assert stats["checkout"]["calls"] == 1
+    service.reset_stats()
+    assert service.stats() == {}
+
+
+def test_not_a_repository(tmp_path):
+    """Test that a directory outside git raises CalledProcessError"""
+    with pytest.raises(subprocess.CalledProcessError):
+        GitService(str(tmp_path)).current_branch()
+    assert list_git_files(str(tmp_path)) is None
+
+
+def test_list_files_honours_gitignore(repo):
+    """Test listing tracked and untracked files relative to a subdirectory"""
+    (repo / ".gitignore").write_text("*.log\n")
+    (repo / "pkg").mkdir()
+    (repo / "pkg" / "mod.py").write_text("")
+    (repo / "pkg" / "debug.log").write_text("")
+    service = GitService(str(repo / "pkg"))
+
+    assert service.list_files() == ["mod.py"]
+    assert service.stats()["ls-files"]["calls"] == 1
@@ -0,0 +1,122 @@
+"""
+Unit tests for PytestWorker
+"""
+
+import sys
+
+import pytest
+
+from src.application.client import pytest_worker
+from src.application.client.pytest_worker import PytestWorker, PytestWorkerError
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "calc.py").write_text("def add(a, b):\n    return a + b\n")
+    (tmp_path / "test_calc.py").write_text(
+        "from calc import add\n\n\ndef test_add():\n    assert add(1, 2) == 3\n"
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def worker(project):
+    worker = PytestWorker(str(project), python=sys.executable)
+    yield worker
+    worker.close()
+
+
+def test_run_sees_edits_between_runs(project, worker):
+    """Test that each run reloads the project's modules"""
+    result = worker.run(["test_calc.py"])
+    assert result["exit_status"] == "0"
+    assert "1 passed" in result["stdout"]
+
+    (project / "calc.py").write_text("def add(a, b):\n    return a - b\n")
+    result = worker.run(["test_calc.py"])
+    assert result["exit_status"] == "1"
+    assert "1 failed" in result["stdout"]
+
+    (project / "calc.py").write_text("def add(a, b):\n    return b + a\n")
+    assert worker.run(["test_calc.py"])["exit_status"] == "0"
+
+
+@pytest.fixture
+def namespace_project(tmp_path):
+    """
+    A project laid out like this repository: a namespace src/ holding a
+    package, which holds another namespace package
+    """
+    (tmp_path / "pytest.ini").write_text("[pytest]\npythonpath = .\n")
+    for package in ["src/app", "src/app/core", "tests/src/app"]:
+        (tmp_path / package).mkdir(parents=True)
+    (tmp_path / "src" / "app" / "__init__.py").write_text("")
+    (tmp_path / "src" / "app" / "core" / "calc.py").write_text(
+        "def add(a, b):\n    return a + b\n"
+    )
+    (tmp_path / "tests" / "src" / "app" / "test_calc.py").write_text(
+        "from src.app.core.calc import add\n\n\n"
+        "def test_add():\n    assert add(1, 2) == 3\n"
+    )
+    return tmp_path
+
+
+def test_namespace_packages_are_reloaded(namespace_project):
+    """Test that modules under a namespace package without __init__.py are reloaded"""
+    worker = PytestWorker(str(namespace_project), python=sys.executable)
+    try:
+        result = worker.run(["tests/src/app/test_calc.py"])
+        assert result["exit_status"] == "0", result["stdout"] + result["stderr"]
+        assert "1 passed" in result["stdout"]
+
+        (namespace_project / "src" / "app" / "core" / "calc.py").write_text(
+            "def add(a, b):\n    return a * b\n"
+        )
+        result = worker.run(["tests/src/app/test_calc.py"])
+        assert result["exit_status"] == "1"
+        assert "1 failed" in result["stdout"]
+        assert "PytestAssertRewriteWarning" not in result["stdout"]
+    finally:
+        worker.close()
+
+
+def test_missing_path_reports_usage_error(worker):
+    """Test that pytest's exit status is passed through"""
+    result = worker.run(["does_not_exist.py"])
+    assert result["exit_status"] == "4"
+    assert "does_not_exist.py" in result["stderr"] + result["stdout"]
+
+
+def test_restarts_after_the_zygote_dies(worker):
+    """Test that a dead zygote is replaced on the next run"""
+    worker.start()
+    process = worker._process
+    process.kill()
+    process.wait()
+
+    assert worker.run(["test_calc.py"])["exit_status"] == "0"
+    assert worker._process is not process
+
+
+def test_unavailable_interpreter(project):
+    """Test that a worker that cannot start raises PytestWorkerError"""
+    worker = PytestWorker(str(project), python=str(project / "no-python"))
+    with pytest.raises(PytestWorkerError):
+        worker.run(["test_calc.py"])
+
+
+def test_malformed_response(project, tmp_path_factory, monkeypatch):
+    """Test that a garbled response raises PytestWorkerError and stops the zygote"""
+    zygote = tmp_path_factory.mktemp("zygote") / "zygote.py"
+    zygote.write_text(
+        "import sys\n"
+        "print('{\"ready\": true}', flush=True)\n"
+        "for line in sys.stdin:\n"
+        "    print('not json', flush=True)\n"
+    )
+    monkeypatch.setattr(pytest_worker, "ZYGOTE_PATH", str(zygote))
+    worker = PytestWorker(str(project), python=sys.executable)
+
+    with pytest.raises(PytestWorkerError, match="malformed response"):
+        worker.run(["test_calc.py"])
+    assert worker._process is None
@@ -0,0 +1,37 @@
+"""
+Unit tests for agent_cache
+"""
+
+import os
+import tempfile
+
+from src.infrastructure.utils.agent_cache import agent_cache_dir, find_git_dir
+
+
+def test_cache_dir_is_under_the_git_dir(tmp_path):
+    """Test that a root inside a repository keeps its cache in .git/agent"""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "pkg").mkdir()
+
+    assert find_git_dir(str(tmp_path / "pkg")) == str(tmp_path / ".git")
+    root_dir = agent_cache_dir(str(tmp_path))
+    pkg_dir = agent_cache_dir(str(tmp_path / "pkg"))
+    assert root_dir.startswith(str(tmp_path / ".git" / "agent") + os.sep)
+    assert pkg_dir != root_dir
+
+
+def test_cache_dir_of_a_linked_worktree(tmp_path):
+    """Test that a .git file pointing elsewhere is followed"""
+    (tmp_path / "main" / ".git" / "worktrees" / "wt").mkdir(parents=True)
+    (tmp_path / "wt").mkdir()
+    (tmp_path / "wt" / ".git").write_text("gitdir: ../main/.git/worktrees/wt\n")
+
+    assert find_git_dir(str(tmp_path / "wt")) == str(
+        tmp_path / "main" / ".git" / "worktrees" / "wt"
+    )
+
+
+def test_cache_dir_outside_git(tmp_path):
+    """Test the temporary directory fallback"""
+    assert find_git_dir(str(tmp_path)) is None
+    assert agent_cache_dir(str(tmp_path)).startswith(tempfile.gettempdir())
@@ -0,0 +1,105 @@
+"""
+Unit tests for FileIndex
+"""
+
+import os
+
+from src.infrastructure.utils.agent_cache import agent_cache_dir
+from src.infrastructure.utils.file_events import notify_file_changed
+from src.infrastructure.utils.file_index import FileIndex, get_file_index
+
+
+def _paths(index: FileIndex) -> list:
+    return sorted(entry.path for entry in index.entries())
+
+
+def test_entries_store_size_and_extension(tmp_path):
+    """Test the initial scan"""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("print('hello')\n")
+    (tmp_path / "README.md").write_text("")
+
+    index = FileIndex(str(tmp_path))
+    entries = {entry.path: entry for entry in index.entries()}
+
+    assert sorted(entries) == ["README.md", "src/main.py"]
+    assert entries["src/main.py"].size == 15
+    assert entries["src/main.py"].extension == "py"
+
+
+def test_prune_patterns_skip_directories(tmp_path):
+    """Test that pruned directories are never indexed"""
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "index.js").write_text("")
+    (tmp_path / "app.js").write_text("")
+
+    index = FileIndex(str(tmp_path), prune_patterns=["**/node_modules/**"])
+
+    assert _paths(index) == ["app.js"]
+
+
+def test_refresh_only_rescans_changed_directories(tmp_path):
+    """Test that unchanged directories are not listed again"""
+    (tmp_path / "stable").mkdir()
+    (tmp_path / "stable" / "a.py").write_text("")
+    (tmp_path / "changing").mkdir()
+    index = FileIndex(str(tmp_path))
+    index.entries()
+
+    # Age the directories so that they are outside the racy window
+    for path in [tmp_path, tmp_path / "stable", tmp_path / "changing"]:
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    index._dirs.clear()
+    index._files.clear()
+    index.entries()
+
+    (tmp_path / "changing" / "b.py").write_text("")
+    scanned = []
+    original_scan = index._scan_directory
+    index._scan_directory = lambda rel_dir: (
+        scanned.append(rel_dir),
+        original_scan(rel_dir),
+    )
+
+    assert _paths(index) == ["changing/b.py", "stable/a.py"]
+    assert scanned == ["changing"]
+
+
+def test_refresh_removes_deleted_files_and_directories(tmp_path):
+    """Test that deletions are reflected"""
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("")
+    (tmp_path / "top.py").write_text("")
+    index = FileIndex(str(tmp_path))
+    index.entries()
+
+    (tmp_path / "pkg" / "mod.py").unlink()
+    (tmp_path / "pkg").rmdir()
+
+    assert _paths(index) == ["top.py"]
+
+
+def test_write_notification_updates_entry(tmp_path):
+    """Test that notified writes update the shared index directly"""
+    target = tmp_path / "main.py"
+    target.write_text("a")
+    index = get_file_index(str(tmp_path))
+    index.entries()
+
+    target.write_text("longer content")
+    notify_file_changed(str(target))
+
+    assert index.get("main.py").size == len("longer content")
+
+
+def test_persisted_index_is_reused(tmp_path):
+    """Test saving to and loading from the agent cache directory"""
+    (tmp_path / "main.py").write_text("")
+    FileIndex(str(tmp_path), persist=True).entries()
+
+    assert os.path.exists(
+        os.path.join(agent_cache_dir(str(tmp_path)), "file_index.json")
+    )
+
+    reloaded = FileIndex(str(tmp_path), persist=True)
+    assert reloaded.get("main.py") is not None
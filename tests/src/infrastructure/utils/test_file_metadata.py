@@ -0,0 +1,57 @@
+"""
+Unit tests for file_metadata
+"""
+
+from src.infrastructure.utils.file_metadata import get_file_metadata
+
+
+def test_get_file_metadata_text_file(tmp_path):
+    """Test that small text files get exact line counts"""
+    path = tmp_path / "main.py"
+    path.write_text("import os\n\nprint(os.getcwd())\n")
+
+    metadata = get_file_metadata(str(path))
+
+    assert metadata == {
+        "size": 30,
+        "lines": 3,
+        "tokens": 8,
+        "binary": False,
+        "generated": False,
+    }
+
+
+def test_get_file_metadata_binary_by_content_and_extension(tmp_path):
+    """Test that NUL bytes and binary extensions are flagged without line counts"""
+    blob = tmp_path / "data.bin"
+    blob.write_bytes(b"abc\0def")
+    jar = tmp_path / "lib.jar"
+    jar.write_bytes(b"PK")
+
+    for path in (blob, jar):
+        metadata = get_file_metadata(str(path))
+        assert metadata["binary"] is True
+        assert metadata["lines"] == 0
+        assert metadata["tokens"] == 0
+
+
+def test_get_file_metadata_generated_files(tmp_path):
+    """Test lockfiles, generated markers and minified bundles"""
+    lockfile = tmp_path / "poetry.lock"
+    lockfile.write_text("[[package]]\n")
+    marked = tmp_path / "client.py"
+    marked.write_text("# Code generated by protoc. DO NOT EDIT.\n")
+    bundle = tmp_path / "bundle.js"
+    bundle.write_text("var a=1;" * 2000)
+
+    assert get_file_metadata(str(lockfile))["generated"] is True
+    assert get_file_metadata(str(marked))["generated"] is True
+    assert get_file_metadata(str(bundle))["generated"] is True
+
+
+def test_get_file_metadata_estimates_lines_of_large_files(tmp_path):
+    """Test that line counts are extrapolated from the header"""
+    path = tmp_path / "big.txt"
+    path.write_text("x" * 9 + "\n" * 1 + ("y" * 9 + "\n") * 9999)
+
+    assert abs(get_file_metadata(str(path))["lines"] - 10000) < 100
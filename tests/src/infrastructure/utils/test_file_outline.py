@@ -0,0 +1,46 @@
+"""
+Unit tests for file_outline
+"""
+
+from src.infrastructure.utils.file_outline import outline_file
+
+SOURCE = '''"""Module summary.
+
+Details.
+"""
+
+
+@decorator
+def function(
+    a: int,
+) -> int:
+    """Function summary."""
+    return a
+
+
+class Outer:
+    def method(self): return 1
+'''
+
+
+def test_outline_python():
+    """Test signatures, decorators and docstring summaries"""
+    assert outline_file("module.py", SOURCE) == [
+        "1: Module summary.",
+        "7: @decorator",
+        "8: def function( a: int, ) -> int:",
+        '11:     """Function summary."""',
+        "15: class Outer:",
+        "16:     def method(self): return 1",
+    ]
+
+
+def test_outline_other_languages():
+    """Test the keyword based outline for non-Python files"""
+    source = "# Title\nexport function run() {\n  return 1;\n}\n## Section\n"
+
+    assert outline_file("app.js", source) == [
+        "1: # Title",
+        "2: export function run() {",
+        "5: ## Section",
+    ]
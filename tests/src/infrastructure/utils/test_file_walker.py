@@ -0,0 +1,88 @@
+"""
+Unit tests for file_walker
+"""
+
+import os
+
+from src.infrastructure.utils.file_walker import walk_files
+
+
+def test_walk_files_does_not_enter_excluded_directories(tmp_path, monkeypatch):
+    """Test that excluded directories are pruned before scanning"""
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("")
+    (tmp_path / "app.js").write_text("")
+
+    scanned = []
+    original_scandir = __import__("os").scandir
+
+    def recording_scandir(path):
+        scanned.append(str(path))
+        return original_scandir(path)
+
+    monkeypatch.setattr(
+        "src.infrastructure.utils.file_walker.os.scandir", recording_scandir
+    )
+
+    result = list(
+        walk_files(
+            str(tmp_path),
+            file_extensions=["js"],
+            exclude_patterns=["**/node_modules/**"],
+        )
+    )
+
+    assert result == ["app.js"]
+    assert not any("node_modules" in path for path in scanned)
+
+
+def test_walk_files_enters_hidden_directory_for_include_pattern(tmp_path):
+    """Test that an explicit hidden include pattern is honoured"""
+    (tmp_path / ".github" / "workflows").mkdir(parents=True)
+    (tmp_path / ".github" / "workflows" / "ci.yml").write_text("")
+    (tmp_path / ".github" / "script.py").write_text("")
+
+    result = sorted(
+        walk_files(
+            str(tmp_path),
+            file_extensions=["py"],
+            include_patterns=[".github/**/*.yml"],
+        )
+    )
+
+    assert result == [".github/workflows/ci.yml"]
+
+
+def test_walk_files_yields_sorted_paths(tmp_path):
+    """Test that the walk order equals sorted path order"""
+    paths = ["a.py", "a/x.py", "a0.py", "a-b/y.py", "B.py"]
+    for path in paths:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("")
+
+    assert list(walk_files(str(tmp_path), file_extensions=["py"])) == sorted(paths)
+
+
+def test_walk_files_stops_early_and_skips_directories_before_cursor(
+    tmp_path, monkeypatch
+):
+    """Test that directories outside the requested page are never scanned"""
+    for directory in ["a", "b", "c", "d"]:
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "m.py").write_text("")
+
+    scanned = []
+    original_scandir = __import__("os").scandir
+
+    def recording_scandir(path):
+        scanned.append(os.path.basename(str(path)))
+        return original_scandir(path)
+
+    monkeypatch.setattr(
+        "src.infrastructure.utils.file_walker.os.scandir", recording_scandir
+    )
+
+    walker = walk_files(str(tmp_path), file_extensions=["py"], start_after="b/m.py")
+    assert next(walker) == "c/m.py"
+    assert "a" not in scanned
+    assert "d" not in scanned
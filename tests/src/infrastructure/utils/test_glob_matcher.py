@@ -0,0 +1,80 @@
+"""
+Unit tests for glob_matcher
+"""
+
+import re
+
+import pytest
+
+from src.infrastructure.utils.glob_matcher import compile_matcher, glob_to_regex
+
+
+@pytest.mark.parametrize(
+    "pattern, path, expected",
+    [
+        ("**/*.py", "main.py", True),
+        ("**/*.py", "src/app/main.py", True),
+        ("**/*.py", ".hidden/main.py", False),
+        ("**/*.py", "src/.main.py", False),
+        ("src/**/*.js", "src/a/b/c.js", True),
+        ("src/**/*.js", "lib/c.js", False),
+        ("*.md", "docs/README.md", False),
+        ("data_[0-9].csv", "data_1.csv", True),
+        ("data_[!0-9].csv", "data_1.csv", False),
+    ],
+)
+def test_glob_to_regex(pattern, path, expected):
+    """Test that translated patterns follow glob semantics"""
+    assert bool(re.fullmatch(glob_to_regex(pattern), path)) is expected
+
+
+def test_glob_to_regex_match_hidden():
+    """Test that hidden names match when match_hidden is True"""
+    regex = glob_to_regex("**/.*cache/**", match_hidden=True)
+    assert re.fullmatch(regex, "src/.pytest_cache/")
+    assert re.fullmatch(regex, ".mypy_cache/x/y.json")
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("main.py", True),
+        ("types/index.d.ts", True),
+        ("sub/requirements.txt", True),
+        ("src/app.js", True),
+        ("lib/app.js", False),
+        (".github/ci.py", False),
+        ("node_modules/pkg/index.py", False),
+        ("src/.pytest_cache/x.py", False),
+        ("logs/debug.log", False),
+        ("terraform.tfstate.backup", False),
+    ],
+)
+def test_compiled_matcher(path, expected):
+    """Test that set lookups and the combined regex agree with glob semantics"""
+    matcher = compile_matcher(
+        file_extensions=["py", "d.ts", "log", "backup"],
+        include_patterns=["**/requirements.txt", "src/**/*.js"],
+        exclude_patterns=[
+            "**/node_modules/**",
+            "**/.*cache/**",
+            "**/*.log",
+            "**/terraform.tfstate*",
+        ],
+    )
+    assert matcher.matches(path) is expected
+
+
+def test_prunes_directory():
+    """Test directory pruning for literal and wildcard exclude patterns"""
+    matcher = compile_matcher(exclude_patterns=["**/node_modules/**", "**/.*cache/**"])
+    assert matcher.prunes_directory("web/node_modules")
+    assert matcher.prunes_directory(".mypy_cache")
+    assert not matcher.prunes_directory("src")
+
+
+def test_compile_matcher_is_cached():
+    """Test that the same pattern set reuses the compiled matcher"""
+    first = compile_matcher(["py"], None, ["**/a/**", "**/b/**"])
+    second = compile_matcher(["py"], None, ["**/b/**", "**/a/**"])
+    assert first is second
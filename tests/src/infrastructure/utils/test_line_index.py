@@ -0,0 +1,39 @@
+"""
+Unit tests for line_index
+"""
+
+from unittest.mock import patch
+
+from src.infrastructure.utils import line_index
+from src.infrastructure.utils.line_index import read_line_range
+
+
+def test_read_line_range(tmp_path):
+    """Test ranges, clamping and files without a trailing newline"""
+    path = tmp_path / "a.txt"
+    path.write_text("one\ntwo\nthree")
+
+    assert read_line_range(str(path), 2, 3) == ("two\nthree", 2, 3, 3)
+    assert read_line_range(str(path), None, 1) == ("one\n", 1, 1, 3)
+    assert read_line_range(str(path), 5, 9).text == ""
+
+    empty = tmp_path / "empty.txt"
+    empty.write_text("")
+    assert read_line_range(str(empty), 1, 2) == ("", 0, 0, 0)
+
+
+def test_line_offsets_are_cached_per_version(tmp_path):
+    """Test that range reads reuse the offsets until the file changes"""
+    path = tmp_path / "a.txt"
+    path.write_text("a\nb\n")
+
+    with patch.object(
+        line_index, "_build_offsets", wraps=line_index._build_offsets
+    ) as build:
+        read_line_range(str(path), 1, 1)
+        read_line_range(str(path), 2, 2)
+        assert build.call_count == 1
+
+        path.write_text("a\nb\nc\n")
+        assert read_line_range(str(path), 3, 3).text == "c\n"
+        assert build.call_count == 2
@@ -0,0 +1,56 @@
+"""
+Unit tests for read_cache
+"""
+
+import os
+
+from src.infrastructure.utils.file_events import notify_file_changed
+from src.infrastructure.utils.read_cache import ReadCache, read_cache
+
+
+def test_read_text_hits_until_file_changes(tmp_path):
+    """Test hits, misses and invalidation by size/mtime"""
+    cache = ReadCache(max_bytes=1024)
+    path = tmp_path / "a.py"
+    path.write_text("abc")
+
+    assert cache.read_text(str(path)) == "abc"
+    assert cache.read_text(str(path)) == "abc"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["bytes_saved"] == 3
+
+    path.write_text("abcd")
+    os.utime(path, ns=(1, 1))
+    assert cache.read_text(str(path)) == "abcd"
+    assert cache.stats()["misses"] == 2
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    """Test the byte budget"""
+    cache = ReadCache(max_bytes=10)
+    for name in ["a", "b", "c"]:
+        (tmp_path / name).write_text(name * 4)
+
+    cache.read_text(str(tmp_path / "a"))
+    cache.read_text(str(tmp_path / "b"))
+    cache.read_text(str(tmp_path / "a"))
+    cache.read_text(str(tmp_path / "c"))
+
+    assert cache.stats()["cached_files"] == 2
+    assert cache.stats()["cached_bytes"] == 8
+    cache.reset_stats()
+    cache.read_text(str(tmp_path / "b"))
+    assert cache.stats()["misses"] == 1
+
+
+def test_write_notifications_invalidate_shared_cache(tmp_path):
+    """Test that the shared cache drops files reported by write tools"""
+    path = tmp_path / "a.py"
+    path.write_text("abc")
+    read_cache.read_text(str(path))
+    assert str(path) in read_cache._entries
+
+    notify_file_changed(str(path))
+
+    assert str(path) not in read_cache._entries
@@ -0,0 +1,112 @@
+"""
+Unit tests for symbol_index
+"""
+
+import os
+
+from src.infrastructure.utils.file_events import notify_file_changed
+from src.infrastructure.utils.symbol_index import (
+    SymbolIndex,
+    get_symbol_index,
+    parse_symbols,
+)
+
+MODULE = """import os
+from typing import List
+
+LIMIT = 10
+
+
+class Reader:
+    cache: dict = {}
+
+    def read(self, path):
+        local = 1
+        return helper(path)
+
+
+def helper(path):
+    return os.path.basename(path)
+"""
+
+CALLER = """from pkg.module import Reader, helper
+
+
+def main():
+    return Reader().read(helper("x"))
+"""
+
+
+def _project(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "module.py").write_text(MODULE)
+    (tmp_path / "main.py").write_text(CALLER)
+    return ["main.py", "pkg/module.py"]
+
+
+def test_find_definitions(tmp_path):
+    """Test classes, methods, functions, variables and imports"""
+    index = SymbolIndex(str(tmp_path))
+    index.sync(_project(tmp_path))
+
+    assert [
+        (d.kind, d.qualname, d.path, d.line) for d in index.find_definitions("read")
+    ] == [("method", "Reader.read", "pkg/module.py", 10)]
+    assert [(d.kind, d.path) for d in index.find_definitions("helper")] == [
+        ("function", "pkg/module.py"),
+        ("import", "main.py"),
+    ]
+    assert [d.kind for d in index.find_definitions("Reader.cache")] == ["variable"]
+    assert [d.kind for d in index.find_definitions("LIMIT")] == ["variable"]
+    # Function locals are not indexed
+    assert index.find_definitions("local") == []
+
+
+def test_find_references(tmp_path):
+    """Test calls, imports and attribute uses"""
+    index = SymbolIndex(str(tmp_path))
+    index.sync(_project(tmp_path))
+
+    assert [(r.kind, r.path, r.line) for r in index.find_references("helper")] == [
+        ("import", "main.py", 1),
+        ("call", "main.py", 5),
+        ("call", "pkg/module.py", 12),
+    ]
+    assert [(r.kind, r.path) for r in index.find_references("basename")] == [
+        ("call", "pkg/module.py")
+    ]
+
+
+def test_sync_reparses_only_changed_files(tmp_path, monkeypatch):
+    """Test that unchanged files are not parsed again"""
+    paths = _project(tmp_path)
+    index = SymbolIndex(str(tmp_path))
+    index.sync(paths)
+
+    parsed = []
+    monkeypatch.setattr(
+        "src.infrastructure.utils.symbol_index.parse_symbols",
+        lambda source, path: parsed.append(path) or parse_symbols(source, path),
+    )
+
+    (tmp_path / "main.py").write_text(CALLER.replace("main", "run"))
+    index.sync(paths)
+    assert parsed == ["main.py"]
+    assert [d.name for d in index.find_definitions("run")] == ["run"]
+
+    # Touching a file without changing it only updates its mtime
+    os.utime(tmp_path / "pkg" / "module.py", ns=(1, 1))
+    index.sync(paths)
+    assert parsed == ["main.py"]
+
+
+def test_write_notifications_update_index(tmp_path):
+    """Test that written files are re-parsed directly"""
+    index = get_symbol_index(str(tmp_path))
+    index.sync(_project(tmp_path))
+
+    (tmp_path / "pkg" / "module.py").write_text("def renamed():\n    pass\n")
+    notify_file_changed(str(tmp_path / "pkg" / "module.py"))
+
+    assert [d.kind for d in index.find_definitions("Reader")] == ["import"]
+    assert [d.path for d in index.find_definitions("renamed")] == ["pkg/module.py"]
@@ -0,0 +1,143 @@
+"""
+Unit tests for text_patch
+"""
+
+import pytest
+
+from src.infrastructure.utils.text_patch import (
+    FuzzyMatch,
+    PatchError,
+    apply_search_replace,
+    apply_unified_diff,
+)
+
+SOURCE = """def add(a, b):
+    return a + b
+
+
+def sub(a, b):
+    return a - b
+"""
+
+
+def test_search_replace_exact():
+    """Test exact blocks applied in order"""
+    result = apply_search_replace(
+        SOURCE,
+        [("return a + b", "return b + a"), ("def sub(a, b):", "def subtract(a, b):")],
+    )
+
+    assert "return b + a" in result.text
+    assert "def subtract(a, b):" in result.text
+    assert result.fuzzy_matches == []
+
+
+def test_search_replace_fuzzy_indentation():
+    """Test that a block copied without its indentation is re-indented into place"""
+    source = "class Calc:\n    def sub(self, a, b):\n        return a - b\n"
+
+    result = apply_search_replace(
+        source,
+        [
+            (
+                "def sub(self, a, b):\n    return a - b\n",
+                "def sub(self, a, b):\n    return b - a\n",
+            )
+        ],
+    )
+
+    assert (
+        result.text == "class Calc:\n    def sub(self, a, b):\n        return b - a\n"
+    )
+    # Only the indentation differed, which is not reported as a fuzzy match
+    assert result.fuzzy_matches == []
+
+
+def test_search_replace_fuzzy_similar_text():
+    """Test that a slightly different copy of the code matches and is reported"""
+    result = apply_search_replace(
+        SOURCE,
+        [
+            ("return a + b", "return b + a"),
+            ("def sub(a, b):\n    return a-b\n", "def sub(a, b):\n    return b - a\n"),
+        ],
+    )
+
+    assert "return b - a" in result.text
+    assert "return a - b" not in result.text
+    [match] = result.fuzzy_matches
+    assert match[:3] == ("Edit 2", 5, 6)
+    assert 0.85 <= match.ratio < 1
+    assert match.summary().startswith("Edit 2 replaced lines 5-6 (")
+
+
+def test_search_replace_errors():
+    """Test ambiguous and missing blocks"""
+    with pytest.raises(PatchError, match="Edit 1 .*matches 2 places"):
+        apply_search_replace(SOURCE, [("(a, b):", "(x):")])
+
+    with pytest.raises(PatchError, match="Edit 2 .*not found.*most similar"):
+        apply_search_replace(
+            SOURCE, [("a + b", "a+b"), ("class Missing:\n    pass\n", "")]
+        )
+
+
+def test_unified_diff_with_stale_line_numbers():
+    """Test that hunks are located by context"""
+    diff = """--- a/math.py
++++ b/math.py
+@@ -1,2 +1,2 @@
+ def add(a, b):
+-    return a + b
++    return b + a
+@@ -9,2 +9,3 @@
+ def sub(a, b):
+-    return a - b
++    result = a - b
++    return result
+"""
+
+    assert (
+        apply_unified_diff(SOURCE, diff).text
+        == """def add(a, b):
+    return b + a
+
+
+def sub(a, b):
+    result = a - b
+    return result
+"""
+    )
+
+
+def test_unified_diff_insertion_hunks():
+    """Test that hunks after an insertion keep their position, like GNU patch"""
+    source = "".join(f"l{i}\n" for i in range(1, 9))
+    diff = "@@ -2,0 +3 @@\n+X\n@@ -6,0 +8 @@\n+Y\n"
+
+    result = apply_unified_diff(source, diff)
+
+    assert result.text == "l1\nl2\nX\nl3\nl4\nl5\nl6\nY\nl7\nl8\n"
+
+
+def test_unified_diff_reports_fuzzy_hunks():
+    """Test that a hunk applied to similar text is reported with its location"""
+    diff = "@@ -4,2 +4,2 @@\n def sub(a, b):\n-    return a-b\n+    return b - a\n"
+
+    result = apply_unified_diff(SOURCE, diff)
+
+    assert "return b - a" in result.text
+    assert [match[:3] for match in result.fuzzy_matches] == [
+        ("Hunk 1 (@@ -4,2 +4,2 @@)", 5, 6)
+    ]
+    assert isinstance(result.fuzzy_matches[0], FuzzyMatch)
+
+
+def test_unified_diff_reports_failing_hunk():
+    """Test the error message of a hunk that does not apply"""
+    diff = "@@ -1,1 +1,1 @@\n-class Nothing:\n+class Something:\n"
+
+    with pytest.raises(
+        PatchError, match=r"Hunk 1 \(@@ -1,1 \+1,1 @@\) could not be applied"
+    ):
+        apply_unified_diff(SOURCE, diff)
@@ -0,0 +1,59 @@
+"""
+Unit tests for tree_render
+"""
+
+from src.infrastructure.utils.tree_render import estimate_tokens, render_tree
+
+
+def test_render_tree_groups_paths_by_directory():
+    """Test that shared directories are printed once"""
+    paths = ["README.md", "src/main.py", "src/utils/a.py", "src/utils/b.py"]
+
+    assert render_tree(paths) == "\n".join(
+        [
+            "src/",
+            "  utils/",
+            "    a.py",
+            "    b.py",
+            "  main.py",
+            "README.md",
+        ]
+    )
+
+
+def test_render_tree_joins_single_directory_chains():
+    """Test that directories with a single subdirectory share one line"""
+    paths = ["src/agent/function/a.py", "src/agent/function/b.py"]
+
+    assert render_tree(paths) == "src/agent/function/\n  a.py\n  b.py"
+
+
+def test_render_tree_collapses_largest_directories_to_fit_budget():
+    """Test that large directories become file counts under a token budget"""
+    paths = [f"big/file_{i:03}.py" for i in range(200)] + ["small/x.py", "main.py"]
+
+    tree = render_tree(paths, token_budget=20)
+
+    assert estimate_tokens(tree) <= 20
+    assert "big/ (200 files)" in tree
+    assert "small/\n  x.py" in tree
+    assert "main.py" in tree
+
+
+def test_render_tree_is_smaller_than_flat_list():
+    """Test that the tree uses fewer tokens than the flat path list"""
+    paths = [
+        f"src/package/module_{i}/file_{j}.py" for i in range(20) for j in range(20)
+    ]
+
+    assert estimate_tokens(render_tree(paths)) * 2 < estimate_tokens("\n".join(paths))
+
+
+def test_render_tree_truncates_when_collapsing_is_not_enough():
+    """Test that a flat directory over budget is cut with a marker"""
+    paths = [f"file_{i:03}.py" for i in range(100)]
+
+    tree = render_tree(paths, token_budget=10)
+
+    assert tree.endswith("more lines truncated)")
+    assert len(tree.splitlines()) < 100
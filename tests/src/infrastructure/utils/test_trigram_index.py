@@ -0,0 +1,68 @@
+"""
+Unit tests for trigram_index
+"""
+
+import os
+
+from src.infrastructure.utils.agent_cache import agent_cache_dir
+from src.infrastructure.utils.file_events import notify_file_changed
+from src.infrastructure.utils.trigram_index import (
+    TrigramIndex,
+    get_trigram_index,
+    required_literals,
+)
+
+
+def _write(root, files):
+    for path, content in files.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(content)
+
+
+def test_required_literals():
+    """Test literal extraction from regular expressions"""
+    assert required_literals("a.b", is_regex=False) == [b"a.b"]
+    assert required_literals(r"def\s+execute\(", is_regex=True) == [b"def", b"execute("]
+    assert required_literals(r"(?:class)+ Foo", is_regex=True) == [b"class", b" Foo"]
+    assert required_literals(r"foo|bar", is_regex=True) == []
+    assert required_literals(r"(?:abc)? x", is_regex=True) == [b" x"]
+
+
+def test_candidates_narrow_by_trigrams(tmp_path):
+    """Test that only files containing every trigram are candidates"""
+    _write(
+        tmp_path,
+        {"a.py": "def execute():\n", "b.py": "def other():\n", "c.bin": "ex\0"},
+    )
+    index = TrigramIndex(str(tmp_path))
+    index.sync(["a.py", "b.py", "c.bin"])
+
+    assert index.candidates([b"EXECUTE"]) == {"a.py"}
+    assert index.candidates([b"def"]) == {"a.py", "b.py"}
+    assert index.candidates([b"de"]) is None
+
+
+def test_index_is_saved_and_memory_mapped(tmp_path):
+    """Test that a new instance loads the saved postings without rebuilding"""
+    _write(tmp_path, {"a.py": "needle\n", "b.py": "hay\n"})
+    TrigramIndex(str(tmp_path)).sync(["a.py", "b.py"])
+
+    loaded = TrigramIndex(str(tmp_path))
+    assert loaded.candidates([b"needle"]) == {"a.py"}
+    assert os.path.exists(os.path.join(agent_cache_dir(str(tmp_path)), "trigram.idx"))
+
+
+def test_sync_and_notifications_update_changed_files(tmp_path):
+    """Test incremental updates from stat changes and write notifications"""
+    _write(tmp_path, {"a.py": "needle\n", "b.py": "hay\n"})
+    index = get_trigram_index(str(tmp_path))
+    index.sync(["a.py", "b.py"])
+
+    (tmp_path / "b.py").write_text("needle too\n")
+    notify_file_changed(str(tmp_path / "b.py"))
+    assert index.candidates([b"needle"]) == {"a.py", "b.py"}
+
+    (tmp_path / "a.py").write_text("nothing longer than before\n")
+    (tmp_path / "c.py").write_text("needle\n")
+    index.sync(["a.py", "b.py", "c.py"])
+    assert index.candidates([b"needle"]) == {"b.py", "c.py"}
@@ -0,0 +1,247 @@
+"""
+Unit tests for write_set
+"""
+
+import os
+import threading
+
+import pytest
+
+from src.infrastructure.config.agent_setting import agent_settings
+from src.infrastructure.utils.agent_cache import agent_cache_dir
+from src.infrastructure.utils.read_cache import read_cache
+from src.infrastructure.utils.write_set import (
+    LineDelta,
+    WriteSet,
+    WriteTooLargeError,
+    append_text,
+    iteration_write_set,
+    line_delta,
+    write_chunks,
+    write_text,
+)
+
+
+def test_commit_writes_staged_files(tmp_path):
+    """Test that nothing is written before commit and no temporary files remain"""
+    existing = tmp_path / "a.py"
+    existing.write_text("old")
+    write_set = WriteSet(str(tmp_path))
+
+    write_set.stage(str(existing), "new")
+    write_set.stage(str(tmp_path / "pkg" / "b.py"), "created")
+    assert existing.read_text() == "old"
+
+    written = write_set.commit()
+
+    assert sorted(written) == sorted([str(existing), str(tmp_path / "pkg" / "b.py")])
+    assert existing.read_text() == "new"
+    assert (tmp_path / "pkg" / "b.py").read_text() == "created"
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_rollback_restores_previous_versions(tmp_path):
+    """Test that rollback restores replaced files and removes created ones"""
+    # Snapshots are kept under the git directory, never in the working tree
+    (tmp_path / ".git").mkdir()
+    existing = tmp_path / "a.py"
+    existing.write_text("original")
+    write_set = WriteSet(str(tmp_path), durable=False)
+
+    write_set.stage(str(existing), "first")
+    write_set.commit()
+    write_set.stage(str(existing), "second")
+    write_set.stage(str(tmp_path / "b.py"), "created")
+    write_set.commit()
+
+    restored = write_set.rollback()
+
+    assert sorted(restored) == sorted([str(existing), str(tmp_path / "b.py")])
+    assert existing.read_text() == "original"
+    assert not (tmp_path / "b.py").exists()
+    assert not os.listdir(os.path.join(agent_cache_dir(str(tmp_path)), "snapshots"))
+    assert sorted(os.listdir(tmp_path)) == [".git", "a.py"]
+
+
+def test_release_keeps_writes(tmp_path):
+    """Test that release deletes the snapshots only"""
+    path = tmp_path / "a.py"
+    path.write_text("original")
+    write_set = WriteSet(str(tmp_path), durable=False)
+
+    write_set.stage(str(path), "new")
+    write_set.commit()
+    write_set.release()
+
+    assert write_set.rollback() == []
+    assert path.read_text() == "new"
+
+
+def test_iteration_write_set_rolls_back_tool_writes_on_error(tmp_path):
+    """Test that writes made through write_text are undone when the block fails"""
+    path = tmp_path / "a.py"
+    path.write_text("original")
+    assert read_cache.read_text(str(path)) == "original"
+
+    with pytest.raises(RuntimeError):
+        with iteration_write_set(str(tmp_path)):
+            write_text(str(path), "broken")
+            assert read_cache.read_text(str(path)) == "broken"
+            raise RuntimeError("iteration failed")
+
+    assert path.read_text() == "original"
+    assert read_cache.read_text(str(path)) == "original"
+
+    with iteration_write_set(str(tmp_path)):
+        write_text(str(path), "kept")
+    assert path.read_text() == "kept"
+
+
+def test_iteration_write_set_fsyncs_once_at_the_end(tmp_path, monkeypatch):
+    """Test that tool writes are visible at once but fsynced in one batch on exit"""
+    synced = []
+    fsync = os.fsync
+
+    def record_fsync(fd):
+        synced.append(os.fstat(fd).st_ino)
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", record_fsync)
+    paths = [tmp_path / "a.py", tmp_path / "pkg" / "b.py"]
+
+    with iteration_write_set(str(tmp_path)):
+        for path in paths:
+            write_text(str(path), "new\n")
+            assert path.read_text() == "new\n"
+        append_text(str(paths[0]), "more\n")
+        assert synced == []
+
+    # Both files and both directories
+    assert sorted(synced) == sorted(
+        os.stat(path).st_ino for path in [*paths, tmp_path, tmp_path / "pkg"]
+    )
+
+
+def test_active_write_set_is_per_thread(tmp_path):
+    """Test that writes from another thread do not join the block's write set"""
+    inside, outside = tmp_path / "a.py", tmp_path / "b.py"
+    inside.write_text("original")
+
+    with pytest.raises(RuntimeError):
+        with iteration_write_set(str(tmp_path)):
+            write_text(str(inside), "changed")
+            thread = threading.Thread(target=write_text, args=(str(outside), "kept"))
+            thread.start()
+            thread.join()
+            raise RuntimeError("iteration failed")
+
+    assert inside.read_text() == "original"
+    assert outside.read_text() == "kept"
+
+
+def test_write_text_skips_identical_contents(tmp_path):
+    """Test that an identical write returns None and does not touch the file"""
+    path = tmp_path / "a.py"
+    path.write_text("same\n")
+    os.utime(path, ns=(1, 1))
+
+    assert write_text(str(path), "same\n") is None
+    assert path.stat().st_mtime_ns == 1
+
+    write_set = WriteSet(str(tmp_path), durable=False)
+    write_set.stage(str(path), "same\n")
+    assert write_set.commit() == []
+
+
+def test_line_delta_counts_changed_lines():
+    """Test the delta of created and modified files"""
+    assert line_delta(None, "a\nb\n") == LineDelta(True, 2, 0, 2)
+    assert line_delta("a\nb\nc\n", "a\nc\nd\n") == LineDelta(False, 1, 1, 3)
+    assert (
+        line_delta("a\nb\nc\n", "a\nc\nd\n").summary() == "+1 -1 lines, 3 lines total"
+    )
+
+
+def test_write_chunks_streams_a_generator(tmp_path):
+    """Test streaming writes and that an identical stream is skipped"""
+    path = tmp_path / "data" / "rows.csv"
+
+    def rows():
+        for i in range(1000):
+            yield f"{i},{i * i}\n"
+
+    assert write_chunks(str(path), rows()) == LineDelta(True, 1000, 0, 1000)
+    assert path.read_text().splitlines()[999] == "999,998001"
+    assert write_chunks(str(path), rows()) is None
+    assert write_chunks(str(path), iter(["0,0\n"])) == LineDelta(False, 0, 999, 1)
+
+
+def test_write_chunks_size_guard_keeps_the_file(tmp_path):
+    """Test that a stream exceeding the limit is refused and leaves no trace"""
+    path = tmp_path / "big.txt"
+    path.write_text("original")
+
+    with pytest.raises(WriteTooLargeError):
+        write_chunks(str(path), ("x" * 100 for _ in range(100)), max_bytes=1000)
+
+    assert path.read_text() == "original"
+    assert os.listdir(tmp_path) == ["big.txt"]
+
+
+def test_write_chunks_is_rolled_back(tmp_path):
+    """Test that a streamed write goes through the active write set"""
+    path = tmp_path / "rows.csv"
+    path.write_text("original\n")
+
+    with pytest.raises(RuntimeError):
+        with iteration_write_set(str(tmp_path)):
+            write_chunks(str(path), iter(["a\n", "b\n"]))
+            assert path.read_text() == "a\nb\n"
+            raise RuntimeError("iteration failed")
+
+    assert path.read_text() == "original\n"
+
+
+def test_append_text_counts_lines_across_chunks(tmp_path):
+    """Test line deltas of chunked appends, including chunks that end mid-line"""
+    path = tmp_path / "rows.csv"
+
+    assert append_text(str(path), "a,1\nb,") == LineDelta(True, 2, 0, 2)
+    # The partial last line is extended, not followed by a new one
+    assert append_text(str(path), "2\nc,3\n") == LineDelta(False, 2, 1, 3)
+    assert append_text(str(path), "d,4") == LineDelta(False, 1, 0, 4)
+    assert path.read_text() == "a,1\nb,2\nc,3\nd,4"
+
+
+def test_append_text_recounts_after_outside_edits(tmp_path):
+    """Test that a file changed between appends is counted again"""
+    path = tmp_path / "log.txt"
+    append_text(str(path), "a\n")
+    path.write_text("a\nb\nc\n")
+
+    assert append_text(str(path), "d\n") == LineDelta(False, 1, 0, 4)
+
+
+def test_write_text_size_guard(tmp_path, monkeypatch):
+    """Test that write_text refuses contents above MAX_WRITE_BYTES"""
+    monkeypatch.setattr(agent_settings, "MAX_WRITE_BYTES", 10)
+
+    with pytest.raises(WriteTooLargeError):
+        write_text(str(tmp_path / "a.txt"), "x" * 11)
+    assert not (tmp_path / "a.txt").exists()
+
+
+def test_append_text_is_rolled_back(tmp_path):
+    """Test appending chunks and undoing in-place appends"""
+    path = tmp_path / "log.txt"
+    path.write_text("a\n")
+
+    with pytest.raises(RuntimeError):
+        with iteration_write_set(str(tmp_path)):
+            assert append_text(str(path), "b\nc\n") == LineDelta(False, 2, 0, 3)
+            assert path.read_text() == "a\nb\nc\n"
+            raise RuntimeError("iteration failed")
+
+    assert path.read_text() == "a\n"
+    with pytest.raises(WriteTooLargeError):
+        append_text(str(path), "x" * 10, max_bytes=5)